@@ -33,8 +33,12 @@ const itemsStatus = document.getElementById('itemsStatus');
 
 let currentItemId = null;
 let itemsCache = [];
+let itemsNextCursor = null;
+let itemsTotal = 0;
 let categoriesCache = {};
 
+const ITEMS_PAGE_SIZE = 200;
+
 const fileLabels = {
   svg: 'SVG',
   nc: 'NC',
@@ -237,12 +241,25 @@ const renderItems = (items) => {
 
     itemsList.appendChild(card);
   });
+
+  if (itemsNextCursor) {
+    const moreBtn = document.createElement('button');
+    moreBtn.type = 'button';
+    moreBtn.className = 'item-card item-card-create-new';
+    moreBtn.textContent = 'Показать ещё';
+    moreBtn.addEventListener('click', () => loadItems({ append: true }));
+    itemsList.appendChild(moreBtn);
+  }
 };
 
-const loadItems = async () => {
+const loadItems = async ({ append = false } = {}) => {
   itemsStatus.textContent = 'Загрузка списка…';
   try {
-    const res = await fetch(`${ADMIN_API_BASE}/items`);
+    const params = new URLSearchParams({ limit: String(ITEMS_PAGE_SIZE) });
+    if (append && itemsNextCursor) {
+      params.set('cursor', itemsNextCursor);
+    }
+    const res = await fetch(`${ADMIN_API_BASE}/items?${params}`);
     const text = await res.text();
 
     if (!res.ok) {
@@ -252,9 +269,13 @@ const loadItems = async () => {
     }
 
     const data = JSON.parse(text);
-    itemsCache = data.items || [];
+    itemsCache = append ? itemsCache.concat(data.items || []) : (data.items || []);
+    itemsNextCursor = data.nextCursor || null;
+    itemsTotal = data.total ?? itemsCache.length;
     renderItems(itemsCache);
-    itemsStatus.textContent = `Найдено: ${itemsCache.length}`;
+    itemsStatus.textContent = itemsNextCursor
+      ? `Найдено: ${itemsTotal}, показано: ${itemsCache.length}`
+      : `Найдено: ${itemsTotal}`;
   } catch (err) {
     itemsStatus.textContent = 'Ошибка загрузки списка';
     resultEl.textContent = err.toString();
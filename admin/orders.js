@@ -231,9 +231,10 @@ const updateMeta = (details) => {
   }
 
   layoutWrapEl.innerHTML = '';
-  if (files.previewPng) {
+  const layoutPreview = files.previewPng || files.previewSvg;
+  if (layoutPreview) {
     const img = document.createElement('img');
-    const previewUrl = withAppPrefix(files.previewPng);
+    const previewUrl = withAppPrefix(layoutPreview);
     img.src = `${previewUrl}?t=${Date.now()}`;
     img.alt = `layout ${details.orderId}`;
     layoutWrapEl.appendChild(img);
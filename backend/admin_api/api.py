@@ -1,11 +1,16 @@
 # admin/api.py
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Header, HTTPException, Query, UploadFile, File, Form
+from fastapi.responses import FileResponse
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Iterator, Literal, Optional, List, Dict, Any, Tuple
+from contextlib import contextmanager
 import re
-from admin_api.manifest_service import load_manifest, save_manifest_atomic
+from admin_api.asset_index import AssetIndex, current_asset_index
+from admin_api.catalog_store import CatalogTransaction
+from admin_api.manifest_service import ManifestVersionConflict, catalog_transaction, load_manifest_snapshot
 from admin_api.id_utils import generate_item_id, normalize_pose_key
 from admin_api.file_service import save_upload_file, DIRS
+from admin_api.object_store import is_object_asset, object_asset_path, object_exists, put_object
 from admin_api.file_validation import (
     validate_svg,
     validate_nc,
@@ -13,7 +18,8 @@ from admin_api.file_validation import (
 )
 from admin_api.dxf_to_svg import convert as convert_dxf_to_svg
 from gcode_rotator import rotate_gcode_for_contour
-from domain_store import CONTOURS_DIR, contour_geometry_path
+from domain_store import CONTOURS_DIR, contour_geometry_path, contour_inner_contour_path
+from services.inner_contour import GeometryInnerContourError, generate_inner_contour
 from pathlib import Path
 import xml.etree.ElementTree as ET
 from datetime import datetime, timezone
@@ -29,7 +35,12 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 
 CATEGORY_SLUG_RE = re.compile(r"^[a-z0-9]+(?:-[a-z0-9]+)*$")
+# Bare version ("7") or the manifest ETag ("manifest-v7-<digest>").
+IF_MATCH_VERSION_RE = re.compile(r"^(?:manifest-v)?(\d+)(?:-[0-9a-f]+)?$")
 DEFAULT_LABEL_MAX_LENGTH = 32
+ITEMS_PAGE_MAX_LIMIT = 500
+# Inner contours are generated synchronously, so one request handles a bounded batch.
+INNER_CONTOUR_BATCH_MAX_ITEMS = 50
 
 
 def _sorted_categories(categories: dict) -> List[Dict[str, str]]:
@@ -94,6 +105,39 @@ def _normalize_pose_label(pose_label: Optional[str]) -> Optional[str]:
     return normalized or None
 
 
+def _expected_manifest_version(if_match: Optional[str]) -> Optional[int]:
+    if if_match is None or if_match.strip() == "*":
+        return None
+    tags = [tag.strip() for tag in if_match.split(",") if tag.strip()]
+    match = IF_MATCH_VERSION_RE.match(tags[0].removeprefix("W/").strip('"')) if len(tags) == 1 else None
+    if not match:
+        raise HTTPException(status_code=400, detail="If-Match must name a single manifest version or ETag")
+    return int(match.group(1))
+
+
+@contextmanager
+def _catalog_edit(if_match: Optional[str]) -> Iterator[CatalogTransaction]:
+    try:
+        with catalog_transaction(_expected_manifest_version(if_match)) as catalog:
+            yield catalog
+    except ManifestVersionConflict as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+
+
+def _require_item_for_upload(item_id: str, if_match: Optional[str]) -> None:
+    # Fails fast before the upload is processed; the commit checks If-Match
+    # again inside the catalog transaction, which is what makes it a CAS.
+    expected_version = _expected_manifest_version(if_match)
+    snapshot = load_manifest_snapshot()
+    if item_id not in snapshot.items_by_id:
+        raise HTTPException(404, "Item not found")
+    if expected_version is not None and snapshot.version != expected_version:
+        raise HTTPException(
+            status_code=409,
+            detail=str(ManifestVersionConflict(expected=expected_version, actual=snapshot.version))
+        )
+
+
 
 class PreviewIdRequest(BaseModel):
     article: str
@@ -140,6 +184,10 @@ class CreateItemRequest(BaseModel):
     machining: Optional[ItemMachining] = None
 
 
+class BulkCreateItemsRequest(BaseModel):
+    items: List[CreateItemRequest] = Field(..., min_length=1)
+
+
 class UpsertCategoryRequest(BaseModel):
     slug: str
     label: str
@@ -152,7 +200,7 @@ class UpsertManifestSetsRequest(BaseModel):
 
 @router.get("/categories")
 def list_categories():
-    manifest = load_manifest()
+    manifest = load_manifest_snapshot().manifest
     categories = manifest.get("categories") or {}
     return {
         "version": manifest.get("version"),
@@ -164,45 +212,36 @@ def list_categories():
 
 @router.get("/manifest/sets")
 def get_manifest_sets():
-    manifest = load_manifest()
+    manifest = load_manifest_snapshot().manifest
     sets = manifest.get("sets")
     return {"sets": sets if isinstance(sets, list) else []}
 
 
 @router.put("/manifest/sets")
-def upsert_manifest_sets(data: UpsertManifestSetsRequest):
-    manifest = load_manifest()
-    manifest["sets"] = [entry.model_dump(exclude_none=True) for entry in data.sets]
-    manifest["version"] = manifest.get("version", 1) + 1
-    save_manifest_atomic(manifest)
-    return {"sets": manifest["sets"], "count": len(manifest["sets"])}
+def upsert_manifest_sets(data: UpsertManifestSetsRequest, if_match: Optional[str] = Header(None)):
+    sets = [entry.model_dump(exclude_none=True) for entry in data.sets]
+    with _catalog_edit(if_match) as catalog:
+        catalog.replace_sets(sets)
+    return {"sets": sets, "count": len(sets)}
 
 @router.post("/categories")
-def upsert_category(data: UpsertCategoryRequest):
+def upsert_category(data: UpsertCategoryRequest, if_match: Optional[str] = Header(None)):
     slug = _validate_category_slug(data.slug)
     label = _validate_category_label(data.label)
 
-    manifest = load_manifest()
-    categories = manifest.get("categories")
-    if not isinstance(categories, dict):
-        categories = {}
-
-    mode = "created"
-    if slug in categories:
-        if not data.force:
-            raise HTTPException(status_code=409, detail=f"Category '{slug}' already exists")
-        mode = "updated"
+    with _catalog_edit(if_match) as catalog:
+        mode = "created"
+        if catalog.get_category(slug) is not None:
+            if not data.force:
+                raise HTTPException(status_code=409, detail=f"Category '{slug}' already exists")
+            mode = "updated"
 
-    categories[slug] = {"label": label}
-    manifest["categories"] = categories
-    manifest["version"] = manifest.get("version", 1) + 1
-    save_manifest_atomic(manifest)
+        catalog.put_category(slug, {"label": label})
 
     return {"slug": slug, "label": label, "mode": mode}
 
 
-@router.post("/items")
-def create_item(data: CreateItemRequest):
+def _upsert_catalog_item(catalog: CatalogTransaction, data: CreateItemRequest) -> Dict[str, str]:
     try:
         normalized_pose_key = normalize_pose_key(data.poseKey)
         item_id = generate_item_id(data.article, normalized_pose_key)
@@ -212,10 +251,8 @@ def create_item(data: CreateItemRequest):
     default_label = _normalize_default_label(data.defaultLabel)
     pose_label = _normalize_pose_label(data.poseLabel)
 
-    manifest = load_manifest()
     category_slug = (data.category or "").strip()
-    categories = manifest.get("categories") or {}
-    if category_slug and category_slug not in categories:
+    if category_slug and catalog.get_category(category_slug) is None:
         raise HTTPException(
             status_code=400,
             detail=(
@@ -224,10 +261,7 @@ def create_item(data: CreateItemRequest):
             )
         )
 
-    existing_item = next(
-        (item for item in manifest["items"] if item["id"] == item_id),
-        None
-    )
+    existing_item = catalog.get_item(item_id)
 
     if existing_item:
         if existing_item.get("article") != data.article:
@@ -265,6 +299,7 @@ def create_item(data: CreateItemRequest):
                 existing_item["machining"] = machining_payload
             else:
                 existing_item.pop("machining", None)
+        catalog.put_item(existing_item)
         mode = "updated"
     else:
         new_item = {
@@ -286,30 +321,70 @@ def create_item(data: CreateItemRequest):
         machining_payload = data.machining.model_dump(exclude_none=True) if data.machining is not None else None
         if machining_payload:
             new_item["machining"] = machining_payload
-        manifest["items"].append(new_item)
+        catalog.put_item(new_item)
         mode = "created"
 
-    manifest["version"] = manifest.get("version", 1) + 1
-    save_manifest_atomic(manifest)
-
     return {"id": item_id, "mode": mode}
 
+
+@router.post("/items")
+def create_item(data: CreateItemRequest, if_match: Optional[str] = Header(None)):
+    with _catalog_edit(if_match) as catalog:
+        result = _upsert_catalog_item(catalog, data)
+    return result
+
+
+@router.post("/items:bulk")
+def create_items_bulk(data: BulkCreateItemsRequest, if_match: Optional[str] = Header(None)):
+    """Upsert many items with one manifest write; invalid rows are reported and skipped.
+
+    Ids are generated for the whole batch first: a row whose id repeats an earlier
+    row of the same batch is a collision and is reported, not applied as an update.
+    """
+    first_row_by_id: Dict[str, int] = {}
+    duplicate_of: Dict[int, Tuple[str, int]] = {}
+    for index, row in enumerate(data.items):
+        try:
+            item_id = generate_item_id(row.article, normalize_pose_key(row.poseKey))
+        except ValueError:
+            # Reported by _upsert_catalog_item with its usual message.
+            continue
+        if item_id in first_row_by_id:
+            duplicate_of[index] = (item_id, first_row_by_id[item_id])
+        else:
+            first_row_by_id[item_id] = index
+
+    results = []
+    with _catalog_edit(if_match) as catalog:
+        for index, row in enumerate(data.items):
+            if index in duplicate_of:
+                item_id, first_index = duplicate_of[index]
+                results.append({
+                    "index": index,
+                    "status": "error",
+                    "code": 409,
+                    "detail": f"Generated id collision: id '{item_id}' is already used by row {first_index} of this batch",
+                })
+                continue
+            try:
+                result = _upsert_catalog_item(catalog, row)
+            except HTTPException as exc:
+                results.append({"index": index, "status": "error", "code": exc.status_code, "detail": exc.detail})
+                continue
+            results.append({"index": index, "status": "ok", **result})
+
+    return {"version": catalog.version, "results": results}
+
 @router.post("/items/{item_id}/files")
 def upload_files(
     item_id: str,
     svg: Optional[UploadFile] = File(None),
     nc: Optional[UploadFile] = File(None),
     preview: Optional[UploadFile] = File(None),
-    force: bool = Form(False)
+    force: bool = Form(False),
+    if_match: Optional[str] = Header(None)
 ):
-    manifest = load_manifest()
-
-    item = next(
-        (i for i in manifest["items"] if i["id"] == item_id),
-        None
-    )
-    if not item:
-        raise HTTPException(404, "Item not found")
+    _require_item_for_upload(item_id, if_match)
 
     if not any([svg, nc, preview]):
         raise HTTPException(status_code=400, detail="At least one file is required")
@@ -349,138 +424,136 @@ def upload_files(
     timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
     staging_token = f"{timestamp}_{uuid.uuid4().hex[:8]}"
     staging_root = CONTOURS_DIR / ".staging" / f"{item_id}_{staging_token}"
-    staging_svg = (staging_root / "svg" / f"{item_id}.svg") if svg else None
-    staging_nc = (staging_root / "nc" / f"{item_id}.nc") if nc else None
-    staging_preview = None
-    preview_ext = None
+    staged: Dict[str, Path] = {}
+    if svg:
+        staged["svg"] = staging_root / "svg" / f"{item_id}.svg"
+    if nc:
+        staged["nc"] = staging_root / "nc" / f"{item_id}.nc"
     if preview:
         preview_ext = preview.filename.split(".")[-1].lower()
-        staging_preview = staging_root / "preview" / f"{item_id}.{preview_ext}"
+        staged["preview"] = staging_root / "preview" / f"{item_id}.{preview_ext}"
 
     staging_root.mkdir(parents=True, exist_ok=True)
     logger.info("Uploading files to staging %s", staging_root)
-    if svg and staging_svg:
-        save_upload_file(svg, staging_svg)
-    if nc and staging_nc:
-        save_upload_file(nc, staging_nc)
-    if preview and staging_preview:
-        save_upload_file(preview, staging_preview)
+    uploads = {"svg": svg, "nc": nc, "preview": preview}
+    try:
+        for kind, staging_path in staged.items():
+            save_upload_file(uploads[kind], staging_path)
+        return _commit_item_uploads(item_id, staged, staging_root, force, if_match)
+    finally:
+        shutil.rmtree(staging_root, ignore_errors=True)
 
-    svg_final = DIRS["svg"] / f"{item_id}.svg"
-    nc_final = DIRS["nc"] / f"{item_id}.nc"
-    preview_final = (
-        (DIRS["preview"] / f"{item_id}.{preview_ext}")
-        if preview_ext else None
-    )
+
+def _commit_item_uploads(
+    item_id: str,
+    staged: Dict[str, Path],
+    staging_root: Path,
+    force: bool,
+    if_match: Optional[str],
+) -> dict:
+    """Store staged files as content-addressed objects and point the item's assets at them.
+
+    Objects are immutable, so nothing published is ever overwritten: they are
+    written before the versioned catalog transaction, and an upload that
+    loses the If-Match race only leaves unreferenced objects behind.
+    Re-uploading identical content changes nothing.
+    """
+    current = _item_assets(item_id)
+    new_assets = {
+        kind: object_asset_path(staging_path, staging_path.suffix.lstrip("."))
+        for kind, staging_path in staged.items()
+    }
+    changed = {kind: path for kind, path in new_assets.items() if current.get(kind) != path}
+    if not changed:
+        logger.info("Upload for %s matches stored objects, nothing to do", item_id)
+        return {"status": "ok", "assets": current, "changed": []}
 
     if not force:
-        conflict_path = None
-        if svg and svg_final.exists():
-            conflict_path = svg_final
-        elif nc and nc_final.exists():
-            conflict_path = nc_final
-        elif preview_final and preview_final.exists():
-            conflict_path = preview_final
-
-        if conflict_path:
-            shutil.rmtree(staging_root, ignore_errors=True)
-            raise HTTPException(
-                status_code=409,
-                detail=f"File {conflict_path.name} already exists"
-            )
+        for kind in changed:
+            if _asset_exists(item_id, kind, current.get(kind)):
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"File {Path(current.get(kind) or f'{item_id}.{kind}').name} already exists"
+                )
 
-    backup_dir = staging_root / "backup"
-    backup_dir.mkdir(parents=True, exist_ok=True)
-    backups = {}
-    new_files = []
-
-    def backup_and_replace(staging_path: Path, final_path: Path):
-        if final_path.exists():
-            backup_path = backup_dir / f"{final_path.name}.bak_{staging_token}"
-            os.replace(final_path, backup_path)
-            backups[final_path] = backup_path
-            logger.info("Backed up %s to %s", final_path, backup_path)
-        else:
-            new_files.append(final_path)
-        os.replace(staging_path, final_path)
-        logger.info("Replaced %s from staging", final_path)
+    for kind, asset_path in changed.items():
+        if put_object(staged[kind], asset_path):
+            logger.info("Stored %s for %s as %s", kind, item_id, asset_path)
 
-    rotated_dir = CONTOURS_DIR / "nc" / item_id
-    rotated_backup = None
-    rotated_existed = nc is not None and rotated_dir.exists()
-    if rotated_existed:
-        rotated_backup = backup_dir / f"{item_id}.rotated.bak_{staging_token}"
-        os.replace(rotated_dir, rotated_backup)
-        logger.info("Backed up rotated dir %s to %s", rotated_dir, rotated_backup)
+    staging_rotated = staging_root / "rotated"
+    if "nc" in changed:
+        try:
+            rotate_gcode_for_contour(item_id, nc_path=CONTOURS_DIR / changed["nc"], target_dir=staging_rotated)
+        except Exception as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    swap_started = False
     try:
-        swap_started = True
-        if staging_svg:
-            backup_and_replace(staging_svg, svg_final)
-        if staging_nc:
-            backup_and_replace(staging_nc, nc_final)
-        if staging_preview and preview_final:
-            backup_and_replace(staging_preview, preview_final)
-        swap_started = True
-        if nc:
-            rotate_gcode_for_contour(item_id)
-    except Exception as exc:
-        if swap_started:
-            logger.warning("Upload failed, rolling back files for %s", item_id, exc_info=True)
-            if rotated_dir.exists():
-                shutil.rmtree(rotated_dir, ignore_errors=True)
-            if rotated_backup and rotated_backup.exists():
-                os.replace(rotated_backup, rotated_dir)
-                logger.info("Restored rotated dir from backup %s", rotated_backup)
-            for final_path, backup_path in backups.items():
-                if backup_path.exists():
-                    os.replace(backup_path, final_path)
-                    logger.info("Restored %s from backup", final_path)
-            for final_path in new_files:
-                if final_path.exists():
-                    rollback_path = backup_dir / f"{final_path.name}.rollback_{staging_token}"
-                    os.replace(final_path, rollback_path)
-                    logger.info("Moved new file %s to rollback stash", final_path)
-        shutil.rmtree(staging_root, ignore_errors=True)
-        if isinstance(exc, HTTPException):
-            raise
-        raise HTTPException(status_code=400, detail=str(exc))
-    else:
-        logger.info("Upload committed for %s, cleaning backups", item_id)
-        shutil.rmtree(backup_dir, ignore_errors=True)
-        shutil.rmtree(staging_root, ignore_errors=True)
+        with _catalog_edit(if_match) as catalog:
+            item = catalog.get_item(item_id)
+            if not item:
+                raise HTTPException(404, "Item not found")
+            assets = item.get("assets") or {}
+            item["assets"] = {
+                kind: changed.get(kind) or _normalize_asset_path(assets.get(kind))
+                for kind in ("svg", "nc", "preview")
+            }
+            # Rotated programs are per item, not objects: swap them only once the version check passed.
+            if "nc" in changed:
+                _swap_rotated_gcode(item_id, staging_rotated, staging_root)
+            catalog.put_item(item)
+    except BaseException:
+        if "nc" in changed:
+            _restore_rotated_gcode(item_id, staging_rotated, staging_root)
+        raise
+
+    logger.info("Upload committed for %s: %s", item_id, ", ".join(sorted(changed)))
+    return {"status": "ok", "assets": item["assets"], "changed": sorted(changed)}
+
 
+def _item_assets(item_id: str) -> Dict[str, Optional[str]]:
+    item = load_manifest_snapshot().items_by_id.get(item_id) or {}
     assets = item.get("assets") or {}
-    item["assets"] = {
-        "svg": f"svg/{item_id}.svg" if svg else _normalize_asset_path(assets.get("svg")),
-        "nc": f"nc/{item_id}.nc" if nc else _normalize_asset_path(assets.get("nc")),
-        "preview": (
-            f"preview/{preview_final.name}"
-            if preview_final else _normalize_asset_path(assets.get("preview"))
-        )
-    }
+    return {kind: _normalize_asset_path(assets.get(kind)) for kind in ("svg", "nc", "preview")}
 
-    manifest["version"] = manifest.get("version", 1) + 1
-    save_manifest_atomic(manifest)
 
-    return {"status": "ok"}
+def _asset_exists(item_id: str, kind: str, asset_path: Optional[str]) -> bool:
+    if asset_path:
+        return object_exists(asset_path) if is_object_asset(asset_path) else (CONTOURS_DIR / asset_path).exists()
+    if kind == "preview":
+        return current_asset_index().preview.first_with_stem(item_id) is not None
+    return (DIRS[kind] / f"{item_id}.{kind}").exists()
+
+
+def _swap_rotated_gcode(item_id: str, staging_rotated: Path, staging_root: Path) -> None:
+    """Replace nc/<id>/ with the freshly generated rotated_*.nc as a whole directory."""
+    rotated_dir = CONTOURS_DIR / "nc" / item_id
+    rotated_dir.parent.mkdir(parents=True, exist_ok=True)
+    if rotated_dir.exists():
+        os.replace(rotated_dir, staging_root / "rotated.bak")
+        logger.info("Backed up rotated dir %s", rotated_dir)
+    os.replace(staging_rotated, rotated_dir)
+
+
+def _restore_rotated_gcode(item_id: str, staging_rotated: Path, staging_root: Path) -> None:
+    if staging_rotated.exists():
+        # Never swapped in.
+        return
+    rotated_dir = CONTOURS_DIR / "nc" / item_id
+    rotated_backup = staging_root / "rotated.bak"
+    shutil.rmtree(rotated_dir, ignore_errors=True)
+    if rotated_backup.exists():
+        os.replace(rotated_backup, rotated_dir)
+        logger.info("Restored rotated dir from backup %s", rotated_backup)
 
 
 @router.post("/items/{item_id}/dxf-to-svg")
 def upload_dxf_convert_to_svg(
     item_id: str,
     dxf: UploadFile = File(...),
-    force: bool = Form(False)
+    force: bool = Form(False),
+    if_match: Optional[str] = Header(None)
 ):
-    manifest = load_manifest()
-
-    item = next(
-        (i for i in manifest["items"] if i["id"] == item_id),
-        None
-    )
-    if not item:
-        raise HTTPException(404, "Item not found")
+    _require_item_for_upload(item_id, if_match)
 
     if not dxf.filename or not dxf.filename.lower().endswith(".dxf"):
         raise HTTPException(status_code=400, detail="DXF file is required")
@@ -533,27 +606,9 @@ def upload_dxf_convert_to_svg(
     geometry_backup = None
     created_new_svg = False
     created_new_geometry = False
+    swap_started = False
 
-    try:
-        if svg_final.exists():
-            svg_backup = backup_dir / f"{svg_final.name}.bak_{staging_token}"
-            os.replace(svg_final, svg_backup)
-            logger.info("Backed up %s to %s", svg_final, svg_backup)
-        else:
-            created_new_svg = True
-
-        if geometry_final.exists():
-            geometry_backup = backup_dir / f"{geometry_final.name}.bak_{staging_token}"
-            os.replace(geometry_final, geometry_backup)
-            logger.info("Backed up %s to %s", geometry_final, geometry_backup)
-        else:
-            created_new_geometry = True
-
-        os.replace(staging_svg, svg_final)
-        os.replace(staging_geometry, geometry_final)
-        logger.info("Replaced %s and %s from staged DXF conversion", svg_final, geometry_final)
-    except Exception as exc:
-        logger.warning("DXF upload failed, rolling back files for %s", item_id, exc_info=True)
+    def restore_files():
         if svg_backup and svg_backup.exists():
             if svg_final.exists():
                 rollback_path = backup_dir / f"{svg_final.name}.rollback_{staging_token}"
@@ -576,98 +631,279 @@ def upload_dxf_convert_to_svg(
             os.replace(geometry_final, rollback_path)
             logger.info("Moved new file %s to rollback stash", geometry_final)
 
+    # Files are swapped inside the catalog transaction, after its If-Match
+    # check, so a concurrent edit is a 409 and never leaves files replaced.
+    try:
+        with _catalog_edit(if_match) as catalog:
+            item = catalog.get_item(item_id)
+            if not item:
+                raise HTTPException(404, "Item not found")
+
+            swap_started = True
+            if svg_final.exists():
+                svg_backup = backup_dir / f"{svg_final.name}.bak_{staging_token}"
+                os.replace(svg_final, svg_backup)
+                logger.info("Backed up %s to %s", svg_final, svg_backup)
+            else:
+                created_new_svg = True
+
+            if geometry_final.exists():
+                geometry_backup = backup_dir / f"{geometry_final.name}.bak_{staging_token}"
+                os.replace(geometry_final, geometry_backup)
+                logger.info("Backed up %s to %s", geometry_final, geometry_backup)
+            else:
+                created_new_geometry = True
+
+            os.replace(staging_svg, svg_final)
+            os.replace(staging_geometry, geometry_final)
+            logger.info("Replaced %s and %s from staged DXF conversion", svg_final, geometry_final)
+
+            assets = item.get("assets") or {}
+            item["assets"] = {
+                "svg": f"svg/{item_id}.svg",
+                "nc": _normalize_asset_path(assets.get("nc")),
+                "preview": _normalize_asset_path(assets.get("preview"))
+            }
+            catalog.put_item(item)
+    except Exception as exc:
+        if swap_started:
+            logger.warning("DXF upload failed, rolling back files for %s", item_id, exc_info=True)
+            restore_files()
         shutil.rmtree(staging_root, ignore_errors=True)
+        if isinstance(exc, HTTPException):
+            raise
         raise HTTPException(status_code=400, detail=str(exc))
     else:
         logger.info("DXF conversion committed for %s, cleaning backups", item_id)
-        shutil.rmtree(backup_dir, ignore_errors=True)
         shutil.rmtree(staging_root, ignore_errors=True)
 
-    assets = item.get("assets") or {}
-    item["assets"] = {
+    return {
+        "status": "ok",
         "svg": f"svg/{item_id}.svg",
-        "nc": _normalize_asset_path(assets.get("nc")),
-        "preview": _normalize_asset_path(assets.get("preview"))
+        "geometry": f"geometry/{item_id}.json"
     }
 
-    manifest["version"] = manifest.get("version", 1) + 1
-    save_manifest_atomic(manifest)
+class InnerContourRequest(BaseModel):
+    toolDiameter: float = Field(..., gt=0)
+    zDepth: float
+    feed: float = Field(..., gt=0)
+    # Fraction of the tool diameter between pocket offsets; omitted = single contour pass.
+    stepover: Optional[float] = Field(None, gt=0, le=1)
+
+
+class InnerContourBatchRequest(InnerContourRequest):
+    ids: Optional[List[str]] = Field(None, max_length=INNER_CONTOUR_BATCH_MAX_ITEMS)
+    # Without ids: the catalog is processed page by page, cursor = nextCursor of the previous response.
+    cursor: Optional[str] = None
+
+
+INNER_CONTOUR_CACHE_KEY_RE = re.compile(r"^[0-9a-f]{16}$")
+
+
+def _inner_contour_url(item_id: str, cache_key: str) -> str:
+    return f"/admin/api/items/{item_id}/inner-contour/{cache_key}.nc"
+
+
+@router.post("/items/{item_id}/inner-contour")
+def generate_item_inner_contour(item_id: str, data: InnerContourRequest):
+    if item_id not in load_manifest_snapshot().items_by_id:
+        raise HTTPException(404, "Item not found")
+
+    try:
+        result = generate_inner_contour(item_id, data.toolDiameter, data.zDepth, data.feed, data.stepover)
+    except GeometryInnerContourError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    if result is None:
+        raise HTTPException(404, "Geometry not found")
 
     return {
         "status": "ok",
-        "svg": f"svg/{item_id}.svg",
-        "geometry": f"geometry/{item_id}.json"
+        "cached": result.cached,
+        "cacheKey": result.cache_key,
+        "nc": _inner_contour_url(item_id, result.cache_key),
     }
 
+
+@router.post("/inner-contour")
+def generate_catalog_inner_contours(data: InnerContourBatchRequest):
+    """Regenerate inner contours for up to INNER_CONTOUR_BATCH_MAX_ITEMS items (in-process, cached).
+
+    Without ``ids`` the next page of the catalog after ``cursor`` is processed;
+    repeat with the returned ``nextCursor`` until it is null.
+    """
+    snapshot = load_manifest_snapshot()
+    known_ids = snapshot.items_by_id
+    next_cursor = None
+    if data.ids is not None:
+        item_ids = data.ids
+    else:
+        after = -1
+        if data.cursor is not None:
+            if data.cursor not in snapshot.item_positions:
+                raise HTTPException(status_code=400, detail="Unknown cursor")
+            after = snapshot.item_positions[data.cursor]
+        remaining = [
+            item_id
+            for item_id, position in sorted(snapshot.item_positions.items(), key=lambda entry: entry[1])
+            if position > after
+        ]
+        item_ids = remaining[:INNER_CONTOUR_BATCH_MAX_ITEMS]
+        if len(remaining) > len(item_ids):
+            next_cursor = item_ids[-1]
+
+    results = []
+    for item_id in item_ids:
+        if item_id not in known_ids:
+            results.append({"id": item_id, "status": "error", "detail": "Item not found"})
+            continue
+        try:
+            result = generate_inner_contour(item_id, data.toolDiameter, data.zDepth, data.feed, data.stepover)
+        except GeometryInnerContourError as exc:
+            results.append({"id": item_id, "status": "error", "detail": str(exc)})
+            continue
+        if result is None:
+            results.append({"id": item_id, "status": "error", "detail": "Geometry not found"})
+            continue
+        results.append({
+            "id": item_id,
+            "status": "ok",
+            "cached": result.cached,
+            "cacheKey": result.cache_key,
+            "nc": _inner_contour_url(item_id, result.cache_key),
+        })
+
+    return {"results": results, "nextCursor": next_cursor}
+
+
+@router.get("/items/{item_id}/inner-contour/{cache_key}.nc")
+def download_item_inner_contour(item_id: str, cache_key: str):
+    if item_id not in load_manifest_snapshot().items_by_id:
+        raise HTTPException(404, "Item not found")
+    if not INNER_CONTOUR_CACHE_KEY_RE.match(cache_key):
+        raise HTTPException(404, "Inner contour not found")
+
+    nc_path = contour_inner_contour_path(item_id, cache_key)
+    if not nc_path.is_file():
+        raise HTTPException(404, "Inner contour not found")
+    return FileResponse(nc_path, media_type="text/plain", filename=f"{item_id}_inner_{cache_key}.nc")
+
+
 @router.get("/items")
-def list_items():
-    manifest = load_manifest()
-    preview_dir = CONTOURS_DIR / "preview"
+def list_items(
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=ITEMS_PAGE_MAX_LIMIT),
+    category: Optional[str] = None,
+    brand: Optional[str] = None,
+    enabled: Optional[bool] = None,
+    missing: Optional[Literal["svg", "nc", "preview"]] = None,
+):
+    """Admin item table; without ``limit`` every matching item is returned.
+
+    ``cursor`` is the ``nextCursor`` of the previous page (the last item id
+    returned), so pages stay stable while other items are added.
+    """
+    snapshot = load_manifest_snapshot()
+    assets = current_asset_index()
+
+    after = -1
+    if cursor is not None:
+        if cursor not in snapshot.item_positions:
+            raise HTTPException(status_code=400, detail="Unknown cursor")
+        after = snapshot.item_positions[cursor]
+
+    if category is not None:
+        candidates = snapshot.items_by_category.get(category, ())
+    else:
+        candidates = snapshot.manifest["items"]
+
+    total = 0
+    page = []
+    next_cursor = None
+    for i in candidates:
+        if not isinstance(i, dict) or i.get("id") not in snapshot.item_positions:
+            continue
+        if brand is not None and i.get("brand", "") != brand:
+            continue
+        if enabled is not None and i.get("enabled", True) != enabled:
+            continue
+        files = None
+        if missing is not None:
+            files = _item_files_status(i, assets)
+            if files[missing]:
+                continue
+        total += 1
+        if snapshot.item_positions[i["id"]] <= after:
+            continue
+        if limit is not None and len(page) == limit:
+            next_cursor = page[-1]["id"]
+            continue
+        page.append(_list_item_entry(i, assets, files))
+
     return {
-        "version": manifest.get("version"),
-        "items": [
-            {
-                "id": i["id"],
-                "article": i["article"],
-                "name": i["name"],
-                "brand": i.get("brand", ""),
-                "category": i.get("category", ""),
-                "scaleOverride": i.get("scaleOverride", 1.0),
-                "cuttingLengthMeters": i.get("cuttingLengthMeters", 0),
-                "enabled": i.get("enabled", True),
-                "defaultLabel": i.get("defaultLabel"),
-                "poseKey": i.get("poseKey"),
-                "poseLabel": i.get("poseLabel"),
-                "machining": i.get("machining"),
-                "assets": i.get("assets"),
-                "files": _item_files_status(i, preview_dir),
-                "previewUrl": _item_preview_url(i, preview_dir)
-            }
-            for i in manifest["items"]
-        ]
+        "version": snapshot.version,
+        "total": total,
+        "nextCursor": next_cursor,
+        "items": page
     }
 
 
-def _item_files_status(item: dict, preview_dir: Path) -> dict:
-    item_id = item["id"]
-    assets = item.get("assets") or {}
-    svg_exists = (CONTOURS_DIR / "svg" / f"{item_id}.svg").exists()
-    nc_exists = (CONTOURS_DIR / "nc" / f"{item_id}.nc").exists()
-    preview_exists = _preview_file_path(item_id, assets, preview_dir) is not None
+def _list_item_entry(i: dict, assets: AssetIndex, files: Optional[dict] = None) -> dict:
     return {
-        "svg": svg_exists,
-        "nc": nc_exists,
-        "preview": preview_exists
+        "id": i["id"],
+        "article": i["article"],
+        "name": i["name"],
+        "brand": i.get("brand", ""),
+        "category": i.get("category", ""),
+        "scaleOverride": i.get("scaleOverride", 1.0),
+        "cuttingLengthMeters": i.get("cuttingLengthMeters", 0),
+        "enabled": i.get("enabled", True),
+        "defaultLabel": i.get("defaultLabel"),
+        "poseKey": i.get("poseKey"),
+        "poseLabel": i.get("poseLabel"),
+        "machining": i.get("machining"),
+        "assets": i.get("assets"),
+        "files": files or _item_files_status(i, assets),
+        "previewUrl": _item_preview_url(i, assets)
     }
 
 
-def _item_preview_url(item: dict, preview_dir: Path) -> Optional[str]:
-    assets = item.get("assets") or {}
-    preview_path = _preview_file_path(item["id"], assets, preview_dir)
-    if not preview_path:
-        return None
-    relative = _preview_relative_path(preview_path, assets)
-    return f"/contours/{relative}"
+def _item_files_status(item: dict, assets: AssetIndex) -> dict:
+    return {
+        "svg": _asset_file_present(item, "svg", assets),
+        "nc": _asset_file_present(item, "nc", assets),
+        "preview": _preview_relative_path(item, assets) is not None
+    }
 
 
-def _preview_file_path(item_id: str, assets: dict, preview_dir: Path) -> Optional[Path]:
-    preview_asset = assets.get("preview")
-    if preview_asset:
-        normalized = _normalize_asset_path(preview_asset)
-        preview_path = CONTOURS_DIR / normalized
-        if preview_path.exists():
-            return preview_path
-    for candidate in sorted(preview_dir.glob(f"{item_id}.*")):
-        if candidate.is_file():
-            return candidate
-    return None
+def _asset_file_present(item: dict, kind: str, assets: AssetIndex) -> bool:
+    """The stored object assets.<kind> points at, or the legacy <kind>/<id>.<kind> file."""
+    asset_path = _normalize_asset_path((item.get("assets") or {}).get(kind))
+    if is_object_asset(asset_path):
+        return object_exists(asset_path)
+    return assets.listing_for(kind).has(f"{item['id']}.{kind}")
+
+
+def _item_preview_url(item: dict, assets: AssetIndex) -> Optional[str]:
+    relative = _preview_relative_path(item, assets)
+    if not relative:
+        return None
+    return f"/contours/{relative}"
 
 
-def _preview_relative_path(preview_path: Path, assets: dict) -> str:
-    preview_asset = assets.get("preview")
+def _preview_relative_path(item: dict, assets: AssetIndex) -> Optional[str]:
+    """Preview from assets.preview if present on disk, else the first preview/<id>.* file."""
+    preview_asset = (item.get("assets") or {}).get("preview")
     if preview_asset:
         normalized = _normalize_asset_path(preview_asset)
-        expected = CONTOURS_DIR / normalized
-        if preview_path == expected:
+        asset_dir, _, name = normalized.partition("/")
+        listing = assets.listing_for(asset_dir)
+        if is_object_asset(normalized):
+            if object_exists(normalized):
+                return normalized
+        elif listing is not None and name and "/" not in name:
+            if listing.has(name):
+                return normalized
+        elif (CONTOURS_DIR / normalized).exists():
             return normalized
-    return preview_path.relative_to(CONTOURS_DIR).as_posix()
+    name = assets.preview.first_with_stem(item["id"])
+    return f"preview/{name}" if name else None
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from domain_store import CONTOURS_DIR
+
+ASSET_DIRS = ("svg", "nc", "preview")
+
+
+@dataclass(frozen=True)
+class DirectoryListing:
+    """Regular files directly inside one asset directory."""
+
+    mtime_ns: int
+    names: FrozenSet[str]
+    # "<stem>" -> sorted "<stem>.*" names, the same set glob(f"{stem}.*") returns.
+    by_stem: Dict[str, Tuple[str, ...]]
+
+    def has(self, name: str) -> bool:
+        return name in self.names
+
+    def first_with_stem(self, stem: str) -> Optional[str]:
+        names = self.by_stem.get(stem)
+        return names[0] if names else None
+
+
+_EMPTY_LISTING = DirectoryListing(mtime_ns=-1, names=frozenset(), by_stem={})
+_listings: Dict[Path, DirectoryListing] = {}
+_listings_lock = Lock()
+
+
+def _scan_directory(path: Path, mtime_ns: int) -> DirectoryListing:
+    names = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_file():
+                names.append(entry.name)
+    by_stem: Dict[str, list] = {}
+    for name in sorted(names):
+        stem, dot, _ = name.partition(".")
+        if dot:
+            by_stem.setdefault(stem, []).append(name)
+    return DirectoryListing(
+        mtime_ns=mtime_ns,
+        names=frozenset(names),
+        by_stem={stem: tuple(group) for stem, group in by_stem.items()},
+    )
+
+
+def directory_listing(path: Path) -> DirectoryListing:
+    """Listing of ``path``, rescanned only when the directory mtime changes.
+
+    Uploads land via os.replace/rename, which always touches the directory
+    mtime, so a cached listing never misses an added or removed file.
+    """
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return _EMPTY_LISTING
+
+    listing = _listings.get(path)
+    if listing is not None and listing.mtime_ns == mtime_ns:
+        return listing
+
+    try:
+        listing = _scan_directory(path, mtime_ns)
+    except FileNotFoundError:
+        return _EMPTY_LISTING
+    with _listings_lock:
+        _listings[path] = listing
+    return listing
+
+
+@dataclass(frozen=True)
+class AssetIndex:
+    svg: DirectoryListing
+    nc: DirectoryListing
+    preview: DirectoryListing
+
+    def listing_for(self, asset_dir: str) -> Optional[DirectoryListing]:
+        return getattr(self, asset_dir) if asset_dir in ASSET_DIRS else None
+
+
+def current_asset_index() -> AssetIndex:
+    """svg/, nc/ and preview/ listings; one stat per directory when nothing changed."""
+    return AssetIndex(**{name: directory_listing(CONTOURS_DIR / name) for name in ASSET_DIRS})
@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import shutil
+import sys
+import time
+import uuid
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Sequence
+
+from admin_api.dxf_to_svg import convert
+from admin_api.file_service import DIRS
+from admin_api.manifest_service import catalog_transaction, load_manifest_snapshot
+from domain_store import CONTOURS_DIR, contour_geometry_path
+
+DEFAULT_WORKERS = max(1, min(8, os.cpu_count() or 1))
+
+
+@dataclass
+class BulkImportError(Exception):
+    message: str
+    details: str | None = None
+
+    def __str__(self) -> str:
+        return self.message if not self.details else f"{self.message}: {self.details}"
+
+
+@dataclass(frozen=True)
+class CliConfig:
+    input_dir: Path
+    mapping_path: Path | None
+    workers: int
+    force: bool
+    report_path: Path | None
+
+
+@dataclass(frozen=True)
+class ImportJob:
+    item_id: str
+    dxf_path: Path
+    staging_svg: Path
+    staging_geometry: Path
+
+
+@dataclass
+class ImportResult:
+    item_id: str
+    dxf_path: str
+    ok: bool
+    error: str | None = None
+    loops: int = 0
+    elapsed_ms: float = 0.0
+
+
+@dataclass
+class BatchReport:
+    manifest_version: int | None = None
+    results: list[ImportResult] = field(default_factory=list)
+
+    @property
+    def failures(self) -> list[ImportResult]:
+        return [result for result in self.results if not result.ok]
+
+
+def _read_mapping(mapping_path: Path) -> dict[str, str]:
+    """Mapping of DXF file name (relative to --input-dir) to item id.
+
+    Accepts a JSON object ``{"file.dxf": "item-id"}`` or a CSV with ``file,id`` columns.
+    """
+    try:
+        if mapping_path.suffix.lower() == ".json":
+            with mapping_path.open("r", encoding="utf-8") as source:
+                payload = json.load(source)
+            if not isinstance(payload, dict):
+                raise BulkImportError("Mapping JSON must be an object", str(mapping_path))
+            return {str(name): str(item_id) for name, item_id in payload.items()}
+
+        with mapping_path.open("r", encoding="utf-8", newline="") as source:
+            reader = csv.DictReader(source)
+            if not reader.fieldnames or not {"file", "id"} <= set(reader.fieldnames):
+                raise BulkImportError("Mapping CSV must have 'file' and 'id' columns", str(mapping_path))
+            return {row["file"].strip(): row["id"].strip() for row in reader if row.get("file") and row.get("id")}
+    except (OSError, json.JSONDecodeError, csv.Error) as exc:
+        raise BulkImportError("Cannot read mapping file", str(exc)) from exc
+
+
+def _collect_sources(config: CliConfig) -> dict[str, Path]:
+    if config.mapping_path is not None:
+        mapping = _read_mapping(config.mapping_path)
+        return {item_id: config.input_dir / name for name, item_id in mapping.items()}
+
+    # Without a mapping, the file stem is the item id.
+    return {
+        path.stem: path
+        for path in sorted(config.input_dir.iterdir())
+        if path.is_file() and path.suffix.lower() == ".dxf"
+    }
+
+
+def _convert_one(job: ImportJob) -> ImportResult:
+    """Worker: DXF -> staged SVG + geometry JSON. Runs in a separate process."""
+    started = time.perf_counter()
+    try:
+        job.staging_svg.parent.mkdir(parents=True, exist_ok=True)
+        job.staging_geometry.parent.mkdir(parents=True, exist_ok=True)
+        geometry_payload = convert(job.dxf_path, job.staging_svg)
+        with job.staging_svg.open("rb") as svg_fp:
+            ET.parse(svg_fp)
+        job.staging_geometry.write_text(
+            json.dumps(geometry_payload, ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+        loops = len(geometry_payload.get("loops") or [geometry_payload["vertices"]])
+        return ImportResult(
+            item_id=job.item_id,
+            dxf_path=str(job.dxf_path),
+            ok=True,
+            loops=loops,
+            elapsed_ms=(time.perf_counter() - started) * 1000.0,
+        )
+    except Exception as exc:
+        return ImportResult(
+            item_id=job.item_id,
+            dxf_path=str(job.dxf_path),
+            ok=False,
+            error=f"DXF conversion failed: {exc}",
+            elapsed_ms=(time.perf_counter() - started) * 1000.0,
+        )
+
+
+def _publish(job: ImportJob) -> None:
+    # Each file lands with a single rename, so readers never see a partial SVG/geometry.
+    svg_final = DIRS["svg"] / f"{job.item_id}.svg"
+    geometry_final = contour_geometry_path(job.item_id)
+    svg_final.parent.mkdir(parents=True, exist_ok=True)
+    geometry_final.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(job.staging_geometry, geometry_final)
+    os.replace(job.staging_svg, svg_final)
+
+
+def _update_manifest(imported_ids: Sequence[str]) -> int | None:
+    if not imported_ids:
+        return None
+
+    with catalog_transaction() as catalog:
+        for item_id in imported_ids:
+            item = catalog.get_item(item_id)
+            if item is None:
+                continue
+            assets = item.get("assets") or {}
+            item["assets"] = {
+                "svg": f"svg/{item_id}.svg",
+                "nc": assets.get("nc"),
+                "preview": assets.get("preview"),
+            }
+            catalog.put_item(item)
+    return catalog.version
+
+
+def run_import(config: CliConfig) -> BatchReport:
+    known_ids = load_manifest_snapshot().items_by_id
+    sources = _collect_sources(config)
+
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    staging_root = CONTOURS_DIR / ".staging" / f"bulk_{timestamp}_{uuid.uuid4().hex[:8]}"
+
+    report = BatchReport()
+    jobs: list[ImportJob] = []
+    for item_id, dxf_path in sources.items():
+        error = None
+        if item_id not in known_ids:
+            error = "Item not found"
+        elif not dxf_path.is_file():
+            error = "DXF file does not exist"
+        elif not config.force and (DIRS["svg"] / f"{item_id}.svg").exists():
+            error = f"File {item_id}.svg already exists"
+        if error:
+            report.results.append(ImportResult(item_id=item_id, dxf_path=str(dxf_path), ok=False, error=error))
+            continue
+        jobs.append(ImportJob(
+            item_id=item_id,
+            dxf_path=dxf_path,
+            staging_svg=staging_root / "svg" / f"{item_id}.svg",
+            staging_geometry=staging_root / "geometry" / f"{item_id}.json",
+        ))
+
+    jobs_by_id = {job.item_id: job for job in jobs}
+    imported_ids: list[str] = []
+    try:
+        if jobs:
+            with ProcessPoolExecutor(max_workers=min(config.workers, len(jobs))) as executor:
+                futures = [executor.submit(_convert_one, job) for job in jobs]
+                for future in as_completed(futures):
+                    result = future.result()
+                    if result.ok:
+                        try:
+                            _publish(jobs_by_id[result.item_id])
+                            imported_ids.append(result.item_id)
+                        except OSError as exc:
+                            result.ok = False
+                            result.error = f"Cannot publish files: {exc}"
+                    report.results.append(result)
+
+        report.manifest_version = _update_manifest(imported_ids)
+    finally:
+        shutil.rmtree(staging_root, ignore_errors=True)
+
+    report.results.sort(key=lambda result: result.item_id)
+    return report
+
+
+def _parse_args(argv: Sequence[str]) -> CliConfig:
+    parser = argparse.ArgumentParser(
+        description="Convert a directory of DXF files into catalog SVG + geometry JSON in parallel.",
+    )
+    parser.add_argument("--input-dir", required=True, dest="input_dir", help="Directory with DXF files")
+    parser.add_argument(
+        "--mapping",
+        dest="mapping_path",
+        help="JSON object or CSV (file,id) mapping DXF file names to item ids; defaults to file stem == id",
+    )
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Worker processes")
+    parser.add_argument("--force", action="store_true", help="Overwrite existing SVG/geometry")
+    parser.add_argument("--report", dest="report_path", help="Write a JSON report to this path")
+    args = parser.parse_args(argv)
+
+    input_dir = Path(args.input_dir)
+    if not input_dir.is_dir():
+        raise BulkImportError("--input-dir must point to an existing directory", str(input_dir))
+
+    mapping_path = Path(args.mapping_path) if args.mapping_path else None
+    if mapping_path is not None and not mapping_path.is_file():
+        raise BulkImportError("--mapping must point to an existing file", str(mapping_path))
+
+    if args.workers <= 0:
+        raise BulkImportError("--workers must be > 0")
+
+    return CliConfig(
+        input_dir=input_dir,
+        mapping_path=mapping_path,
+        workers=args.workers,
+        force=bool(args.force),
+        report_path=Path(args.report_path) if args.report_path else None,
+    )
+
+
+def run_cli(argv: Sequence[str]) -> int:
+    try:
+        config = _parse_args(argv)
+        started = time.perf_counter()
+        report = run_import(config)
+    except (BulkImportError, RuntimeError) as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+
+    for result in report.results:
+        if result.ok:
+            print(f"OK: {result.item_id} <- {result.dxf_path} (loops={result.loops}, {result.elapsed_ms:.0f} ms)")
+        else:
+            print(f"ERROR: {result.item_id} <- {result.dxf_path}: {result.error}", file=sys.stderr)
+
+    imported = len(report.results) - len(report.failures)
+    print(
+        f"Imported {imported}/{len(report.results)} in {time.perf_counter() - started:.1f} s",
+        f"manifest_version={report.manifest_version}",
+        sep="\n",
+    )
+
+    if config.report_path is not None:
+        config.report_path.write_text(
+            json.dumps(
+                {
+                    "manifestVersion": report.manifest_version,
+                    "results": [
+                        {
+                            "id": result.item_id,
+                            "dxf": result.dxf_path,
+                            "ok": result.ok,
+                            "error": result.error,
+                            "loops": result.loops,
+                        }
+                        for result in report.results
+                    ],
+                },
+                ensure_ascii=False,
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+
+    return 0 if not report.failures else 1
+
+
+def main() -> None:
+    raise SystemExit(run_cli(sys.argv[1:]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Keys stored in their own tables; everything else at the top level of
+# manifest.json is kept verbatim in meta.extra.
+_TABLE_KEYS = ("version", "categories", "items", "sets")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS categories (
+    slug TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    article TEXT,
+    category TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_position ON items (position);
+CREATE INDEX IF NOT EXISTS items_category ON items (category);
+CREATE INDEX IF NOT EXISTS items_article ON items (article);
+CREATE TABLE IF NOT EXISTS sets (
+    position INTEGER PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+class CatalogTransaction(ABC):
+    """Catalog edits made inside ``manifest_service.catalog_transaction()``.
+
+    Items and categories are returned as copies the caller may modify; changes
+    only take effect through ``put_item``/``put_category``/``replace_sets``.
+    """
+
+    version: int
+    changed: bool
+
+    @abstractmethod
+    def get_item(self, item_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def put_item(self, item: Dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    def get_category(self, slug: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def put_category(self, slug: str, meta: Dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    def replace_sets(self, sets: List[Dict[str, Any]]) -> None:
+        ...
+
+
+class JsonCatalogTransaction(CatalogTransaction):
+    """Edits applied to a mutable manifest dict that is then saved as a whole."""
+
+    def __init__(self, manifest: Dict[str, Any]):
+        self.manifest = manifest
+        self.version = manifest.get("version", 1)
+        self.changed = False
+        self._positions = {
+            item["id"]: index
+            for index, item in enumerate(manifest["items"])
+            if isinstance(item, dict) and isinstance(item.get("id"), str)
+        }
+
+    def get_item(self, item_id: str) -> Optional[Dict[str, Any]]:
+        index = self._positions.get(item_id)
+        return dict(self.manifest["items"][index]) if index is not None else None
+
+    def put_item(self, item: Dict[str, Any]) -> None:
+        index = self._positions.get(item["id"])
+        if index is None:
+            self._positions[item["id"]] = len(self.manifest["items"])
+            self.manifest["items"].append(item)
+        else:
+            self.manifest["items"][index] = item
+        self.changed = True
+
+    def get_category(self, slug: str) -> Optional[Dict[str, Any]]:
+        categories = self.manifest.get("categories")
+        if not isinstance(categories, dict) or slug not in categories:
+            return None
+        return dict(categories[slug] or {})
+
+    def put_category(self, slug: str, meta: Dict[str, Any]) -> None:
+        if not isinstance(self.manifest.get("categories"), dict):
+            self.manifest["categories"] = {}
+        self.manifest["categories"][slug] = meta
+        self.changed = True
+
+    def replace_sets(self, sets: List[Dict[str, Any]]) -> None:
+        self.manifest["sets"] = sets
+        self.changed = True
+
+
+class SqliteCatalogTransaction(CatalogTransaction):
+    """Edits written row by row inside one ``BEGIN IMMEDIATE`` transaction."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.version = int(_read_meta(conn, "version", 1))
+        self.changed = False
+
+    def get_item(self, item_id: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute("SELECT data FROM items WHERE id = ?", (item_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_item(self, item: Dict[str, Any]) -> None:
+        updated = self.conn.execute(
+            "UPDATE items SET article = ?, category = ?, data = ? WHERE id = ?",
+            (item.get("article"), item.get("category"), _dumps(item), item["id"]),
+        ).rowcount
+        if not updated:
+            self.conn.execute(
+                "INSERT INTO items (id, position, article, category, data) "
+                "VALUES (?, (SELECT COALESCE(MAX(position), -1) + 1 FROM items), ?, ?, ?)",
+                (item["id"], item.get("article"), item.get("category"), _dumps(item)),
+            )
+        self.changed = True
+
+    def get_category(self, slug: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute("SELECT data FROM categories WHERE slug = ?", (slug,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_category(self, slug: str, meta: Dict[str, Any]) -> None:
+        updated = self.conn.execute(
+            "UPDATE categories SET data = ? WHERE slug = ?", (_dumps(meta), slug)
+        ).rowcount
+        if not updated:
+            self.conn.execute(
+                "INSERT INTO categories (slug, position, data) "
+                "VALUES (?, (SELECT COALESCE(MAX(position), -1) + 1 FROM categories), ?)",
+                (slug, _dumps(meta)),
+            )
+        self.changed = True
+
+    def replace_sets(self, sets: List[Dict[str, Any]]) -> None:
+        self.conn.execute("DELETE FROM sets")
+        self.conn.executemany(
+            "INSERT INTO sets (position, data) VALUES (?, ?)",
+            [(index, _dumps(entry)) for index, entry in enumerate(sets)],
+        )
+        self.changed = True
+
+
+def _read_meta(conn: sqlite3.Connection, key: str, default: Any = None) -> Any:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return json.loads(row[0]) if row else default
+
+
+def _write_meta(conn: sqlite3.Connection, key: str, value: Any) -> None:
+    conn.execute(
+        "INSERT INTO meta (key, value) VALUES (?, ?) "
+        "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        (key, _dumps(value)),
+    )
+
+
+class SqliteCatalogStore:
+    """Catalog kept in SQLite (WAL) with one row per item, category and set.
+
+    Writers serialize on ``BEGIN IMMEDIATE`` and touch only the rows they
+    change; readers are never blocked. manifest.json is exported from here
+    by ``manifest_service`` after every commit.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Autocommit mode: transactions are opened explicitly below.
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def is_initialized(self) -> bool:
+        return _read_meta(self._connect(), "version") is not None
+
+    def import_manifest(self, manifest: Dict[str, Any]) -> bool:
+        """Seed an empty database from a manifest dict; no-op once it has data."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if _read_meta(conn, "version") is not None:
+                conn.execute("ROLLBACK")
+                return False
+            categories = manifest.get("categories")
+            if isinstance(categories, dict):
+                conn.executemany(
+                    "INSERT INTO categories (slug, position, data) VALUES (?, ?, ?)",
+                    [(slug, index, _dumps(meta or {})) for index, (slug, meta) in enumerate(categories.items())],
+                )
+            conn.executemany(
+                "INSERT OR REPLACE INTO items (id, position, article, category, data) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (item["id"], index, item.get("article"), item.get("category"), _dumps(item))
+                    for index, item in enumerate(manifest.get("items") or [])
+                    if isinstance(item, dict) and isinstance(item.get("id"), str)
+                ],
+            )
+            sets = manifest.get("sets")
+            if isinstance(sets, list):
+                conn.executemany(
+                    "INSERT INTO sets (position, data) VALUES (?, ?)",
+                    [(index, _dumps(entry)) for index, entry in enumerate(sets)],
+                )
+            _write_meta(conn, "extra", {k: v for k, v in manifest.items() if k not in _TABLE_KEYS})
+            _write_meta(conn, "version", manifest.get("version", 1))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return True
+
+    def begin(self) -> SqliteCatalogTransaction:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        return SqliteCatalogTransaction(conn)
+
+    def commit(self, transaction: SqliteCatalogTransaction) -> None:
+        if transaction.changed:
+            transaction.version += 1
+            _write_meta(transaction.conn, "version", transaction.version)
+        transaction.conn.execute("COMMIT")
+
+    def rollback(self, transaction: SqliteCatalogTransaction) -> None:
+        transaction.conn.execute("ROLLBACK")
+
+    def version(self) -> int:
+        return int(_read_meta(self._connect(), "version", 1))
+
+    def export_manifest(self) -> Dict[str, Any]:
+        """Full manifest dict in the layout manifest.json has always had."""
+        conn = self._connect()
+        # One read transaction so the export is a consistent WAL snapshot.
+        conn.execute("BEGIN")
+        try:
+            manifest: Dict[str, Any] = {"version": _read_meta(conn, "version", 1)}
+            manifest.update(_read_meta(conn, "extra", {}))
+            manifest["categories"] = {
+                slug: json.loads(data)
+                for slug, data in conn.execute("SELECT slug, data FROM categories ORDER BY position")
+            }
+            manifest["items"] = [
+                json.loads(data) for (data,) in conn.execute("SELECT data FROM items ORDER BY position")
+            ]
+            manifest["sets"] = [
+                json.loads(data) for (data,) in conn.execute("SELECT data FROM sets ORDER BY position")
+            ]
+        finally:
+            conn.execute("COMMIT")
+        return manifest
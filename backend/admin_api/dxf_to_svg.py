@@ -1,61 +1,134 @@
 # ---------------------------
 # DXF (Fusion 360, ASCII) -> SVG
 # Поддержка:
-# - ENTITIES / LWPOLYLINE
-# - один замкнутый контур
+# - ENTITIES / LWPOLYLINE, CIRCLE
+# - LINE / ARC / открытые LWPOLYLINE, склеенные в замкнутый контур
+# - внешний контур с отверстиями (дерево вложенности outer/hole, один уровень отверстий)
 # - LINE + ARC через bulge
 # - 1 unit = 1 mm
+# - файл читается одним потоковым проходом (group code / value)
 # ---------------------------
 
+import logging
 import math
 import os
 import sys
+from dataclasses import dataclass, field
 from pathlib import Path
 
 EPS = 1e-9
+CHAIN_TOLERANCE_MM = 0.01
+
+logger = logging.getLogger(__name__)
 
 
 # ---------------------------
-# DXF PARSER (LWPOLYLINE)
+# DXF TOKENIZER
 # ---------------------------
 
-def read_lwpolyline(path: Path):
-    lines = path.read_text(encoding="utf-8", errors="ignore").splitlines()
-
-    verts = []
-    closed = False
-    in_poly = False
-    i = 0
+SUPPORTED_ENTITY_TYPES = frozenset({"LWPOLYLINE", "CIRCLE", "LINE", "ARC"})
+
+
+@dataclass
+class DxfEntity:
+    type: str
+    groups: list = field(default_factory=list)  # [(code: int, value: str)]
+
+    def first(self, code, default=None):
+        for group_code, value in self.groups:
+            if group_code == code:
+                return value
+        return default
+
+
+def iter_group_codes(path: Path):
+    # Построчное чтение буферизованным файлом: память O(1) относительно размера DXF.
+    with path.open("r", encoding="utf-8", errors="ignore") as source:
+        while True:
+            code_line = source.readline()
+            value_line = source.readline()
+            if not code_line or not value_line:
+                return
+            code = code_line.strip()
+            try:
+                code_value = int(code)
+            except ValueError as exc:
+                raise ValueError(f"Invalid DXF group code: {code!r}") from exc
+            yield code_value, value_line.strip()
+
+
+def read_entities(path: Path, types=SUPPORTED_ENTITY_TYPES):
+    # Один линейный проход: собираем только нужные сущности из ENTITIES
+    # (или из файла без секций), BLOCKS/TABLES/OBJECTS пропускаем.
+    entities = []
+    section = None
+    expect_section_name = False
+    current = None
+
+    for code, value in iter_group_codes(path):
+        if code == 0:
+            if current is not None:
+                entities.append(current)
+                current = None
+            if value == "SECTION":
+                expect_section_name = True
+            elif value == "ENDSEC":
+                section = None
+            elif value == "EOF":
+                break
+            elif section in (None, "ENTITIES") and value in types:
+                current = DxfEntity(type=value)
+            continue
 
-    while i < len(lines) - 1:
-        if lines[i] == "0" and lines[i + 1] == "LWPOLYLINE":
-            in_poly = True
-            i += 2
+        if expect_section_name:
+            expect_section_name = False
+            if code == 2:
+                section = value
             continue
 
-        if in_poly:
-            code = lines[i]
-            val = lines[i + 1]
+        if current is not None:
+            current.groups.append((code, value))
 
-            if code == "70":  # flags
-                closed = (int(val) & 1) == 1
+    if current is not None:
+        entities.append(current)
 
-            elif code == "10":  # X
-                x = float(val)
-                y = float(lines[i + 3])
-                verts.append({"x": x, "y": y, "bulge": 0.0})
-                i += 4
-                continue
+    return entities
 
-            elif code == "42":  # bulge
-                if not verts:
-                    raise ValueError("bulge without vertex")
-                verts[-1]["bulge"] = float(val)
 
-            elif code == "0":  # end of entity
-                break
+def _entities_of(source, types=SUPPORTED_ENTITY_TYPES):
+    if isinstance(source, (str, Path)):
+        return read_entities(Path(source), types)
+    return list(source)
+
+
+# ---------------------------
+# DXF ENTITIES (LWPOLYLINE / CIRCLE)
+# ---------------------------
+
+def lwpolyline_vertices(entity: DxfEntity):
+    verts = []
+    closed = False
+    pending_x = None
 
-        i += 2
+    for code, val in entity.groups:
+        if code == 70:  # flags
+            closed = (int(val) & 1) == 1
+        elif code == 10:  # X
+            pending_x = float(val)
+        elif code == 20 and pending_x is not None:  # Y
+            verts.append({"x": pending_x, "y": float(val), "bulge": 0.0})
+            pending_x = None
+        elif code == 42:  # bulge
+            if not verts:
+                raise ValueError("bulge without vertex")
+            verts[-1]["bulge"] = float(val)
+
+    return verts, closed
+
+
+def read_lwpolyline(source):
+    polyline = next((e for e in _entities_of(source) if e.type == "LWPOLYLINE"), None)
+    verts, closed = lwpolyline_vertices(polyline) if polyline else ([], False)
 
     if not verts:
         raise ValueError("No LWPOLYLINE found in DXF")
@@ -66,42 +139,25 @@ def read_lwpolyline(path: Path):
     return verts
 
 
-def read_circle(path: Path):
-    lines = path.read_text(encoding="utf-8", errors="ignore").splitlines()
-
-    i = 0
-    while i < len(lines) - 1:
-        if lines[i] == "0" and lines[i + 1] == "CIRCLE":
-            i += 2
-            cx = None
-            cy = None
-            r = None
+def circle_params(entity: DxfEntity):
+    cx = entity.first(10)
+    cy = entity.first(20)
+    r = entity.first(40)
 
-            while i < len(lines) - 1:
-                code = lines[i]
-                val = lines[i + 1]
+    if cx is None or cy is None or r is None:
+        raise ValueError("Invalid CIRCLE entity")
 
-                if code == "0":
-                    break
-                if code == "10":
-                    cx = float(val)
-                elif code == "20":
-                    cy = float(val)
-                elif code == "40":
-                    r = float(val)
+    circle = {"cx": float(cx), "cy": float(cy), "r": float(r)}
+    if circle["r"] <= 0:
+        raise ValueError("CIRCLE radius must be > 0")
+    return circle
 
-                i += 2
 
-            if cx is None or cy is None or r is None:
-                raise ValueError("Invalid CIRCLE entity")
-            if r <= 0:
-                raise ValueError("CIRCLE radius must be > 0")
-
-            return {"cx": cx, "cy": cy, "r": r}
-
-        i += 2
-
-    raise ValueError("No CIRCLE found in DXF")
+def read_circle(source):
+    circle = next((e for e in _entities_of(source) if e.type == "CIRCLE"), None)
+    if circle is None:
+        raise ValueError("No CIRCLE found in DXF")
+    return circle_params(circle)
 
 
 def circle_to_lwpolyline_vertices(cx, cy, r):
@@ -114,17 +170,284 @@ def circle_to_lwpolyline_vertices(cx, cy, r):
     ]
 
 
+# ---------------------------
+# LINE / ARC CHAINING
+# ---------------------------
+
+def _segment(start, end, bulge=0.0):
+    return {"start": start, "end": end, "bulge": bulge}
+
+
+def _reverse_segment(seg):
+    return _segment(seg["end"], seg["start"], -seg["bulge"])
+
+
+def line_segment(entity: DxfEntity):
+    values = {code: entity.first(code) for code in (10, 20, 11, 21)}
+    if any(v is None for v in values.values()):
+        raise ValueError("Invalid LINE entity")
+    return _segment((float(values[10]), float(values[20])), (float(values[11]), float(values[21])))
+
+
+def arc_segments(entity: DxfEntity):
+    values = {code: entity.first(code) for code in (10, 20, 40, 50, 51)}
+    if any(v is None for v in values.values()):
+        raise ValueError("Invalid ARC entity")
+
+    cx, cy, r = float(values[10]), float(values[20]), float(values[40])
+    if r <= 0:
+        raise ValueError("ARC radius must be > 0")
+
+    def point(angle):
+        return (cx + r * math.cos(angle), cy + r * math.sin(angle))
+
+    # DXF ARC идёт CCW от 50 к 51 (градусы); bulge = tan(sweep / 4).
+    start_angle = math.radians(float(values[50]))
+    sweep = math.radians((float(values[51]) - float(values[50])) % 360.0)
+    if sweep < EPS:
+        sweep = 2.0 * math.pi  # полная окружность
+
+    # Режем дугу на квадрантах, чтобы bbox по вершинам совпадал с реальным.
+    cuts = [start_angle]
+    quadrant = math.floor(start_angle / (math.pi / 2)) + 1
+    while quadrant * (math.pi / 2) < start_angle + sweep - 1e-6:
+        if quadrant * (math.pi / 2) > start_angle + 1e-6:
+            cuts.append(quadrant * (math.pi / 2))
+        quadrant += 1
+    cuts.append(start_angle + sweep)
+
+    return [
+        _segment(point(a0), point(a1), math.tan((a1 - a0) / 4.0))
+        for a0, a1 in zip(cuts, cuts[1:])
+    ]
+
+
+def lwpolyline_segments(verts, closed):
+    count = len(verts) if closed else len(verts) - 1
+    return [
+        _segment(
+            (verts[i]["x"], verts[i]["y"]),
+            (verts[(i + 1) % len(verts)]["x"], verts[(i + 1) % len(verts)]["y"]),
+            verts[i]["bulge"],
+        )
+        for i in range(max(count, 0))
+    ]
+
+
+class EndpointGrid:
+    # Хэш-сетка по квантованным концам сегментов: поиск соседа O(1) вместо попарного перебора.
+
+    def __init__(self, tol):
+        self.tol = tol
+        self.cells = {}
+
+    def _cell(self, point):
+        return (math.floor(point[0] / self.tol), math.floor(point[1] / self.tol))
+
+    def add(self, point, ref):
+        self.cells.setdefault(self._cell(point), []).append((point, ref))
+
+    def find(self, point, used):
+        cx, cy = self._cell(point)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for candidate, ref in self.cells.get((cx + dx, cy + dy), ()):
+                    if ref[0] in used:
+                        continue
+                    if math.hypot(candidate[0] - point[0], candidate[1] - point[1]) <= self.tol:
+                        return ref
+        return None
+
+
+def _segment_length(seg):
+    return math.hypot(seg["end"][0] - seg["start"][0], seg["end"][1] - seg["start"][1])
+
+
+def chain_segments(segments, tol=CHAIN_TOLERANCE_MM, strict=True):
+    # Склеивает сегменты в замкнутые контуры; возвращает список списков вершин с bulge.
+    # strict=False: незамыкающиеся цепочки (вспомогательные линии) пропускаются с предупреждением.
+    segments = [seg for seg in segments if _segment_length(seg) > tol]
+
+    grid = EndpointGrid(tol)
+    for index, seg in enumerate(segments):
+        grid.add(seg["start"], (index, "start"))
+        grid.add(seg["end"], (index, "end"))
+
+    used = set()
+    loops = []
+    for index, seg in enumerate(segments):
+        if index in used:
+            continue
+        used.add(index)
+        chain = [seg]
+        origin = seg["start"]
+        cursor = seg["end"]
+
+        while math.hypot(cursor[0] - origin[0], cursor[1] - origin[1]) > tol:
+            ref = grid.find(cursor, used)
+            if ref is None:
+                break
+            next_index, side = ref
+            used.add(next_index)
+            next_seg = segments[next_index] if side == "start" else _reverse_segment(segments[next_index])
+            chain.append(next_seg)
+            cursor = next_seg["end"]
+
+        if math.hypot(cursor[0] - origin[0], cursor[1] - origin[1]) > tol:
+            message = f"Open contour: no segment continues from ({cursor[0]:.4f}, {cursor[1]:.4f})"
+            if strict:
+                raise ValueError(message)
+            logger.warning("%s; skipping %d open segment(s)", message, len(chain))
+            continue
+
+        if len(chain) < 2:
+            raise ValueError("Degenerate closed contour")
+
+        loops.append([
+            {"x": item["start"][0], "y": item["start"][1], "bulge": item["bulge"]}
+            for item in chain
+        ])
+
+    return loops
+
+
+def entities_to_segments(entities):
+    segments = []
+    for entity in entities:
+        if entity.type == "LINE":
+            segments.append(line_segment(entity))
+        elif entity.type == "ARC":
+            segments.extend(arc_segments(entity))
+        elif entity.type == "LWPOLYLINE":
+            verts, closed = lwpolyline_vertices(entity)
+            if not closed:
+                segments.extend(lwpolyline_segments(verts, closed))
+    return segments
+
+
+def read_supported_loops(path: Path):
+    # Все замкнутые контуры файла: закрытые LWPOLYLINE, CIRCLE и склейка LINE/ARC.
+    entities = read_entities(path)
+    loops = []
+
+    for entity in entities:
+        if entity.type == "LWPOLYLINE":
+            verts, closed = lwpolyline_vertices(entity)
+            if verts and closed:
+                loops.append(verts)
+        elif entity.type == "CIRCLE":
+            params = circle_params(entity)
+            loops.append(circle_to_lwpolyline_vertices(params["cx"], params["cy"], params["r"]))
+
+    # Рядом с готовыми замкнутыми контурами LINE/ARC могут быть вспомогательными — их не замыкаем насильно.
+    segments = entities_to_segments(entities)
+    if segments:
+        loops.extend(chain_segments(segments, strict=not loops))
+
+    if not loops:
+        raise ValueError("No supported geometry found (LWPOLYLINE, CIRCLE, LINE or ARC)")
+    return loops
+
+
 def read_supported_geometry(path: Path):
-    try:
-        return read_lwpolyline(path)
-    except ValueError:
-        pass
+    # Внешний контур (для потребителей с одним контуром).
+    return build_loop_hierarchy(read_supported_loops(path))[0]["vertices"]
+
+
+# ---------------------------
+# CONTAINMENT
+# ---------------------------
+
+def loop_polygon(verts):
+    points = []
+    n = len(verts)
+    for i in range(n):
+        p1 = (verts[i]["x"], verts[i]["y"])
+        p2 = (verts[(i + 1) % n]["x"], verts[(i + 1) % n]["y"])
+        points.extend(flatten_bulge(p1, p2, verts[i]["bulge"]))
+    return points
+
+
+def polygon_area(points):
+    area = 0.0
+    for i, (x1, y1) in enumerate(points):
+        x2, y2 = points[(i + 1) % len(points)]
+        area += x1 * y2 - x2 * y1
+    return area * 0.5
+
 
-    try:
-        circle = read_circle(path)
-        return circle_to_lwpolyline_vertices(circle["cx"], circle["cy"], circle["r"])
-    except ValueError as exc:
-        raise ValueError("No supported geometry found (LWPOLYLINE or CIRCLE)") from exc
+def point_in_polygon(point, polygon):
+    x, y = point
+    inside = False
+    n = len(polygon)
+    for i in range(n):
+        x1, y1 = polygon[i]
+        x2, y2 = polygon[(i + 1) % n]
+        if (y1 > y) != (y2 > y) and x < (x2 - x1) * (y - y1) / (y2 - y1) + x1:
+            inside = not inside
+    return inside
+
+
+def _polygon_bbox(points):
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _bbox_contains(outer, inner):
+    return outer[0] <= inner[0] and outer[1] <= inner[1] and outer[2] >= inner[2] and outer[3] >= inner[3]
+
+
+def build_loop_hierarchy(loops):
+    # Дерево вложенности: сортировка по площади, отсечение по bbox, затем point-in-polygon.
+    # Возвращает контуры по убыванию площади: {"vertices", "parent", "depth"}.
+    prepared = []
+    for verts in loops:
+        polygon = loop_polygon(verts)
+        prepared.append({
+            "vertices": verts,
+            "polygon": polygon,
+            "bbox": _polygon_bbox(polygon),
+            "area": abs(polygon_area(polygon)),
+        })
+    prepared.sort(key=lambda item: item["area"], reverse=True)
+
+    result = []
+    for index, loop in enumerate(prepared):
+        probe = loop["polygon"][0]
+        parent = None
+        # Ближайший (наименьший по площади) содержащий контур среди более крупных.
+        for candidate_index in range(index - 1, -1, -1):
+            candidate = prepared[candidate_index]
+            if not _bbox_contains(candidate["bbox"], loop["bbox"]):
+                continue
+            if point_in_polygon(probe, candidate["polygon"]):
+                parent = candidate_index
+                break
+        depth = 0 if parent is None else result[parent]["depth"] + 1
+        result.append({"vertices": loop["vertices"], "parent": parent, "depth": depth})
+
+    return result
+
+
+def select_outer_tree(hierarchy):
+    # Контур инструмента — наибольший внешний контур со всем, что в него вложено
+    # (отверстия, острова в них и т.д.). Отдельно лежащие контуры отбрасываются
+    # с предупреждением, как раньше импорт брал только первый контур файла.
+    kept = {0}
+    for index, loop in enumerate(hierarchy[1:], start=1):
+        if loop["parent"] in kept:
+            kept.add(index)
+    dropped = sum(1 for loop in hierarchy if loop["depth"] == 0) - 1
+    if dropped:
+        logger.warning("Ignoring %d separate outline(s) outside the largest contour", dropped)
+
+    positions = {old: new for new, old in enumerate(sorted(kept))}
+    return [
+        {**loop, "parent": None if loop["parent"] is None else positions[loop["parent"]]}
+        for index, loop in enumerate(hierarchy)
+        if index in kept
+    ]
 
 
 # ---------------------------
@@ -188,6 +511,56 @@ def bulge_to_arc(p1, p2, bulge):
     }
 
 
+# ---------------------------
+# ARC FLATTENING
+# ---------------------------
+
+ARC_CHORD_TOLERANCE_MM = 0.05  # допуск по стрелке прогиба для проверок вложенности
+MAX_ARC_SEGMENT_ANGLE_DEG = 45.0
+
+
+def arc_segment_count(radius, sweep, tolerance):
+    # Минимальное число хорд, при котором стрелка прогиба каждой хорды
+    # r * (1 - cos(step / 2)) не превышает tolerance (угол хорды не больше 45°).
+    sweep = abs(sweep)
+    if sweep < EPS or radius < EPS:
+        return 1
+    max_step = math.radians(MAX_ARC_SEGMENT_ANGLE_DEG)
+    if tolerance < radius:
+        max_step = min(max_step, 2.0 * math.acos(1.0 - tolerance / radius))
+    return max(1, math.ceil(sweep / max_step - EPS))
+
+
+def bulge_arc_center(p1, p2, bulge):
+    # Центр дуги (x, y), радиус и угол theta = 4 * atan(bulge).
+    # Смещение центра от середины хорды (c / 2) / tan(theta / 2) верно и для дуг > 180°.
+    x1, y1 = p1
+    x2, y2 = p2
+    theta = 4.0 * math.atan(bulge)
+    chord = math.hypot(x2 - x1, y2 - y1)
+    if chord < EPS:
+        raise ValueError("Zero-length arc")
+    offset = (chord * 0.5) / math.tan(theta * 0.5)
+    cx = (x1 + x2) * 0.5 - (y2 - y1) / chord * offset
+    cy = (y1 + y2) * 0.5 + (x2 - x1) / chord * offset
+    return (cx, cy), chord / (2.0 * math.sin(abs(theta) * 0.5)), theta
+
+
+def flatten_bulge(p1, p2, bulge, tolerance=ARC_CHORD_TOLERANCE_MM):
+    # Точки дуги p1 -> p2 (без p1, с p2), хордовая погрешность не больше tolerance.
+    if abs(bulge) < EPS or math.hypot(p2[0] - p1[0], p2[1] - p1[1]) < EPS:
+        return [p2]
+    (cx, cy), r, theta = bulge_arc_center(p1, p2, bulge)
+    start_angle = math.atan2(p1[1] - cy, p1[0] - cx)
+    steps = arc_segment_count(r, theta, tolerance)
+    points = [
+        (cx + r * math.cos(start_angle + theta * i / steps), cy + r * math.sin(start_angle + theta * i / steps))
+        for i in range(1, steps)
+    ]
+    points.append(p2)
+    return points
+
+
 # ---------------------------
 # SVG
 # ---------------------------
@@ -240,10 +613,12 @@ def normalize_vertices_to_bbox(verts, bbox):
     return normalized
 
 
-def build_geometry_payload(verts, bbox):
+def build_geometry_payload(verts, bbox, hierarchy=None):
+    # version 1: один контур; version 2: + "loops" с деревом вложенности
+    # ("vertices" остаётся внешним контуром для одноконтурных потребителей).
     min_x, min_y, max_x, max_y = bbox
     normalized_vertices = normalize_vertices_to_bbox(verts, bbox)
-    return {
+    payload = {
         "version": 1,
         "units": "mm",
         "coordinateSystem": "origin-top-left",
@@ -254,6 +629,20 @@ def build_geometry_payload(verts, bbox):
         "vertices": normalized_vertices,
     }
 
+    if hierarchy and len(hierarchy) > 1:
+        payload["version"] = 2
+        payload["loops"] = [
+            {
+                "vertices": normalize_vertices_to_bbox(loop["vertices"], bbox),
+                "parent": loop["parent"],
+                "depth": loop["depth"],
+                "role": "outer" if loop["depth"] % 2 == 0 else "hole",
+            }
+            for loop in hierarchy
+        ]
+
+    return payload
+
 
 def write_svg(path_d, bbox, out_path: Path):
     min_x, min_y, max_x, max_y = bbox
@@ -262,7 +651,7 @@ def write_svg(path_d, bbox, out_path: Path):
 
     svg = f"""<svg xmlns="http://www.w3.org/2000/svg"
   viewBox="{min_x:.6f} {min_y:.6f} {w:.6f} {h:.6f}">
-  <path d="{path_d}" fill="none" stroke="black"/>
+  <path d="{path_d}" fill="none" fill-rule="evenodd" stroke="black"/>
 </svg>
 """
 
@@ -274,12 +663,12 @@ def write_svg(path_d, bbox, out_path: Path):
 # ---------------------------
 
 def convert(dxf_path: Path, svg_path: Path):
-    verts = read_supported_geometry(dxf_path)
-    verts = invert_y(verts)
-    path_d = polyline_to_svg_path(verts)
-    bbox = compute_bbox(verts)
+    loops = [invert_y(verts) for verts in read_supported_loops(dxf_path)]
+    hierarchy = select_outer_tree(build_loop_hierarchy(loops))
+    path_d = " ".join(polyline_to_svg_path(loop["vertices"]) for loop in hierarchy)
+    bbox = compute_bbox(hierarchy[0]["vertices"])
     write_svg(path_d, bbox, svg_path)
-    return build_geometry_payload(verts, bbox)
+    return build_geometry_payload(hierarchy[0]["vertices"], bbox, hierarchy)
 
 
 def _selftest_arc_direction():
@@ -307,6 +696,49 @@ def _selftest_circle_as_arcs():
     assert path_d.count("A ") == 4, f"Expected 4 arc commands, got: {path_d}"
 
 
+def _selftest_line_arc_chain():
+    # Перемешанные и развёрнутые сегменты должны склеиться в один контур.
+    segments = [
+        _segment((0.0, 20.0), (0.0, 0.0)),
+        _segment((30.0, 20.0), (0.0, 20.0)),
+        _reverse_segment(_segment((30.0, 0.0), (30.0, 20.0), 1.0)),
+        _segment((30.0, 0.0), (0.0, 0.0)),
+    ]
+    loops = chain_segments(segments)
+    assert len(loops) == 1, f"Expected one loop, got {len(loops)}"
+    assert len(loops[0]) == 4, f"Expected 4 vertices, got {loops[0]}"
+    assert sum(1 for v in loops[0] if abs(v["bulge"]) > EPS) == 1, f"Expected one arc: {loops[0]}"
+
+
+def _selftest_arc_flattening():
+    # Дуга 270° (bulge > 1): все точки на окружности, погрешность хорд в пределах допуска.
+    p1, p2 = (10.0, 0.0), (0.0, -10.0)
+    bulge = math.tan(math.radians(270.0) / 4.0)
+    points = flatten_bulge(p1, p2, bulge, tolerance=0.01)
+    for x, y in points:
+        assert abs(math.hypot(x, y) - 10.0) < 1e-6, f"Point off the arc: {(x, y)}"
+    step = math.radians(270.0) / len(points)
+    assert 10.0 * (1.0 - math.cos(step / 2.0)) <= 0.01 + 1e-12, f"Chord error too large: {len(points)} chords"
+    assert arc_segment_count(1000.0, math.pi / 2.0, 0.01) < arc_segment_count(1000.0, math.pi / 2.0, 0.001)
+
+
+def _selftest_hole_hierarchy():
+    outer = [
+        {"x": 0.0, "y": 0.0, "bulge": 0.0},
+        {"x": 100.0, "y": 0.0, "bulge": 0.0},
+        {"x": 100.0, "y": 50.0, "bulge": 0.0},
+        {"x": 0.0, "y": 50.0, "bulge": 0.0},
+    ]
+    hole = circle_to_lwpolyline_vertices(cx=20.0, cy=25.0, r=5.0)
+    island = circle_to_lwpolyline_vertices(cx=20.0, cy=25.0, r=2.0)
+    separate = circle_to_lwpolyline_vertices(cx=200.0, cy=25.0, r=5.0)
+    hierarchy = build_loop_hierarchy([island, separate, hole, outer])
+    depths = sorted((loop["depth"], loop["parent"]) for loop in hierarchy)
+    assert depths == [(0, None), (0, None), (1, 0), (2, 2)], f"Unexpected hierarchy: {depths}"
+    tree = select_outer_tree(hierarchy)
+    assert [(loop["depth"], loop["parent"]) for loop in tree] == [(0, None), (1, 0), (2, 1)], f"Unexpected tree: {tree}"
+
+
 # ---------------------------
 # CLI
 # ---------------------------
@@ -315,6 +747,9 @@ def main():
     if os.getenv("DXF_TO_SVG_SELFTEST") == "1":
         _selftest_arc_direction()
         _selftest_circle_as_arcs()
+        _selftest_line_arc_chain()
+        _selftest_arc_flattening()
+        _selftest_hole_hierarchy()
 
     if len(sys.argv) != 3:
         print("Usage: dxf_to_svg.py input.dxf output.svg")
@@ -1,35 +1,69 @@
 from __future__ import annotations
 
 import argparse
+import heapq
 import json
 import math
 import sys
+from array import array
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Iterable, Sequence
+from typing import Any, Iterable, Iterator, Sequence
+
+try:
+    from admin_api.dxf_to_svg import arc_segment_count
+except ImportError:  # run as a script: python admin_api/geometry_inner_contour_cli.py
+    from dxf_to_svg import arc_segment_count
 
 EPS = 1e-9
 COORD_EPS = 1e-6
-MAX_ARC_SEGMENT_LENGTH_MM = 1.0
-MAX_ARC_SEGMENT_ANGLE_DEG = 10.0
+# Max chord error (sagitta) of flattened arcs: the emitted toolpath vs. inner-loop validation.
+TOOLPATH_CHORD_TOLERANCE_MM = 0.01
+VALIDATION_CHORD_TOLERANCE_MM = 0.05
 SAFE_Z_MM = 5.0
 MIN_EDGE_LENGTH_MM = 1e-4
+EDGE_INDEX_LEAF_SIZE = 8
+# Edges spanning more grid cells than this skip the grid and are checked against every edge.
+GRID_MAX_CELLS_PER_EDGE = 64
+# Offsets run this much deeper than requested, so walls exactly 2 x offset apart (common
+# with round dimensions) collapse cleanly instead of leaving zero-width slivers.
+POCKET_OFFSET_MARGIN_MM = 1e-5
+RAW_SEGMENT_EDGE = 0
+RAW_SEGMENT_SUSPECT = 1
+RAW_SEGMENT_CONNECTOR = 2
+# Source edges on either side of a raw segment's origin vertex that are checked before
+# falling back to a global clearance query; swallowtails at tight curves fail locally.
+RAW_LOCAL_CHECK_EDGES = 8
+SUPPORTED_GEOMETRY_VERSIONS = (1, 2)
 COMMENT_PREFIX = ";"
 
 
-@dataclass(frozen=True)
-class Point:
-    x: float
-    y: float
+class PointArray:
+    """Contour vertices packed into two ``array('d')`` coordinate columns.
+
+    Flattening, offsetting, validation and NC output all loop over ``xs``/``ys``
+    directly; no per-vertex objects are created.
+    """
+
+    __slots__ = ("xs", "ys")
+
+    def __init__(self, xs: Iterable[float] = (), ys: Iterable[float] = ()) -> None:
+        self.xs = array("d", xs)
+        self.ys = array("d", ys)
 
-    def __add__(self, other: "Point") -> "Point":
-        return Point(self.x + other.x, self.y + other.y)
+    def __len__(self) -> int:
+        return len(self.xs)
 
-    def __sub__(self, other: "Point") -> "Point":
-        return Point(self.x - other.x, self.y - other.y)
+    def append(self, x: float, y: float) -> None:
+        self.xs.append(x)
+        self.ys.append(y)
 
-    def scale(self, value: float) -> "Point":
-        return Point(self.x * value, self.y * value)
+    def reversed(self) -> "PointArray":
+        return PointArray(reversed(self.xs), reversed(self.ys))
+
+    def flipped_y(self) -> "PointArray":
+        """Mirror between math (y up) and top-left (y down) coordinates."""
+        return PointArray(self.xs, (-y for y in self.ys))
 
 
 @dataclass
@@ -48,23 +82,45 @@ class CliConfig:
     z_depth: float
     feed: float
     tool_diameter: float
+    chord_tolerance: float = TOOLPATH_CHORD_TOLERANCE_MM
+    validation_tolerance: float = VALIDATION_CHORD_TOLERANCE_MM
+    # Fraction of the tool diameter between pocket offsets; None = single contour pass.
+    stepover: float | None = None
 
     @property
     def tool_radius(self) -> float:
         return self.tool_diameter / 2.0
 
+    @property
+    def hole_tolerance(self) -> float:
+        # Pocket passes run around inner loops, so those are flattened like the toolpath.
+        return self.validation_tolerance if self.stepover is None else self.chord_tolerance
+
 
 @dataclass(frozen=True)
 class PreparedGeometry:
     source_vertices_count: int
-    flattened_points_top_left: list[Point]
-    flattened_points_math: list[Point]
+    flattened_points_top_left: PointArray
+    flattened_points_math: PointArray
+    # Loops nested directly inside the outer contour (geometry version 2), in math coordinates.
+    hole_points_math: tuple[PointArray, ...] = ()
 
 
 @dataclass(frozen=True)
 class ToolpathResult:
-    offset_points_top_left: list[Point]
-    offset_points_math: list[Point]
+    offset_points_top_left: PointArray
+    offset_points_math: PointArray
+
+
+@dataclass(frozen=True)
+class PocketResult:
+    levels: int
+    # Loops in cutting order (innermost level first, wall pass last), top-left coordinates.
+    loops_top_left: tuple[PointArray, ...]
+
+    @property
+    def offset_vertices(self) -> int:
+        return sum(len(loop) for loop in self.loops_top_left)
 
 
 def _format_number(value: float) -> str:
@@ -76,93 +132,78 @@ def _comment(text: str) -> str:
     return f"{COMMENT_PREFIX} {text}"
 
 
-def _distance(a: Point, b: Point) -> float:
-    return math.hypot(b.x - a.x, b.y - a.y)
-
-
-def _cross(a: Point, b: Point) -> float:
-    return a.x * b.y - a.y * b.x
-
-
-def _dot(a: Point, b: Point) -> float:
-    return a.x * b.x + a.y * b.y
-
-
-def _normalize(vector: Point) -> Point:
-    length = math.hypot(vector.x, vector.y)
-    if length <= EPS:
-        raise GeometryInnerContourError("Degenerate segment detected", f"zero-length vector {vector}")
-    return Point(vector.x / length, vector.y / length)
-
-
-def _left_normal(unit_direction: Point) -> Point:
-    return Point(-unit_direction.y, unit_direction.x)
-
-
-def _signed_area(points: Sequence[Point]) -> float:
+def _signed_area(points: PointArray) -> float:
+    xs, ys = points.xs, points.ys
     area = 0.0
-    for index, current in enumerate(points):
-        nxt = points[(index + 1) % len(points)]
-        area += current.x * nxt.y - nxt.x * current.y
+    for x, y, next_x, next_y in zip(xs, ys, xs[1:] + xs[:1], ys[1:] + ys[:1]):
+        area += x * next_y - next_x * y
     return area * 0.5
 
 
-def _is_close_point(a: Point, b: Point, tol: float = COORD_EPS) -> bool:
-    return abs(a.x - b.x) <= tol and abs(a.y - b.y) <= tol
+def _is_close_xy(ax: float, ay: float, bx: float, by: float, tol: float = COORD_EPS) -> bool:
+    return abs(ax - bx) <= tol and abs(ay - by) <= tol
 
 
-def _remove_consecutive_duplicates(points: Iterable[Point], tol: float = COORD_EPS) -> list[Point]:
-    cleaned: list[Point] = []
-    for point in points:
-        if not cleaned or not _is_close_point(cleaned[-1], point, tol):
-            cleaned.append(point)
+def _remove_consecutive_duplicates(points: PointArray, tol: float = COORD_EPS) -> PointArray:
+    cleaned = PointArray()
+    xs, ys = cleaned.xs, cleaned.ys
+    for x, y in zip(points.xs, points.ys):
+        if not xs or not _is_close_xy(xs[-1], ys[-1], x, y, tol):
+            xs.append(x)
+            ys.append(y)
 
-    if len(cleaned) > 1 and _is_close_point(cleaned[0], cleaned[-1], tol):
-        cleaned.pop()
+    if len(xs) > 1 and _is_close_xy(xs[0], ys[0], xs[-1], ys[-1], tol):
+        xs.pop()
+        ys.pop()
 
     return cleaned
 
 
-def _point_to_math(vertex: dict[str, float]) -> tuple[Point, float]:
-    return Point(float(vertex["x"]), -float(vertex["y"])), -float(vertex.get("bulge", 0.0))
+def _vertex_to_math(vertex: dict[str, float]) -> tuple[float, float, float]:
+    return float(vertex["x"]), -float(vertex["y"]), -float(vertex.get("bulge", 0.0))
 
 
-def _bulge_arc_points(start: Point, end: Point, bulge: float) -> list[Point]:
+def _append_bulge_arc(
+    out: PointArray,
+    start_x: float,
+    start_y: float,
+    end_x: float,
+    end_y: float,
+    bulge: float,
+    tolerance: float,
+) -> None:
+    """Append the flattened arc from start to end (start excluded, end included).
+
+    Chords are spaced so that none deviates from the arc by more than ``tolerance`` mm.
+    """
     if abs(bulge) <= EPS:
-        return [end]
+        out.append(end_x, end_y)
+        return
 
-    chord = end - start
-    chord_length = math.hypot(chord.x, chord.y)
+    chord_x = end_x - start_x
+    chord_y = end_y - start_y
+    chord_length = math.hypot(chord_x, chord_y)
     if chord_length <= EPS:
         raise GeometryInnerContourError("Invalid arc segment", "bulge specified for zero-length chord")
 
     theta = 4.0 * math.atan(bulge)
     if abs(theta) <= EPS:
-        return [end]
+        out.append(end_x, end_y)
+        return
 
     radius = chord_length / (2.0 * math.sin(abs(theta) / 2.0))
-    midpoint = Point((start.x + end.x) * 0.5, (start.y + end.y) * 0.5)
-    unit_normal = _left_normal(_normalize(chord))
-    offset_to_center = math.sqrt(max(radius * radius - (chord_length * 0.5) ** 2, 0.0))
-    center = midpoint + unit_normal.scale(math.copysign(offset_to_center, bulge))
-
-    start_angle = math.atan2(start.y - center.y, start.x - center.x)
-    end_angle = start_angle + theta
-    arc_length = abs(theta) * abs(radius)
-    step_count = max(
-        1,
-        math.ceil(abs(math.degrees(theta)) / MAX_ARC_SEGMENT_ANGLE_DEG),
-        math.ceil(arc_length / MAX_ARC_SEGMENT_LENGTH_MM),
-    )
+    # Signed distance from the chord midpoint to the center along the left normal;
+    # negative for arcs over 180 degrees, so the center lands on the correct side.
+    offset_to_center = (chord_length * 0.5) / math.tan(theta * 0.5)
+    center_x = (start_x + end_x) * 0.5 - chord_y / chord_length * offset_to_center
+    center_y = (start_y + end_y) * 0.5 + chord_x / chord_length * offset_to_center
 
-    points: list[Point] = []
-    for step in range(1, step_count + 1):
-        t = step / step_count
-        angle = start_angle + theta * t
-        points.append(Point(center.x + abs(radius) * math.cos(angle), center.y + abs(radius) * math.sin(angle)))
-
-    points[-1] = end
-    return points
+    start_angle = math.atan2(start_y - center_y, start_x - center_x)
+    step_count = arc_segment_count(radius, theta, tolerance)
+    for step in range(1, step_count):
+        angle = start_angle + theta * (step / step_count)
+        out.append(center_x + radius * math.cos(angle), center_y + radius * math.sin(angle))
+    out.append(end_x, end_y)
 
 
 def _parse_geometry_json(path: Path) -> dict[str, Any]:
@@ -174,11 +215,18 @@ def _parse_geometry_json(path: Path) -> dict[str, Any]:
     except json.JSONDecodeError as exc:
         raise GeometryInnerContourError("Input geometry JSON is not valid JSON", str(exc)) from exc
 
+    return _validate_geometry_payload(payload)
+
+
+def _validate_geometry_payload(payload: Any) -> dict[str, Any]:
     if not isinstance(payload, dict):
         raise GeometryInnerContourError("Geometry payload must be a JSON object")
 
-    if payload.get("version") != 1:
-        raise GeometryInnerContourError("Unsupported geometry JSON version", f"expected 1, got {payload.get('version')}")
+    if payload.get("version") not in SUPPORTED_GEOMETRY_VERSIONS:
+        raise GeometryInnerContourError(
+            "Unsupported geometry JSON version",
+            f"expected one of {list(SUPPORTED_GEOMETRY_VERSIONS)}, got {payload.get('version')}",
+        )
 
     if payload.get("units") != "mm":
         raise GeometryInnerContourError("Unsupported geometry units", f"expected 'mm', got {payload.get('units')!r}")
@@ -197,200 +245,544 @@ def _parse_geometry_json(path: Path) -> dict[str, Any]:
     if not isinstance(bbox, dict):
         raise GeometryInnerContourError("Geometry JSON must contain bbox metadata")
 
+    loops = payload.get("loops")
+    if payload.get("version") == 2 and loops is not None:
+        if not isinstance(loops, list) or not loops or not all(isinstance(loop, dict) for loop in loops):
+            raise GeometryInnerContourError("Geometry JSON loops must be a non-empty list of objects")
+        if loops[0].get("parent") is not None:
+            raise GeometryInnerContourError("Geometry JSON loops must start with the outer contour")
+        # Holes of the outer contour are the only inner loops a pocket can be generated for.
+        for index, loop in enumerate(loops[1:], start=2):
+            if loop.get("parent") != 0:
+                raise GeometryInnerContourError(
+                    "Unsupported loop hierarchy",
+                    f"loop #{index} is not a hole of the outer contour (parent={loop.get('parent')!r})",
+                )
+
     return payload
 
 
-def _prepare_geometry(path: Path) -> PreparedGeometry:
-    payload = _parse_geometry_json(path)
-    raw_vertices = payload["vertices"]
+def _flatten_loop(raw_vertices: list[Any], label: str, tolerance: float) -> tuple[int, PointArray]:
+    if not isinstance(raw_vertices, list) or len(raw_vertices) < 3:
+        raise GeometryInnerContourError(f"{label} must contain at least 3 vertices")
 
-    math_points: list[Point] = []
+    vertices_math: list[tuple[float, float, float]] = []
     for index, raw_vertex in enumerate(raw_vertices):
         if not isinstance(raw_vertex, dict):
             raise GeometryInnerContourError("Invalid vertex entry", f"vertex #{index + 1} must be an object")
         if "x" not in raw_vertex or "y" not in raw_vertex:
             raise GeometryInnerContourError("Invalid vertex entry", f"vertex #{index + 1} must contain x and y")
-        point_math, bulge_math = _point_to_math(raw_vertex)
-        if not math.isfinite(point_math.x) or not math.isfinite(point_math.y) or not math.isfinite(bulge_math):
+        vertex_math = _vertex_to_math(raw_vertex)
+        if not all(math.isfinite(value) for value in vertex_math):
             raise GeometryInnerContourError("Invalid numeric value in geometry", f"vertex #{index + 1}")
-        math_points.append(point_math)
+        vertices_math.append(vertex_math)
 
-    if len(math_points) >= 2 and _is_close_point(math_points[0], math_points[-1]):
-        raw_vertices = raw_vertices[:-1]
-        math_points = math_points[:-1]
+    if len(vertices_math) >= 2 and _is_close_xy(*vertices_math[0][:2], *vertices_math[-1][:2]):
+        vertices_math = vertices_math[:-1]
 
-    if len(math_points) < 3:
-        raise GeometryInnerContourError("Closed contour requires at least 3 distinct vertices")
+    if len(vertices_math) < 3:
+        raise GeometryInnerContourError("Closed contour requires at least 3 distinct vertices", label)
 
-    flattened_math: list[Point] = [math_points[0]]
-    for index, raw_vertex in enumerate(raw_vertices):
-        start, bulge_math = _point_to_math(raw_vertex)
-        end = math_points[(index + 1) % len(math_points)]
-        if _distance(start, end) <= EPS:
+    flattened = PointArray((vertices_math[0][0],), (vertices_math[0][1],))
+    for index, (start_x, start_y, bulge_math) in enumerate(vertices_math):
+        end_x, end_y, _ = vertices_math[(index + 1) % len(vertices_math)]
+        if math.hypot(end_x - start_x, end_y - start_y) <= EPS:
             raise GeometryInnerContourError(
                 "Degenerate input contour",
                 f"edge #{index + 1} has zero length before flattening",
             )
-        flattened_math.extend(_bulge_arc_points(start, end, bulge_math))
+        _append_bulge_arc(flattened, start_x, start_y, end_x, end_y, bulge_math, tolerance)
 
-    flattened_math = _remove_consecutive_duplicates(flattened_math)
-    if len(flattened_math) < 3:
+    flattened = _remove_consecutive_duplicates(flattened)
+    if len(flattened) < 3:
         raise GeometryInnerContourError("Flattened contour has fewer than 3 distinct points")
 
-    if abs(_signed_area(flattened_math)) <= EPS:
+    if abs(_signed_area(flattened)) <= EPS:
         raise GeometryInnerContourError("Flattened contour area is zero or numerically unstable")
 
-    for index, point in enumerate(flattened_math):
-        next_point = flattened_math[(index + 1) % len(flattened_math)]
-        if _distance(point, next_point) < MIN_EDGE_LENGTH_MM:
+    _assert_min_edge_length(flattened, "Flattened contour contains too-short segments")
+    _assert_simple_polygon(flattened, f"{label} is self-intersecting after bulge flattening")
+    return len(vertices_math), flattened
+
+
+def _assert_min_edge_length(points: PointArray, message: str) -> None:
+    xs, ys = points.xs, points.ys
+    for index, (x, y, next_x, next_y) in enumerate(zip(xs, ys, xs[1:] + xs[:1], ys[1:] + ys[:1])):
+        if math.hypot(next_x - x, next_y - y) < MIN_EDGE_LENGTH_MM:
             raise GeometryInnerContourError(
-                "Flattened contour contains too-short segments",
+                message,
                 f"segment #{index + 1} is shorter than {MIN_EDGE_LENGTH_MM} mm",
             )
 
-    _assert_simple_polygon(flattened_math, "Input contour is self-intersecting after bulge flattening")
 
-    flattened_top_left = [Point(point.x, -point.y) for point in flattened_math]
-    return PreparedGeometry(
-        source_vertices_count=len(raw_vertices),
-        flattened_points_top_left=flattened_top_left,
-        flattened_points_math=flattened_math,
-    )
+def _prepare_geometry(
+    path: Path,
+    chord_tolerance: float = TOOLPATH_CHORD_TOLERANCE_MM,
+    validation_tolerance: float = VALIDATION_CHORD_TOLERANCE_MM,
+) -> PreparedGeometry:
+    return _prepare_geometry_payload(_parse_geometry_json(path), chord_tolerance, validation_tolerance)
 
 
-def _line_intersection(point_a: Point, direction_a: Point, point_b: Point, direction_b: Point) -> Point | None:
-    denominator = _cross(direction_a, direction_b)
-    if abs(denominator) <= EPS:
-        return None
-    delta = point_b - point_a
-    t = _cross(delta, direction_b) / denominator
-    return point_a + direction_a.scale(t)
+def _prepare_geometry_payload(
+    payload: dict[str, Any],
+    chord_tolerance: float = TOOLPATH_CHORD_TOLERANCE_MM,
+    validation_tolerance: float = VALIDATION_CHORD_TOLERANCE_MM,
+) -> PreparedGeometry:
+    """Flatten the outer contour at toolpath tolerance; inner loops are only
+    validated against, so they use the coarser validation tolerance."""
+    source_vertices_count, flattened_math = _flatten_loop(payload["vertices"], "Input contour", chord_tolerance)
 
+    holes: list[PointArray] = []
+    for index, loop in enumerate(payload.get("loops") or []):
+        if index == 0:
+            continue
+        _, hole_math = _flatten_loop(loop.get("vertices"), f"Inner loop #{index + 1}", validation_tolerance)
+        holes.append(hole_math)
 
-def _segments_intersect(a1: Point, a2: Point, b1: Point, b2: Point) -> bool:
-    def orient(p: Point, q: Point, r: Point) -> float:
-        return _cross(q - p, r - p)
+    return PreparedGeometry(
+        source_vertices_count=source_vertices_count,
+        flattened_points_top_left=flattened_math.flipped_y(),
+        flattened_points_math=flattened_math,
+        hole_points_math=tuple(holes),
+    )
 
-    def on_segment(p: Point, q: Point, r: Point) -> bool:
-        return (
-            min(p.x, r.x) - COORD_EPS <= q.x <= max(p.x, r.x) + COORD_EPS
-            and min(p.y, r.y) - COORD_EPS <= q.y <= max(p.y, r.y) + COORD_EPS
-        )
 
-    o1 = orient(a1, a2, b1)
-    o2 = orient(a1, a2, b2)
-    o3 = orient(b1, b2, a1)
-    o4 = orient(b1, b2, a2)
+def _segments_intersect(
+    a1x: float, a1y: float, a2x: float, a2y: float,
+    b1x: float, b1y: float, b2x: float, b2y: float,
+) -> bool:
+    adx, ady = a2x - a1x, a2y - a1y
+    bdx, bdy = b2x - b1x, b2y - b1y
+    o1 = adx * (b1y - a1y) - ady * (b1x - a1x)
+    o2 = adx * (b2y - a1y) - ady * (b2x - a1x)
+    o3 = bdx * (a1y - b1y) - bdy * (a1x - b1x)
+    o4 = bdx * (a2y - b1y) - bdy * (a2x - b1x)
 
     if (o1 > COORD_EPS and o2 < -COORD_EPS or o1 < -COORD_EPS and o2 > COORD_EPS) and (
         o3 > COORD_EPS and o4 < -COORD_EPS or o3 < -COORD_EPS and o4 > COORD_EPS
     ):
         return True
 
-    if abs(o1) <= COORD_EPS and on_segment(a1, b1, a2):
+    # Collinear touching: the endpoint lies within the other segment's (padded) bbox.
+    if abs(o1) <= COORD_EPS and _within_box(b1x, b1y, a1x, a1y, a2x, a2y):
         return True
-    if abs(o2) <= COORD_EPS and on_segment(a1, b2, a2):
+    if abs(o2) <= COORD_EPS and _within_box(b2x, b2y, a1x, a1y, a2x, a2y):
         return True
-    if abs(o3) <= COORD_EPS and on_segment(b1, a1, b2):
+    if abs(o3) <= COORD_EPS and _within_box(a1x, a1y, b1x, b1y, b2x, b2y):
         return True
-    if abs(o4) <= COORD_EPS and on_segment(b1, a2, b2):
+    if abs(o4) <= COORD_EPS and _within_box(a2x, a2y, b1x, b1y, b2x, b2y):
         return True
 
     return False
 
 
-def _assert_simple_polygon(points: Sequence[Point], message: str) -> None:
-    edge_count = len(points)
-    for index in range(edge_count):
-        a1 = points[index]
-        a2 = points[(index + 1) % edge_count]
-        for other_index in range(index + 1, edge_count):
+def _within_box(x: float, y: float, start_x: float, start_y: float, end_x: float, end_y: float) -> bool:
+    return (
+        min(start_x, end_x) - COORD_EPS <= x <= max(start_x, end_x) + COORD_EPS
+        and min(start_y, end_y) - COORD_EPS <= y <= max(start_y, end_y) + COORD_EPS
+    )
+
+
+def _grid_cell_size(total_length: float, edge_count: int) -> float:
+    return max(total_length / max(edge_count, 1), MIN_EDGE_LENGTH_MM) * 2.0
+
+
+def _segment_cells(
+    segment: tuple[float, float, float, float],
+    origin_x: float,
+    origin_y: float,
+    cell_size: float,
+) -> Iterator[tuple[int, int]]:
+    """Grid cells within COORD_EPS of the segment, walked column by column.
+
+    Only cells the segment actually passes through are yielded (not its whole
+    bbox), so a long diagonal costs O(length / cell) cells instead of O((length / cell)^2).
+    """
+    start_x, start_y, end_x, end_y = segment
+    if start_x > end_x:
+        start_x, start_y, end_x, end_y = end_x, end_y, start_x, start_y
+    dx = end_x - start_x
+    slope = (end_y - start_y) / dx if dx > EPS else None
+    first_column = math.floor((start_x - COORD_EPS - origin_x) / cell_size)
+    last_column = math.floor((end_x + COORD_EPS - origin_x) / cell_size)
+    for column in range(first_column, last_column + 1):
+        if slope is None:
+            low_y, high_y = start_y, end_y
+        else:
+            # Part of the segment inside this (padded) column.
+            left = max(start_x, origin_x + column * cell_size - COORD_EPS)
+            right = min(end_x, origin_x + (column + 1) * cell_size + COORD_EPS)
+            low_y = start_y + (left - start_x) * slope
+            high_y = start_y + (right - start_x) * slope
+        first_row = math.floor((min(low_y, high_y) - COORD_EPS - origin_y) / cell_size)
+        last_row = math.floor((max(low_y, high_y) + COORD_EPS - origin_y) / cell_size)
+        for row in range(first_row, last_row + 1):
+            yield column, row
+
+
+def _segment_grid_candidates(segments: Sequence[tuple[float, float, float, float]]) -> list[tuple[int, int]]:
+    """Broad phase: index pairs (ascending) of segments whose padded bboxes overlap.
+
+    Segments are bucketed on a uniform grid with the cell size following the mean
+    edge length; each one is registered only in the cells it crosses, so the total
+    work is O(n) for flattened arcs with thousands of short edges. Edges longer than
+    GRID_MAX_CELLS_PER_EDGE cells are few by construction and are compared against
+    every box directly instead of being spread over the grid.
+    """
+    boxes: list[tuple[float, float, float, float]] = []
+    total_length = 0.0
+    for start_x, start_y, end_x, end_y in segments:
+        total_length += math.hypot(end_x - start_x, end_y - start_y)
+        boxes.append((
+            min(start_x, end_x) - COORD_EPS,
+            min(start_y, end_y) - COORD_EPS,
+            max(start_x, end_x) + COORD_EPS,
+            max(start_y, end_y) + COORD_EPS,
+        ))
+
+    cell_size = _grid_cell_size(total_length, len(boxes))
+    origin_x = min(box[0] for box in boxes)
+    origin_y = min(box[1] for box in boxes)
+
+    grid: dict[tuple[int, int], list[int]] = {}
+    long_edges: list[int] = []
+    candidates: set[tuple[int, int]] = set()
+    for index, segment in enumerate(segments):
+        min_x, min_y, max_x, max_y = boxes[index]
+        if (max_x - min_x) + (max_y - min_y) > GRID_MAX_CELLS_PER_EDGE * cell_size:
+            long_edges.append(index)
+            continue
+        first_column = int((min_x - origin_x) // cell_size)
+        last_column = int((max_x - origin_x) // cell_size)
+        first_row = int((min_y - origin_y) // cell_size)
+        last_row = int((max_y - origin_y) // cell_size)
+        if last_column - first_column <= 1 and last_row - first_row <= 1:
+            # Short edge (the common case): its few bbox cells are as good as the exact walk.
+            cells = [
+                (column, row)
+                for column in range(first_column, last_column + 1)
+                for row in range(first_row, last_row + 1)
+            ]
+        else:
+            cells = _segment_cells(segment, origin_x, origin_y, cell_size)
+        for cell in cells:
+            bucket = grid.setdefault(cell, [])
+            for other_index in bucket:
+                other = boxes[other_index]
+                if other[0] <= max_x and min_x <= other[2] and other[1] <= max_y and min_y <= other[3]:
+                    candidates.add((other_index, index))
+            bucket.append(index)
+
+    for index in long_edges:
+        min_x, min_y, max_x, max_y = boxes[index]
+        for other_index, other in enumerate(boxes):
             if other_index == index:
                 continue
-            if (other_index + 1) % edge_count == index or (index + 1) % edge_count == other_index:
-                continue
-            if index == 0 and other_index == edge_count - 1:
-                continue
-            b1 = points[other_index]
-            b2 = points[(other_index + 1) % edge_count]
-            if _segments_intersect(a1, a2, b1, b2):
-                raise GeometryInnerContourError(message, f"segments #{index + 1} and #{other_index + 1} intersect")
-
-
-def _point_in_polygon(point: Point, polygon: Sequence[Point]) -> bool:
-    inside = False
-    for index, current in enumerate(polygon):
-        nxt = polygon[(index + 1) % len(polygon)]
-        if abs(_cross(nxt - current, point - current)) <= COORD_EPS and (
-            min(current.x, nxt.x) - COORD_EPS <= point.x <= max(current.x, nxt.x) + COORD_EPS
-            and min(current.y, nxt.y) - COORD_EPS <= point.y <= max(current.y, nxt.y) + COORD_EPS
-        ):
-            return True
-
-        intersects = ((current.y > point.y) != (nxt.y > point.y)) and (
-            point.x < (nxt.x - current.x) * (point.y - current.y) / (nxt.y - current.y + EPS) + current.x
-        )
-        if intersects:
-            inside = not inside
-    return inside
+            if other[0] <= max_x and min_x <= other[2] and other[1] <= max_y and min_y <= other[3]:
+                candidates.add((min(index, other_index), max(index, other_index)))
 
+    return sorted(candidates)
 
-def _distance_point_to_segment(point: Point, start: Point, end: Point) -> float:
-    segment = end - start
-    length_sq = _dot(segment, segment)
+
+def _assert_simple_polygon(points: PointArray, message: str) -> None:
+    edge_count = len(points)
+    # Candidates are checked in (index, other_index) order, so the reported pair is the
+    # same one an exhaustive pairwise scan would find first.
+    xs, ys = points.xs, points.ys
+    segments = list(zip(xs, ys, xs[1:] + xs[:1], ys[1:] + ys[:1]))
+    for index, other_index in _segment_grid_candidates(segments):
+        if (other_index + 1) % edge_count == index or (index + 1) % edge_count == other_index:
+            continue
+        if index == 0 and other_index == edge_count - 1:
+            continue
+        if _segments_intersect(*segments[index], *segments[other_index]):
+            raise GeometryInnerContourError(message, f"segments #{index + 1} and #{other_index + 1} intersect")
+
+
+def _distance_point_to_segment(x: float, y: float, start_x: float, start_y: float, end_x: float, end_y: float) -> float:
+    dx = end_x - start_x
+    dy = end_y - start_y
+    length_sq = dx * dx + dy * dy
     if length_sq <= EPS:
-        return _distance(point, start)
-    t = max(0.0, min(1.0, _dot(point - start, segment) / length_sq))
-    projection = start + segment.scale(t)
-    return _distance(point, projection)
+        return math.hypot(x - start_x, y - start_y)
+    t = max(0.0, min(1.0, ((x - start_x) * dx + (y - start_y) * dy) / length_sq))
+    return math.hypot(x - (start_x + dx * t), y - (start_y + dy * t))
+
+
+class PolygonEdgeIndex:
+    """Static bounding-box tree over the edges of a closed polygon.
+
+    Consecutive edges of a contour are spatially coherent, so the tree is built
+    over index ranges (no sorting): leaves hold EDGE_INDEX_LEAF_SIZE edges and
+    every node stores the bbox of its range. Nearest-edge distance is a
+    best-first search, containment and box queries only descend into nodes
+    whose bbox can matter - O(log n) for typical tool contours.
+    """
+
+    def __init__(self, polygon: PointArray) -> None:
+        self.polygon = polygon
+        xs, ys = polygon.xs, polygon.ys
+        edge_count = len(xs)
+        self.segments: list[tuple[float, float, float, float]] = list(
+            zip(xs, ys, xs[1:] + xs[:1], ys[1:] + ys[:1])
+        )
+        self._boxes: list[tuple[float, float, float, float]] = []
+        self._ranges: list[tuple[int, int]] = []
+        self._children: list[tuple[int, int] | None] = []
+        self._build(0, edge_count)
+
+    def _build(self, first: int, last: int) -> int:
+        node = len(self._boxes)
+        self._boxes.append((0.0, 0.0, 0.0, 0.0))
+        self._ranges.append((first, last))
+        self._children.append(None)
+
+        if last - first <= EDGE_INDEX_LEAF_SIZE:
+            xs = [coord for segment in self.segments[first:last] for coord in (segment[0], segment[2])]
+            ys = [coord for segment in self.segments[first:last] for coord in (segment[1], segment[3])]
+            self._boxes[node] = (min(xs) - COORD_EPS, min(ys) - COORD_EPS, max(xs) + COORD_EPS, max(ys) + COORD_EPS)
+            return node
+
+        middle = (first + last) // 2
+        left = self._build(first, middle)
+        right = self._build(middle, last)
+        left_box = self._boxes[left]
+        right_box = self._boxes[right]
+        self._boxes[node] = (
+            min(left_box[0], right_box[0]),
+            min(left_box[1], right_box[1]),
+            max(left_box[2], right_box[2]),
+            max(left_box[3], right_box[3]),
+        )
+        self._children[node] = (left, right)
+        return node
+
+    @staticmethod
+    def _box_distance(x: float, y: float, box: tuple[float, float, float, float]) -> float:
+        min_x, min_y, max_x, max_y = box
+        dx = min_x - x if x < min_x else (x - max_x if x > max_x else 0.0)
+        dy = min_y - y if y < min_y else (y - max_y if y > max_y else 0.0)
+        return math.hypot(dx, dy)
+
+    def edges_near(self, min_x: float, min_y: float, max_x: float, max_y: float) -> list[int]:
+        """Indices (ascending) of edges whose bbox overlaps the given box."""
+        found: list[int] = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            box = self._boxes[node]
+            if box[0] > max_x or box[2] < min_x or box[1] > max_y or box[3] < min_y:
+                continue
+            children = self._children[node]
+            if children is not None:
+                stack.extend(children)
+                continue
+            first, last = self._ranges[node]
+            for index in range(first, last):
+                start_x, start_y, end_x, end_y = self.segments[index]
+                if (
+                    min(start_x, end_x) - COORD_EPS <= max_x
+                    and max(start_x, end_x) + COORD_EPS >= min_x
+                    and min(start_y, end_y) - COORD_EPS <= max_y
+                    and max(start_y, end_y) + COORD_EPS >= min_y
+                ):
+                    found.append(index)
+        return sorted(found)
+
+    def nearest_distance(self, x: float, y: float, hint: int | None = None) -> float:
+        """Distance to the closest edge; ``hint`` (an edge likely to be close) only
+        seeds the bound so the search prunes from the start."""
+        segments = self.segments
+        boxes = self._boxes
+        box_distance = self._box_distance
+        best = math.inf if hint is None else _distance_point_to_segment(x, y, *segments[hint % len(segments)])
+        heap = [(0.0, 0)]
+        while heap:
+            lower_bound, node = heapq.heappop(heap)
+            if lower_bound >= best:
+                break
+            children = self._children[node]
+            if children is None:
+                first, last = self._ranges[node]
+                for index in range(first, last):
+                    start_x, start_y, end_x, end_y = segments[index]
+                    dx = end_x - start_x
+                    dy = end_y - start_y
+                    length_sq = dx * dx + dy * dy
+                    if length_sq <= EPS:
+                        distance = math.hypot(x - start_x, y - start_y)
+                    else:
+                        t = ((x - start_x) * dx + (y - start_y) * dy) / length_sq
+                        t = 0.0 if t < 0.0 else (1.0 if t > 1.0 else t)
+                        distance = math.hypot(x - (start_x + dx * t), y - (start_y + dy * t))
+                    if distance < best:
+                        best = distance
+                continue
+            for child in children:
+                child_bound = box_distance(x, y, boxes[child])
+                if child_bound < best:
+                    heapq.heappush(heap, (child_bound, child))
+        return best
+
+    def edge_distance(self, x: float, y: float, index: int) -> float:
+        return _distance_point_to_segment(x, y, *self.segments[index])
+
+    def edges_within(self, x: float, y: float, radius: float) -> Iterator[int]:
+        """Lazily yield edges closer than ``radius`` to the point (depth-first, unordered)."""
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if self._box_distance(x, y, self._boxes[node]) >= radius:
+                continue
+            children = self._children[node]
+            if children is not None:
+                stack.extend(children)
+                continue
+            first, last = self._ranges[node]
+            for index in range(first, last):
+                if _distance_point_to_segment(x, y, *self.segments[index]) < radius:
+                    yield index
+
+    def contains(self, x: float, y: float) -> bool:
+        """Even-odd containment; points within COORD_EPS of an edge count as inside."""
+        inside = False
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            box = self._boxes[node]
+            # Only edges straddling y to the right of the point (or touching it) matter.
+            if box[1] > y or box[3] < y or box[2] < x:
+                continue
+            children = self._children[node]
+            if children is not None:
+                stack.extend(children)
+                continue
+            first, last = self._ranges[node]
+            for index in range(first, last):
+                current_x, current_y, next_x, next_y = self.segments[index]
+                cross = (next_x - current_x) * (y - current_y) - (next_y - current_y) * (x - current_x)
+                if abs(cross) <= COORD_EPS and (
+                    min(current_x, next_x) - COORD_EPS <= x <= max(current_x, next_x) + COORD_EPS
+                    and min(current_y, next_y) - COORD_EPS <= y <= max(current_y, next_y) + COORD_EPS
+                ):
+                    return True
+
+                intersects = ((current_y > y) != (next_y > y)) and (
+                    x < (next_x - current_x) * (y - current_y) / (next_y - current_y + EPS) + current_x
+                )
+                if intersects:
+                    inside = not inside
+        return inside
 
 
-def _minimum_distance_to_polygon(point: Point, polygon: Sequence[Point]) -> float:
+def _segment_distance(
+    a1x: float, a1y: float, a2x: float, a2y: float,
+    b1x: float, b1y: float, b2x: float, b2y: float,
+) -> float:
+    if _segments_intersect(a1x, a1y, a2x, a2y, b1x, b1y, b2x, b2y):
+        return 0.0
     return min(
-        _distance_point_to_segment(point, polygon[index], polygon[(index + 1) % len(polygon)])
-        for index in range(len(polygon))
+        _distance_point_to_segment(a1x, a1y, b1x, b1y, b2x, b2y),
+        _distance_point_to_segment(a2x, a2y, b1x, b1y, b2x, b2y),
+        _distance_point_to_segment(b1x, b1y, a1x, a1y, a2x, a2y),
+        _distance_point_to_segment(b2x, b2y, a1x, a1y, a2x, a2y),
     )
 
 
-def _build_inward_offset(points_math: Sequence[Point], tool_radius: float) -> ToolpathResult:
+def _assert_clear_of_holes(
+    offset_points: PointArray,
+    holes: Sequence[PointArray],
+    tool_radius: float,
+    chord_tolerance: float = 0.0,
+) -> None:
+    """The toolpath runs along the outer wall; nested loops are material that must stay uncut.
+
+    Holes flattened with ``chord_tolerance`` may sit up to that far inside the true
+    arcs, so the required clearance is widened by the same amount.
+    """
+    xs, ys = offset_points.xs, offset_points.ys
+    reach = tool_radius + chord_tolerance
+    for hole_index, hole in enumerate(holes):
+        hole_index_grid = PolygonEdgeIndex(hole)
+        if hole_index_grid.contains(xs[0], ys[0]):
+            raise GeometryInnerContourError(
+                "Computed inward offset enters an inner loop",
+                f"offset vertex #1 lies inside inner loop #{hole_index + 1}",
+            )
+
+        for index, (x, y, next_x, next_y) in enumerate(zip(xs, ys, xs[1:] + xs[:1], ys[1:] + ys[:1])):
+            # Hole edges outside the radius-padded bbox cannot violate the clearance.
+            nearby = hole_index_grid.edges_near(
+                min(x, next_x) - reach,
+                min(y, next_y) - reach,
+                max(x, next_x) + reach,
+                max(y, next_y) + reach,
+            )
+            for hole_vertex_index in nearby:
+                clearance = _segment_distance(x, y, next_x, next_y, *hole_index_grid.segments[hole_vertex_index])
+                if clearance <= COORD_EPS:
+                    raise GeometryInnerContourError(
+                        "Computed inward offset enters an inner loop",
+                        f"offset segment #{index + 1} crosses inner loop #{hole_index + 1}",
+                    )
+                if clearance - chord_tolerance + 1e-5 < tool_radius:
+                    raise GeometryInnerContourError(
+                        "Computed inward offset is too close to an inner loop",
+                        f"offset segment #{index + 1} has only {clearance:.4f} mm clearance "
+                        f"to inner loop #{hole_index + 1} for radius {tool_radius:.4f} mm",
+                    )
+
+
+def _build_inward_offset(points_math: PointArray, tool_radius: float) -> ToolpathResult:
     if tool_radius <= 0:
         raise GeometryInnerContourError("Tool radius must be greater than zero")
 
-    working_points = list(points_math)
-    if _signed_area(working_points) < 0:
-        working_points.reverse()
+    working_points = points_math.reversed() if _signed_area(points_math) < 0 else points_math
+    xs, ys = working_points.xs, working_points.ys
+    edge_count = len(xs)
+    direction_xs, direction_ys, _ = _edge_directions(working_points)
 
-    offset_points: list[Point] = []
-    edge_count = len(working_points)
+    offset_points = PointArray()
     for index in range(edge_count):
-        prev_point = working_points[(index - 1) % edge_count]
-        current = working_points[index]
-        next_point = working_points[(index + 1) % edge_count]
-
-        prev_direction = _normalize(current - prev_point)
-        next_direction = _normalize(next_point - current)
-        prev_normal = _left_normal(prev_direction)
-        next_normal = _left_normal(next_direction)
-
-        shifted_prev_point = current + prev_normal.scale(tool_radius)
-        shifted_next_point = current + next_normal.scale(tool_radius)
-        candidate = _line_intersection(shifted_prev_point, prev_direction, shifted_next_point, next_direction)
-
-        if candidate is None:
-            normal_sum = prev_normal + next_normal
-            if math.hypot(normal_sum.x, normal_sum.y) <= EPS:
+        current_x = xs[index]
+        current_y = ys[index]
+        prev_dx = direction_xs[index - 1]
+        prev_dy = direction_ys[index - 1]
+        next_dx = direction_xs[index]
+        next_dy = direction_ys[index]
+
+        # Intersect the previous and next edges shifted by tool_radius along their left normals.
+        shifted_prev_x = current_x + -prev_dy * tool_radius
+        shifted_prev_y = current_y + prev_dx * tool_radius
+        shifted_next_x = current_x + -next_dy * tool_radius
+        shifted_next_y = current_y + next_dx * tool_radius
+        denominator = prev_dx * next_dy - prev_dy * next_dx
+
+        if abs(denominator) > EPS:
+            t = (
+                (shifted_next_x - shifted_prev_x) * next_dy - (shifted_next_y - shifted_prev_y) * next_dx
+            ) / denominator
+            candidate_x = shifted_prev_x + prev_dx * t
+            candidate_y = shifted_prev_y + prev_dy * t
+        else:
+            normal_sum_x = -prev_dy + -next_dy
+            normal_sum_y = prev_dx + next_dx
+            normal_sum_length = math.hypot(normal_sum_x, normal_sum_y)
+            if normal_sum_length <= EPS:
                 raise GeometryInnerContourError(
                     "Cannot build inward offset",
                     f"parallel/opposite edges near vertex #{index + 1}",
                 )
-            candidate = current + _normalize(normal_sum).scale(tool_radius)
+            candidate_x = current_x + normal_sum_x / normal_sum_length * tool_radius
+            candidate_y = current_y + normal_sum_y / normal_sum_length * tool_radius
 
-        if not math.isfinite(candidate.x) or not math.isfinite(candidate.y):
+        if not math.isfinite(candidate_x) or not math.isfinite(candidate_y):
             raise GeometryInnerContourError("Cannot build inward offset", f"invalid vertex near input vertex #{index + 1}")
 
-        offset_points.append(candidate)
+        offset_points.append(candidate_x, candidate_y)
 
     offset_points = _remove_consecutive_duplicates(offset_points)
+    source_index = PolygonEdgeIndex(working_points)
     if len(offset_points) < 3:
         raise GeometryInnerContourError(
             "Inward offset contour collapsed",
@@ -400,19 +792,22 @@ def _build_inward_offset(points_math: Sequence[Point], tool_radius: float) -> To
     if abs(_signed_area(offset_points)) <= EPS:
         raise GeometryInnerContourError("Inward offset contour area collapsed to zero")
 
-    for index, point in enumerate(offset_points):
-        next_point = offset_points[(index + 1) % len(offset_points)]
-        if _distance(point, next_point) < MIN_EDGE_LENGTH_MM:
+    offset_xs, offset_ys = offset_points.xs, offset_points.ys
+    for index, (x, y, next_x, next_y) in enumerate(
+        zip(offset_xs, offset_ys, offset_xs[1:] + offset_xs[:1], offset_ys[1:] + offset_ys[:1])
+    ):
+        if math.hypot(next_x - x, next_y - y) < MIN_EDGE_LENGTH_MM:
             raise GeometryInnerContourError(
                 "Inward offset contour contains too-short segments",
                 f"segment #{index + 1} is shorter than {MIN_EDGE_LENGTH_MM} mm",
             )
-        if not _point_in_polygon(point, working_points):
+        if not source_index.contains(x, y):
             raise GeometryInnerContourError(
                 "Computed inward offset leaves the source contour",
                 f"offset vertex #{index + 1} is outside the source polygon",
             )
-        boundary_distance = _minimum_distance_to_polygon(point, working_points)
+        # Offset vertex i comes from source vertex i, so edge i is a tight first bound.
+        boundary_distance = source_index.nearest_distance(x, y, hint=index)
         if boundary_distance + 1e-5 < tool_radius:
             raise GeometryInnerContourError(
                 "Computed inward offset is too close to the source contour",
@@ -421,8 +816,392 @@ def _build_inward_offset(points_math: Sequence[Point], tool_radius: float) -> To
 
     _assert_simple_polygon(offset_points, "Inward offset contour self-intersects")
 
-    offset_top_left = [Point(point.x, -point.y) for point in offset_points]
-    return ToolpathResult(offset_points_top_left=offset_top_left, offset_points_math=offset_points)
+    return ToolpathResult(offset_points_top_left=offset_points.flipped_y(), offset_points_math=offset_points)
+
+
+def _edge_directions(points: PointArray) -> tuple[array, array, array]:
+    """Unit direction and length of every edge i (vertex i -> i + 1)."""
+    xs, ys = points.xs, points.ys
+    edge_count = len(xs)
+    direction_xs = array("d", [0.0]) * edge_count
+    direction_ys = array("d", [0.0]) * edge_count
+    lengths = array("d", [0.0]) * edge_count
+    for index in range(edge_count):
+        next_index = (index + 1) % edge_count
+        vector_x = xs[next_index] - xs[index]
+        vector_y = ys[next_index] - ys[index]
+        length = math.hypot(vector_x, vector_y)
+        if length <= EPS:
+            raise GeometryInnerContourError("Degenerate segment detected", f"zero-length vector ({vector_x}, {vector_y})")
+        direction_xs[index] = vector_x / length
+        direction_ys[index] = vector_y / length
+        lengths[index] = length
+    return direction_xs, direction_ys, lengths
+
+
+def _raw_offset_loop(loop: PointArray, distance: float, chord_tolerance: float) -> tuple[PointArray, array, array]:
+    """Untrimmed offset of a closed loop by ``distance`` to its left.
+
+    Every edge is shifted along its left normal. At left turns the shifted edges
+    overlap: they are mitred when the overlap fits inside both edges, otherwise
+    their ends are bridged by a connector that ``_offset_region`` discards. At right
+    turns the gap is bridged by an arc around the vertex whose points lie on the
+    circumscribed polygon, so no part of the raw curve comes closer than
+    ``distance`` to the vertex it rounds.
+
+    Returns the raw vertices and, per segment (vertex i -> i + 1), its kind
+    (RAW_SEGMENT_EDGE / RAW_SEGMENT_SUSPECT / RAW_SEGMENT_CONNECTOR) and the source
+    vertex it was generated from. Suspect segments end at an unmitred left turn and
+    may lie entirely too close to the source.
+    """
+    xs, ys = loop.xs, loop.ys
+    edge_count = len(xs)
+    direction_xs, direction_ys, lengths = _edge_directions(loop)
+
+    # Distance the mitre point sits back from the shifted edge ends at each left turn.
+    trims = array("d", [0.0]) * edge_count
+    for index in range(edge_count):
+        prev_dx, prev_dy = direction_xs[index - 1], direction_ys[index - 1]
+        next_dx, next_dy = direction_xs[index], direction_ys[index]
+        turn = math.atan2(prev_dx * next_dy - prev_dy * next_dx, prev_dx * next_dx + prev_dy * next_dy)
+        if turn > EPS:
+            trims[index] = distance * math.tan(turn * 0.5)
+
+    mitred = [False] * edge_count
+    for index in range(edge_count):
+        trim = trims[index]
+        if trim > 0.0:
+            next_index = (index + 1) % edge_count
+            mitred[index] = trim + trims[index - 1] <= lengths[index - 1] and trim + trims[next_index] <= lengths[index]
+    unmitred = [trims[index] > 0.0 and not mitred[index] for index in range(edge_count)]
+
+    raw = PointArray()
+    kinds = array("b")
+    origins = array("l")
+
+    def add(x: float, y: float, kind: int) -> None:
+        # ``kind`` describes the segment starting at (x, y); a repeated point just
+        # hands its outgoing segment over to the newer one.
+        if raw.xs and _is_close_xy(raw.xs[-1], raw.ys[-1], x, y, EPS):
+            kinds[-1] = kind
+            origins[-1] = index
+            return
+        raw.append(x, y)
+        kinds.append(kind)
+        origins.append(index)
+
+    for index in range(edge_count):
+        x, y = xs[index], ys[index]
+        prev_dx, prev_dy = direction_xs[index - 1], direction_ys[index - 1]
+        next_dx, next_dy = direction_xs[index], direction_ys[index]
+        edge_kind = RAW_SEGMENT_SUSPECT if unmitred[index] or unmitred[(index + 1) % edge_count] else RAW_SEGMENT_EDGE
+
+        if mitred[index]:
+            trim = trims[index]
+            add(x - prev_dy * distance - prev_dx * trim, y + prev_dx * distance - prev_dy * trim, edge_kind)
+            continue
+
+        cross = prev_dx * next_dy - prev_dy * next_dx
+        if unmitred[index]:
+            add(x - prev_dy * distance, y + prev_dx * distance, RAW_SEGMENT_CONNECTOR)
+        else:
+            add(x - prev_dy * distance, y + prev_dx * distance, RAW_SEGMENT_EDGE)
+            if cross < -EPS:
+                sweep = math.atan2(cross, prev_dx * next_dx + prev_dy * next_dy)
+                start_angle = math.atan2(prev_dx, -prev_dy)
+                step_count = arc_segment_count(distance, sweep, chord_tolerance)
+                step = sweep / step_count
+                radius = distance / math.cos(step * 0.5)
+                for step_index in range(step_count):
+                    angle = start_angle + step * (step_index + 0.5)
+                    add(x + radius * math.cos(angle), y + radius * math.sin(angle), RAW_SEGMENT_EDGE)
+        add(x - next_dy * distance, y + next_dx * distance, edge_kind)
+
+    if len(raw) > 1 and _is_close_xy(raw.xs[0], raw.ys[0], raw.xs[-1], raw.ys[-1], EPS):
+        raw.xs.pop()
+        raw.ys.pop()
+        kinds.pop()
+        origins.pop()
+    return raw, kinds, origins
+
+
+def _drop_collinear_points(points: PointArray) -> PointArray:
+    """Remove vertices on a straight run and zero-width spikes (path doubling back)."""
+    kept_xs: list[float] = []
+    kept_ys: list[float] = []
+
+    def is_straight(index: int) -> bool:
+        in_x, in_y = kept_xs[index - 1] - kept_xs[index - 2], kept_ys[index - 1] - kept_ys[index - 2]
+        out_x, out_y = kept_xs[index] - kept_xs[index - 1], kept_ys[index] - kept_ys[index - 1]
+        return abs(in_x * out_y - in_y * out_x) <= EPS * math.hypot(in_x, in_y) * math.hypot(out_x, out_y)
+
+    for x, y in zip(points.xs, points.ys):
+        kept_xs.append(x)
+        kept_ys.append(y)
+        while len(kept_xs) >= 3 and is_straight(len(kept_xs) - 1):
+            del kept_xs[-2], kept_ys[-2]
+
+    # The seam: the loop wraps from the last kept vertex back to the first ones.
+    changed = True
+    while changed and len(kept_xs) >= 3:
+        changed = False
+        for _ in range(2):
+            kept_xs.append(kept_xs.pop(0))
+            kept_ys.append(kept_ys.pop(0))
+            if is_straight(len(kept_xs) - 1):
+                del kept_xs[-2], kept_ys[-2]
+                changed = True
+                if len(kept_xs) < 3:
+                    break
+
+    return PointArray(kept_xs, kept_ys)
+
+
+def _offset_region(boundaries: Sequence[PointArray], distance: float, chord_tolerance: float) -> list[PointArray]:
+    """Loops bounding the points that lie at least ``distance`` inside a region.
+
+    ``boundaries`` are the closed loops of the region, oriented with the region on
+    their left (outer contour counter-clockwise, holes clockwise); the result keeps
+    that convention. Raw offsets of all loops are split at their mutual
+    intersections, pieces closer than ``distance`` to the source (or outside it)
+    are dropped and the rest is stitched back into loops. A narrow neck therefore
+    splits the result into several loops; an empty list means the region collapsed.
+    """
+    source_indexes = [PolygonEdgeIndex(loop) for loop in boundaries]
+    limit = distance - COORD_EPS
+
+    def near_origin(source: int, origin: int) -> range:
+        edge_count = len(boundaries[source])
+        if edge_count <= 2 * RAW_LOCAL_CHECK_EDGES + 1:
+            return range(edge_count)
+        return range(origin - RAW_LOCAL_CHECK_EDGES - 1, origin + RAW_LOCAL_CHECK_EDGES)
+
+    def too_close(start_x: float, start_y: float, end_x: float, end_y: float, source: int, origin: int) -> bool:
+        # Distance to one source edge is convex along a segment: when both ends are
+        # closer than ``distance`` to the same edge, so is every point in between.
+        source_index = source_indexes[source]
+        edge_count = len(boundaries[source])
+        for edge in near_origin(source, origin):
+            edge %= edge_count
+            if (
+                source_index.edge_distance(start_x, start_y, edge) < limit
+                and source_index.edge_distance(end_x, end_y, edge) < limit
+            ):
+                return True
+        return any(
+            other_index.edge_distance(end_x, end_y, edge) < limit
+            for other_index in source_indexes
+            for edge in other_index.edges_within(start_x, start_y, limit)
+        )
+
+    def is_valid(x: float, y: float, source: int, origin: int) -> bool:
+        source_index = source_indexes[source]
+        edge_count = len(boundaries[source])
+        for edge in near_origin(source, origin):
+            if source_index.edge_distance(x, y, edge % edge_count) < limit:
+                return False
+        if min(other_index.nearest_distance(x, y) for other_index in source_indexes) < limit:
+            return False
+        return sum(other_index.contains(x, y) for other_index in source_indexes) % 2 == 1
+
+    segment_xs = array("d")
+    segment_ys = array("d")
+    segment_next: list[int] = []
+    segment_sources: list[tuple[int, int]] = []
+    raw_ranges: list[range] = []
+    live: list[int] = []
+    live_segments: list[tuple[float, float, float, float]] = []
+    for source, loop in enumerate(boundaries):
+        raw, kinds, origins = _raw_offset_loop(loop, distance, chord_tolerance)
+        first = len(segment_xs)
+        count = len(raw)
+        if count < 3:
+            continue
+        raw_ranges.append(range(first, first + count))
+        for index, (x, y, next_x, next_y) in enumerate(zip(raw.xs, raw.ys, raw.xs[1:] + raw.xs[:1], raw.ys[1:] + raw.ys[:1])):
+            segment_xs.append(x)
+            segment_ys.append(y)
+            segment_next.append(first + (index + 1) % count)
+            segment_sources.append((source, origins[index]))
+            # Connectors always lie within ``distance`` of their vertex. Suspect edges are
+            # filtered here because, once the offset folds over itself past the collapse
+            # point, they would make the intersection pass quadratic.
+            kind = kinds[index]
+            if kind == RAW_SEGMENT_CONNECTOR:
+                continue
+            if kind == RAW_SEGMENT_SUSPECT and too_close(x, y, next_x, next_y, source, origins[index]):
+                continue
+            live.append(first + index)
+            live_segments.append((x, y, next_x, next_y))
+
+    if not live_segments:
+        return []
+
+    # Every intersection is computed once and recorded on both segments, so the
+    # pieces on either side share bit-identical endpoints.
+    splits: dict[int, list[tuple[float, float, float]]] = {index: [] for index in live}
+    for live_index, other_live_index in _segment_grid_candidates(live_segments):
+        index, other_index = live[live_index], live[other_live_index]
+        if segment_next[index] == other_index or segment_next[other_index] == index:
+            continue
+        ax, ay = segment_xs[index], segment_ys[index]
+        bx, by = segment_xs[other_index], segment_ys[other_index]
+        a_next = segment_next[index]
+        b_next = segment_next[other_index]
+        r_x, r_y = segment_xs[a_next] - ax, segment_ys[a_next] - ay
+        s_x, s_y = segment_xs[b_next] - bx, segment_ys[b_next] - by
+        denominator = r_x * s_y - r_y * s_x
+        if abs(denominator) <= EPS * math.hypot(r_x, r_y) * math.hypot(s_x, s_y):
+            continue
+        q_x, q_y = bx - ax, by - ay
+        t = (q_x * s_y - q_y * s_x) / denominator
+        u = (q_x * r_y - q_y * r_x) / denominator
+        if -EPS <= t <= 1.0 + EPS and -EPS <= u <= 1.0 + EPS:
+            hit_x, hit_y = ax + r_x * t, ay + r_y * t
+            splits[index].append((t, hit_x, hit_y))
+            splits[other_index].append((u, hit_x, hit_y))
+
+    # Clearance only changes where raw curves cross, so it is checked once per run of
+    # pieces between intersections - a single query for an offset that does not fold.
+    pieces: list[tuple[float, float, float, float]] = []
+    for raw_range in raw_ranges:
+        valid: bool | None = None
+        for index in raw_range:
+            cuts = splits.get(index)
+            if cuts is None:
+                valid = None
+                continue
+            cuts.sort()
+            if cuts and cuts[0][0] <= COORD_EPS:
+                valid = None
+            next_index = segment_next[index]
+            stops = [(0.0, segment_xs[index], segment_ys[index])]
+            stops.extend(cuts)
+            stops.append((1.0, segment_xs[next_index], segment_ys[next_index]))
+            for stop_index, ((_, x, y), (_, next_x, next_y)) in enumerate(zip(stops, stops[1:])):
+                if stop_index > 0:
+                    valid = None
+                if _is_close_xy(x, y, next_x, next_y, EPS):
+                    continue
+                if valid is None:
+                    valid = is_valid((x + next_x) * 0.5, (y + next_y) * 0.5, *segment_sources[index])
+                if valid:
+                    pieces.append((x, y, next_x, next_y))
+            if cuts and cuts[-1][0] >= 1.0 - COORD_EPS:
+                valid = None
+
+    starts: dict[tuple[int, int], list[int]] = {}
+    for index, (x, y, _, _) in enumerate(pieces):
+        starts.setdefault((round(x / COORD_EPS), round(y / COORD_EPS)), []).append(index)
+
+    used = [False] * len(pieces)
+
+    def continuation(x: float, y: float, in_x: float, in_y: float) -> int | None:
+        # Where the offset touches itself several pieces start at one point; taking the
+        # sharpest right turn keeps the touching loops separate.
+        key_x, key_y = round(x / COORD_EPS), round(y / COORD_EPS)
+        best: int | None = None
+        best_turn = math.inf
+        for cell_x in (key_x - 1, key_x, key_x + 1):
+            for cell_y in (key_y - 1, key_y, key_y + 1):
+                for candidate in starts.get((cell_x, cell_y), ()):
+                    start_x, start_y, end_x, end_y = pieces[candidate]
+                    if used[candidate] or not _is_close_xy(start_x, start_y, x, y, 2.0 * COORD_EPS):
+                        continue
+                    out_x, out_y = end_x - start_x, end_y - start_y
+                    turn = math.atan2(in_x * out_y - in_y * out_x, in_x * out_x + in_y * out_y)
+                    if turn < best_turn:
+                        best, best_turn = candidate, turn
+        return best
+
+    loops: list[PointArray] = []
+    for first in range(len(pieces)):
+        if used[first]:
+            continue
+        used[first] = True
+        first_x, first_y = pieces[first][0], pieces[first][1]
+        chain = PointArray()
+        current = first
+        closed = False
+        while True:
+            x, y, end_x, end_y = pieces[current]
+            chain.append(x, y)
+            if _is_close_xy(end_x, end_y, first_x, first_y, 2.0 * COORD_EPS):
+                closed = True
+                break
+            following = continuation(end_x, end_y, end_x - x, end_y - y)
+            if following is None:
+                break
+            used[following] = True
+            current = following
+
+        if not closed:
+            continue
+        loop = _drop_collinear_points(_remove_consecutive_duplicates(chain))
+        if len(loop) >= 3 and abs(_signed_area(loop)) > MIN_EDGE_LENGTH_MM * MIN_EDGE_LENGTH_MM:
+            loops.append(loop)
+
+    return loops
+
+
+def _build_pocket_offsets(
+    boundaries: Sequence[PointArray],
+    tool_radius: float,
+    stepover: float,
+    chord_tolerance: float,
+) -> list[list[PointArray]]:
+    """Inward offsets at tool_radius, tool_radius + stepover, ... until the region collapses.
+
+    Every level is offset from the source loops rather than from the previous level,
+    so arc joins and rounding errors do not accumulate.
+    """
+    levels: list[list[PointArray]] = []
+    distance = tool_radius
+    while True:
+        loops = _offset_region(boundaries, distance + POCKET_OFFSET_MARGIN_MM, chord_tolerance)
+        if not loops:
+            break
+        levels.append(loops)
+        distance += stepover
+
+    if not levels:
+        raise GeometryInnerContourError(
+            "Inward offset contour collapsed",
+            f"tool radius {tool_radius:.4f} mm does not fit inside the contour",
+        )
+
+    for level_index, loops in enumerate(levels):
+        for loop in loops:
+            _assert_simple_polygon(loop, f"Pocket offset contour self-intersects at level {level_index + 1}")
+    return levels
+
+
+def _order_pocket_loops(levels: Sequence[Sequence[PointArray]]) -> list[PointArray]:
+    """Cutting order: innermost level first, the wall pass last.
+
+    Within a level loops are visited nearest-first, and every loop is rotated to
+    start at its vertex closest to the previous end point to keep rapids short.
+    """
+    ordered: list[PointArray] = []
+    position: tuple[float, float] | None = None
+    for loops in reversed(levels):
+        pending = list(loops)
+        while pending:
+            best_loop = 0
+            best_vertex = 0
+            if position is not None:
+                best_distance = math.inf
+                for loop_index, loop in enumerate(pending):
+                    for vertex_index, (x, y) in enumerate(zip(loop.xs, loop.ys)):
+                        candidate = (x - position[0]) ** 2 + (y - position[1]) ** 2
+                        if candidate < best_distance:
+                            best_distance = candidate
+                            best_loop, best_vertex = loop_index, vertex_index
+            loop = pending.pop(best_loop)
+            rotated = PointArray(loop.xs[best_vertex:] + loop.xs[:best_vertex], loop.ys[best_vertex:] + loop.ys[:best_vertex])
+            ordered.append(rotated)
+            position = (rotated.xs[0], rotated.ys[0])
+    return ordered
 
 
 def _build_success_nc(config: CliConfig, prepared: PreparedGeometry, result: ToolpathResult) -> str:
@@ -433,8 +1212,10 @@ def _build_success_nc(config: CliConfig, prepared: PreparedGeometry, result: Too
         _comment(f"feed={_format_number(config.feed)}"),
         _comment(f"tool_diameter={_format_number(config.tool_diameter)}"),
         _comment(f"tool_radius={_format_number(config.tool_radius)}"),
+        _comment(f"chord_tolerance={_format_number(config.chord_tolerance)}"),
         _comment(f"source_vertices={prepared.source_vertices_count}"),
         _comment(f"flattened_vertices={len(prepared.flattened_points_top_left)}"),
+        _comment(f"inner_loops={len(prepared.hole_points_math)}"),
         _comment(f"offset_vertices={len(result.offset_points_top_left)}"),
         "G21",
         "G17",
@@ -442,19 +1223,56 @@ def _build_success_nc(config: CliConfig, prepared: PreparedGeometry, result: Too
         f"G0 Z{_format_number(SAFE_Z_MM)}",
     ]
 
-    start_point = result.offset_points_top_left[0]
-    lines.append(f"G0 X{_format_number(start_point.x)} Y{_format_number(start_point.y)}")
+    toolpath = result.offset_points_top_left
+    start_x, start_y = toolpath.xs[0], toolpath.ys[0]
+    lines.append(f"G0 X{_format_number(start_x)} Y{_format_number(start_y)}")
     lines.append(f"G1 Z{_format_number(config.z_depth)} F{_format_number(config.feed)}")
 
-    for point in result.offset_points_top_left[1:]:
-        lines.append(f"G1 X{_format_number(point.x)} Y{_format_number(point.y)} F{_format_number(config.feed)}")
+    for x, y in zip(toolpath.xs[1:], toolpath.ys[1:]):
+        lines.append(f"G1 X{_format_number(x)} Y{_format_number(y)} F{_format_number(config.feed)}")
 
-    lines.append(f"G1 X{_format_number(start_point.x)} Y{_format_number(start_point.y)} F{_format_number(config.feed)}")
+    lines.append(f"G1 X{_format_number(start_x)} Y{_format_number(start_y)} F{_format_number(config.feed)}")
     lines.append(f"G0 Z{_format_number(SAFE_Z_MM)}")
     lines.append("M30")
     return "\n".join(lines) + "\n"
 
 
+def _build_pocket_nc(config: CliConfig, prepared: PreparedGeometry, result: PocketResult) -> str:
+    lines = [
+        _comment("geometry_inner_contour_cli pocket"),
+        _comment(f"input_path={config.input_path}"),
+        _comment(f"z_depth={_format_number(config.z_depth)}"),
+        _comment(f"feed={_format_number(config.feed)}"),
+        _comment(f"tool_diameter={_format_number(config.tool_diameter)}"),
+        _comment(f"tool_radius={_format_number(config.tool_radius)}"),
+        _comment(f"stepover={_format_number(config.stepover or 0.0)}"),
+        _comment(f"chord_tolerance={_format_number(config.chord_tolerance)}"),
+        _comment(f"source_vertices={prepared.source_vertices_count}"),
+        _comment(f"flattened_vertices={len(prepared.flattened_points_top_left)}"),
+        _comment(f"inner_loops={len(prepared.hole_points_math)}"),
+        _comment(f"pocket_levels={result.levels}"),
+        _comment(f"pocket_loops={len(result.loops_top_left)}"),
+        _comment(f"offset_vertices={result.offset_vertices}"),
+        "G21",
+        "G17",
+        "G90",
+        f"G0 Z{_format_number(SAFE_Z_MM)}",
+    ]
+
+    feed = _format_number(config.feed)
+    for toolpath in result.loops_top_left:
+        start_x, start_y = toolpath.xs[0], toolpath.ys[0]
+        lines.append(f"G0 X{_format_number(start_x)} Y{_format_number(start_y)}")
+        lines.append(f"G1 Z{_format_number(config.z_depth)} F{feed}")
+        for x, y in zip(toolpath.xs[1:], toolpath.ys[1:]):
+            lines.append(f"G1 X{_format_number(x)} Y{_format_number(y)} F{feed}")
+        lines.append(f"G1 X{_format_number(start_x)} Y{_format_number(start_y)} F{feed}")
+        lines.append(f"G0 Z{_format_number(SAFE_Z_MM)}")
+
+    lines.append("M30")
+    return "\n".join(lines) + "\n"
+
+
 def _build_error_nc(config: CliConfig | None, message: str, details: str | None = None) -> str:
     lines = [_comment("geometry_inner_contour_cli ERROR")]
     if config is not None:
@@ -477,13 +1295,33 @@ def _write_output(path: Path, text: str) -> None:
 
 def _parse_args(argv: Sequence[str]) -> CliConfig:
     parser = argparse.ArgumentParser(
-        description="Generate a simple single-pass inner contour NC file from geometry JSON.",
+        description="Generate a single-pass inner contour (or, with --stepover, a full pocket) NC file from geometry JSON.",
     )
     parser.add_argument("--input", required=True, dest="input_path", help="Path to geometry JSON")
     parser.add_argument("--output", required=True, dest="output_path", help="Path to output .nc file")
     parser.add_argument("--z-depth", required=True, type=float, dest="z_depth", help="Target cutting depth in mm")
     parser.add_argument("--feed", required=True, type=float, dest="feed", help="Feed rate in mm/min")
     parser.add_argument("--tool-diameter", required=True, type=float, dest="tool_diameter", help="Tool diameter in mm")
+    parser.add_argument(
+        "--chord-tolerance",
+        type=float,
+        default=TOOLPATH_CHORD_TOLERANCE_MM,
+        dest="chord_tolerance",
+        help="Max arc flattening error of the toolpath in mm",
+    )
+    parser.add_argument(
+        "--validation-tolerance",
+        type=float,
+        default=VALIDATION_CHORD_TOLERANCE_MM,
+        dest="validation_tolerance",
+        help="Max arc flattening error of inner loops used for clearance checks in mm",
+    )
+    parser.add_argument(
+        "--stepover",
+        type=float,
+        dest="stepover",
+        help="Clear the whole pocket with inward offsets spaced this fraction of the tool diameter apart (0 < value <= 1)",
+    )
     args = parser.parse_args(argv)
 
     input_path = Path(args.input_path)
@@ -494,38 +1332,106 @@ def _parse_args(argv: Sequence[str]) -> CliConfig:
     if output_path.exists() and output_path.is_dir():
         raise GeometryInnerContourError("--output must be a file path", str(output_path))
 
-    if args.feed <= 0:
+    config = CliConfig(
+        input_path=input_path,
+        output_path=output_path,
+        z_depth=float(args.z_depth),
+        feed=float(args.feed),
+        tool_diameter=float(args.tool_diameter),
+        chord_tolerance=float(args.chord_tolerance),
+        validation_tolerance=float(args.validation_tolerance),
+        stepover=float(args.stepover) if args.stepover is not None else None,
+    )
+    _validate_config(config)
+    return config
+
+
+def _validate_config(config: CliConfig) -> None:
+    if not config.feed > 0:
         raise GeometryInnerContourError("--feed must be > 0")
 
-    if args.tool_diameter <= 0:
+    if not config.tool_diameter > 0:
         raise GeometryInnerContourError("--tool-diameter must be > 0")
 
-    if not math.isfinite(args.z_depth):
+    if not math.isfinite(config.z_depth):
         raise GeometryInnerContourError("--z-depth must be a finite number")
 
-    return CliConfig(
-        input_path=input_path,
-        output_path=output_path,
-        z_depth=float(args.z_depth),
-        feed=float(args.feed),
-        tool_diameter=float(args.tool_diameter),
+    if not config.chord_tolerance > 0:
+        raise GeometryInnerContourError("--chord-tolerance must be > 0")
+
+    if not config.validation_tolerance > 0:
+        raise GeometryInnerContourError("--validation-tolerance must be > 0")
+
+    if config.stepover is not None and not 0 < config.stepover <= 1:
+        raise GeometryInnerContourError("--stepover must be in (0, 1]")
+
+
+def _generate(prepared: PreparedGeometry, config: CliConfig) -> ToolpathResult:
+    result = _build_inward_offset(prepared.flattened_points_math, config.tool_radius)
+    _assert_clear_of_holes(
+        result.offset_points_math,
+        prepared.hole_points_math,
+        config.tool_radius,
+        config.validation_tolerance,
+    )
+    return result
+
+
+def _generate_pocket(prepared: PreparedGeometry, config: CliConfig) -> PocketResult:
+    outer = prepared.flattened_points_math
+    # _offset_region expects the region on the left: outer counter-clockwise, holes clockwise.
+    boundaries = [outer.reversed() if _signed_area(outer) < 0 else outer]
+    boundaries.extend(hole.reversed() if _signed_area(hole) > 0 else hole for hole in prepared.hole_points_math)
+
+    levels = _build_pocket_offsets(
+        boundaries,
+        config.tool_radius,
+        (config.stepover or 1.0) * config.tool_diameter,
+        config.chord_tolerance,
+    )
+    return PocketResult(
+        levels=len(levels),
+        loops_top_left=tuple(loop.flipped_y() for loop in _order_pocket_loops(levels)),
+    )
+
+
+def _generate_nc(prepared: PreparedGeometry, config: CliConfig) -> tuple[str, int]:
+    """NC text and emitted offset vertex count for either mode."""
+    if config.stepover is None:
+        result = _generate(prepared, config)
+        return _build_success_nc(config, prepared, result), len(result.offset_points_top_left)
+    pocket = _generate_pocket(prepared, config)
+    return _build_pocket_nc(config, prepared, pocket), pocket.offset_vertices
+
+
+def generate_inner_contour_nc(geometry: dict[str, Any], config: CliConfig) -> str:
+    """In-process equivalent of ``run_cli``: geometry JSON payload -> NC text.
+
+    ``config.input_path``/``output_path`` are only used for the NC header comments;
+    nothing is read from or written to disk. Raises GeometryInnerContourError.
+    """
+    _validate_config(config)
+    prepared = _prepare_geometry_payload(
+        _validate_geometry_payload(geometry),
+        config.chord_tolerance,
+        config.hole_tolerance,
     )
+    return _generate_nc(prepared, config)[0]
 
 
 def run_cli(argv: Sequence[str]) -> int:
     config: CliConfig | None = None
     try:
         config = _parse_args(argv)
-        prepared = _prepare_geometry(config.input_path)
-        result = _build_inward_offset(prepared.flattened_points_math, config.tool_radius)
-        nc_text = _build_success_nc(config, prepared, result)
+        prepared = _prepare_geometry(config.input_path, config.chord_tolerance, config.hole_tolerance)
+        nc_text, offset_vertices = _generate_nc(prepared, config)
         _write_output(config.output_path, nc_text)
         print(
-            "OK: generated inner contour NC",
+            "OK: generated inner contour NC" if config.stepover is None else "OK: generated pocket NC",
             f"input={config.input_path}",
             f"output={config.output_path}",
             f"flattened_vertices={len(prepared.flattened_points_top_left)}",
-            f"offset_vertices={len(result.offset_points_top_left)}",
+            f"offset_vertices={offset_vertices}",
             sep="\n",
         )
         return 0
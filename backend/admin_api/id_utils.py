@@ -41,11 +41,14 @@ _CYRILLIC_TO_LATIN = {
 }
 
 
+def transliterate(text: str) -> str:
+    """NFKC-normalized, lowercased text with Cyrillic spelled in Latin letters."""
+    result = unicodedata.normalize("NFKC", text).lower()
+    return "".join(_CYRILLIC_TO_LATIN.get(ch, ch) for ch in result)
+
+
 def generate_id(article: str) -> str:
-    result = article.strip()
-    result = unicodedata.normalize("NFKC", result)
-    result = result.lower()
-    result = "".join(_CYRILLIC_TO_LATIN.get(ch, ch) for ch in result)
+    result = transliterate(article.strip())
     result = result.replace(",", ".")
     result = re.sub(r"[^a-z0-9.-]", "-", result)
     result = re.sub(r"-{2,}", "-", result)
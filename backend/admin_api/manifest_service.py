@@ -1,26 +1,74 @@
+import fcntl
 import json
+import os
 import tempfile
 import shutil
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from domain_store import MANIFEST_PATH
+from typing import Iterator, Optional
+from domain_store import CATALOG_DB_PATH, MANIFEST_PATH
+from admin_api.catalog_store import CatalogTransaction, JsonCatalogTransaction, SqliteCatalogStore
+from services.manifest_changes import record_manifest_change
+from services.manifest_repository import (
+    ManifestSnapshot,
+    file_stamp,
+    get_manifest_snapshot,
+    publish_manifest_text,
+)
 
+# "json" (default): manifest.json is the catalog and every edit rewrites it.
+# "sqlite": the catalog lives in CATALOG_DB_PATH and manifest.json is an export of it.
+# An edit then writes only the rows it changed, but manifest.json is still
+# re-exported in full after every commit that changed something, so the
+# saving is shorter write transactions, not fewer bytes written per edit.
+CATALOG_STORE = os.getenv("CATALOG_STORE", "json").strip().lower()
 
-def load_manifest():
-    if not MANIFEST_PATH.exists():
+MANIFEST_LOCK_PATH = MANIFEST_PATH.parent / ".manifest.lock"
+
+_sqlite_store = None
+_sqlite_store_lock = threading.Lock()
+
+
+@dataclass
+class ManifestVersionConflict(Exception):
+    expected: int
+    actual: int
+
+    def __str__(self) -> str:
+        return f"Manifest version is {self.actual}, expected {self.expected}"
+
+
+@contextmanager
+def manifest_write_lock() -> Iterator[None]:
+    """Exclusive lock for writing manifest.json, shared by threads and worker processes."""
+    MANIFEST_LOCK_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with MANIFEST_LOCK_PATH.open("a", encoding="utf-8") as lock_fp:
+        fcntl.flock(lock_fp.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_fp.fileno(), fcntl.LOCK_UN)
+
+
+def load_manifest_snapshot() -> ManifestSnapshot:
+    """Shared read-only manifest; use load_manifest() when the result will be modified."""
+    snapshot = get_manifest_snapshot()
+    if snapshot is None:
         raise RuntimeError("manifest.json not found")
+    return snapshot
 
-    with MANIFEST_PATH.open("r", encoding="utf-8") as f:
-        manifest = json.load(f)
 
-    if not isinstance(manifest.get("items"), list):
-        manifest["items"] = []
-    if "sets" in manifest and not isinstance(manifest.get("sets"), list):
-        manifest.pop("sets", None)
-    return manifest
+def load_manifest():
+    return load_manifest_snapshot().mutable_copy()
 
 
 def save_manifest_atomic(data: dict):
+    """Replace manifest.json and log the delta; callers hold manifest_write_lock()."""
+    previous = get_manifest_snapshot()
     tmp_dir = MANIFEST_PATH.parent
+    text = json.dumps(data, ensure_ascii=False, indent=2)
 
     with tempfile.NamedTemporaryFile(
         mode="w",
@@ -28,7 +76,77 @@ def save_manifest_atomic(data: dict):
         dir=tmp_dir,
         delete=False
     ) as tmp:
-        json.dump(data, tmp, ensure_ascii=False, indent=2)
+        tmp.write(text)
+        tmp.flush()
+        stamp = file_stamp(os.fstat(tmp.fileno()))
         tmp_path = Path(tmp.name)
 
     shutil.move(tmp_path, MANIFEST_PATH)
+    publish_manifest_text(text, stamp)
+    record_manifest_change(previous, data)
+
+
+def get_sqlite_store() -> SqliteCatalogStore:
+    """SQLite catalog, seeded from manifest.json on first use."""
+    global _sqlite_store
+    if _sqlite_store is None:
+        with _sqlite_store_lock:
+            if _sqlite_store is None:
+                store = SqliteCatalogStore(CATALOG_DB_PATH)
+                if not store.is_initialized():
+                    store.import_manifest(load_manifest())
+                export_manifest(store)
+                _sqlite_store = store
+    return _sqlite_store
+
+
+def export_manifest(store: SqliteCatalogStore):
+    """Regenerate manifest.json from the database unless it is already current.
+
+    Runs under the manifest lock, so an export can never overwrite a newer
+    one, and concurrent commits coalesce into a single export.
+    """
+    with manifest_write_lock():
+        snapshot = get_manifest_snapshot()
+        if snapshot is not None and snapshot.version == store.version():
+            return
+        save_manifest_atomic(store.export_manifest())
+
+
+def _check_expected_version(transaction: CatalogTransaction, expected_version: Optional[int]):
+    if expected_version is not None and transaction.version != expected_version:
+        raise ManifestVersionConflict(expected=expected_version, actual=transaction.version)
+
+
+@contextmanager
+def catalog_transaction(expected_version: Optional[int] = None) -> Iterator[CatalogTransaction]:
+    """Apply catalog edits atomically and bump manifest.version once.
+
+    Writers are serialized across threads and processes. With
+    ``expected_version`` the block only runs if the catalog is still at that
+    version, otherwise ManifestVersionConflict is raised. An exception inside
+    the block discards every edit. After the block ``transaction.version`` is
+    the version that was published.
+    """
+    if CATALOG_STORE == "sqlite":
+        store = get_sqlite_store()
+        transaction = store.begin()
+        try:
+            _check_expected_version(transaction, expected_version)
+            yield transaction
+        except BaseException:
+            store.rollback(transaction)
+            raise
+        store.commit(transaction)
+        if transaction.changed:
+            export_manifest(store)
+        return
+
+    with manifest_write_lock():
+        transaction = JsonCatalogTransaction(load_manifest())
+        _check_expected_version(transaction, expected_version)
+        yield transaction
+        if transaction.changed:
+            transaction.version += 1
+            transaction.manifest["version"] = transaction.version
+            save_manifest_atomic(transaction.manifest)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+from threading import Lock
+from typing import Optional, Set
+
+from domain_store import CONTOURS_DIR, CONTOURS_OBJECTS_DIR, contour_object_path
+
+OBJECTS_PREFIX = CONTOURS_OBJECTS_DIR.relative_to(CONTOURS_DIR).as_posix() + "/"
+_CHUNK_SIZE = 1024 * 1024
+
+# Objects are never rewritten or removed, so once seen on disk they stay there.
+_known_objects: Set[str] = set()
+_known_objects_lock = Lock()
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as source:
+        for chunk in iter(lambda: source.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def object_asset_path(source: Path, ext: str) -> str:
+    """Manifest asset path ("objects/ab/<sha256>.<ext>") the content of ``source`` is stored under."""
+    return contour_object_path(file_digest(source), ext.lower()).relative_to(CONTOURS_DIR).as_posix()
+
+
+def is_object_asset(asset_path: Optional[str]) -> bool:
+    return bool(asset_path) and asset_path.startswith(OBJECTS_PREFIX)
+
+
+def object_exists(asset_path: str) -> bool:
+    if asset_path in _known_objects:
+        return True
+    if not (CONTOURS_DIR / asset_path).is_file():
+        return False
+    with _known_objects_lock:
+        _known_objects.add(asset_path)
+    return True
+
+
+def put_object(source: Path, asset_path: str) -> bool:
+    """Move ``source`` to ``asset_path`` (see object_asset_path); False if the object was already stored.
+
+    ``source`` must be on the same filesystem (the upload staging area is),
+    so the object appears atomically and readers never see a partial file.
+    """
+    if object_exists(asset_path):
+        source.unlink(missing_ok=True)
+        return False
+    target = CONTOURS_DIR / asset_path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(source, target)
+    with _known_objects_lock:
+        _known_objects.add(asset_path)
+    return True
@@ -1,5 +1,7 @@
 import sys
+from domain_store import CONTOURS_DIR
 from gcode_rotator import rotate_gcode_for_contour
+from services.manifest_repository import get_manifest_snapshot
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
@@ -7,4 +9,8 @@ if __name__ == "__main__":
         sys.exit(1)
     
     contour_id = sys.argv[1]
-    rotate_gcode_for_contour(contour_id)
\ No newline at end of file
+    # .nc может лежать в objects/ — берём путь из манифеста, иначе nc/<id>.nc
+    snapshot = get_manifest_snapshot()
+    item = snapshot.items_by_id.get(contour_id) if snapshot else None
+    nc_asset = ((item or {}).get("assets") or {}).get("nc")
+    rotate_gcode_for_contour(contour_id, CONTOURS_DIR / nc_asset.lstrip("/") if nc_asset else None)
\ No newline at end of file
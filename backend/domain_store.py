@@ -3,8 +3,13 @@ from pathlib import Path
 BASE_DIR = Path(__file__).resolve().parents[1]
 CONTOURS_DIR = BASE_DIR / "domain" / "contours"
 CONTOURS_GEOMETRY_DIR = CONTOURS_DIR / "geometry"
+CONTOURS_SVG_LOD_DIR = CONTOURS_DIR / "svg-lod"
+CONTOURS_INNER_CONTOUR_DIR = CONTOURS_DIR / "inner-contour"
+CONTOURS_OBJECTS_DIR = CONTOURS_DIR / "objects"
 GCODE_DIR = BASE_DIR / "domain" / "gcode"
 MANIFEST_PATH = CONTOURS_DIR / "manifest.json"
+CATALOG_DB_PATH = CONTOURS_DIR / "catalog.sqlite3"
+MANIFEST_CHANGES_PATH = CONTOURS_DIR / "manifest.changes.jsonl"
 START_GCODE_PATH = GCODE_DIR / "start_gcode.nc"
 END_GCODE_PATH = GCODE_DIR / "end_gcode.nc"
 
@@ -13,6 +18,18 @@ def contour_svg_path(contour_id: str) -> Path:
     return CONTOURS_DIR / "svg" / f"{contour_id}.svg"
 
 
+def contour_svg_lod_path(contour_id: str, digest: str, lod: int) -> Path:
+    return CONTOURS_SVG_LOD_DIR / contour_id / f"{digest}.lod{lod}.svg"
+
+
+def contour_inner_contour_path(contour_id: str, cache_key: str) -> Path:
+    return CONTOURS_INNER_CONTOUR_DIR / contour_id / f"{cache_key}.nc"
+
+
+def contour_object_path(digest: str, ext: str) -> Path:
+    return CONTOURS_OBJECTS_DIR / digest[:2] / f"{digest}.{ext}"
+
+
 def contour_nc_path(contour_id: str) -> Path:
     return CONTOURS_DIR / "nc" / f"{contour_id}.nc"
 
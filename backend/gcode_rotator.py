@@ -183,8 +183,8 @@ def generate_rectangle_gcode(x_start, y_start, width, height, z_depth, tool_dia,
     return lines  
 
 # Standalone функция для админки: ротация для контура по id
-def rotate_gcode_for_contour(contour_id):
-    nc_path = contour_nc_path(contour_id)
+def rotate_gcode_for_contour(contour_id, nc_path=None, target_dir=None):
+    nc_path = nc_path or contour_nc_path(contour_id)
     if not nc_path.exists():
         raise ValueError(f".nc file not found for {contour_id}")
     
@@ -198,7 +198,7 @@ def rotate_gcode_for_contour(contour_id):
         '270': generate_rotated_gcode(lines, 270)
     }
     
-    base_path = CONTOURS_DIR / "nc" / contour_id
+    base_path = target_dir or CONTOURS_DIR / "nc" / contour_id
     base_path.mkdir(parents=True, exist_ok=True)
     for rot, code in versions.items():
         # Меняем местами имена для 90 и 270 (без изменения генерации)
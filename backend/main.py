@@ -1,25 +1,38 @@
 import math
 
-from fastapi import APIRouter, FastAPI, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, BackgroundTasks, FastAPI, Header, HTTPException, Query
+from fastapi.responses import FileResponse, Response
 from fastapi.staticfiles import StaticFiles
 from admin_api.api import router as admin_router
-from domain_store import BASE_DIR, CONTOURS_DIR, MANIFEST_PATH
+from domain_store import BASE_DIR, CONTOURS_DIR, CONTOURS_OBJECTS_DIR
 from pydantic import BaseModel, ConfigDict, ValidationError, field_validator
-from typing import Any, List, Optional, Dict, Literal
+from typing import Any, Callable, Iterator, List, Optional, Dict, Literal
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from uuid import uuid4
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 import logging
+import asyncio
 import base64
 import binascii
 import shutil
 import os
 import json
 import fcntl
+import functools
+import time
 from services.gcode_engine import GCodeEngineError, build_final_gcode
+from services.order_context import OrderContext, build_order_context, snapshot_order_geometry
 from services.order_dxf import generate_order_layout_dxf, generate_order_layout_dxf_cad
+from services.order_svg import render_order_layout_svg
+from services.contour_svg_bundle import SVG_BUNDLE_MAX_IDS, get_svg_bundle, normalize_bundle_ids
+from services.contour_svg_lod import LOD_LEVELS, get_contour_svg_variant
+from services.catalog_search import search_catalog
+from services.manifest_changes import manifest_delta
+from services.content_encoding import negotiate_encoding
+from services.manifest_repository import get_manifest_snapshot
 from services.pricing import calculate_price_preview
 
 
@@ -30,6 +43,11 @@ admin_orders_router = APIRouter()
 logger = logging.getLogger(__name__)
 
 MAX_PRIMITIVES_PER_ORDER = 128
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+CATALOG_SEARCH_MAX_LIMIT = 1000
+EXPORT_STAGE_WORKERS = int(os.getenv("EXPORT_STAGE_WORKERS", "4"))
+EXPORT_STAGE_EXECUTOR = ThreadPoolExecutor(max_workers=EXPORT_STAGE_WORKERS, thread_name_prefix="export-stage")
 
 
 
@@ -275,6 +293,168 @@ def _artifact_path(order_dir: Path, order_number: str, ext: str) -> Path:
     return order_dir / f"{order_number}.{ext}"
 
 
+DEFERRED_ARTIFACT_EXTS = ("dxf", "png", "svg")
+LAYOUT_PREVIEW_KEYS = {
+    "png": ("layoutPng", "layout_png"),
+    "svg": ("layoutSvg", "layout_svg"),
+}
+
+
+@contextmanager
+def _order_artifacts_lock(order_dir: Path) -> Iterator[None]:
+    lock_file = order_dir / ".artifacts.lock"
+    with lock_file.open("a", encoding="utf-8") as lock_fp:
+        fcntl.flock(lock_fp.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_fp.fileno(), fcntl.LOCK_UN)
+
+
+def _write_bytes_atomic(file_path: Path, data: bytes) -> None:
+    with NamedTemporaryFile(
+        mode="wb",
+        dir=file_path.parent,
+        prefix=f".{file_path.name}.",
+        suffix=".tmp",
+        delete=False,
+    ) as temp_file:
+        temp_file.write(data)
+        temp_file.flush()
+        os.fsync(temp_file.fileno())
+        temp_path = Path(temp_file.name)
+
+    try:
+        os.replace(temp_path, file_path)
+    except Exception:
+        if temp_path.exists():
+            temp_path.unlink()
+        raise
+
+
+def _layout_preview_source(order_payload: Dict[str, Any], ext: str) -> Optional[str]:
+    for key in LAYOUT_PREVIEW_KEYS.get(ext, ()):
+        value = order_payload.get(key)
+        if isinstance(value, str) and value.strip():
+            return value
+    return None
+
+
+def _decode_layout_png(layout_png: str, order_id: str) -> bytes:
+    raw_png = layout_png.strip()
+    encoded_png = raw_png
+    if raw_png.startswith("data:image/png;base64,"):
+        encoded_png = raw_png.split(",", 1)[1]
+    try:
+        return base64.b64decode(encoded_png, validate=True)
+    except (ValueError, binascii.Error):
+        logger.warning("Failed to decode layoutPng as base64 for order %s", order_id)
+        return layout_png.encode("utf-8")
+
+
+def _order_geometry_snapshot(order_dir: Path) -> Optional[Dict[str, str]]:
+    # Orders placed before geometry snapshots existed fall back to the current catalog.
+    geometry = (_read_json_if_exists(order_dir / "meta.json") or {}).get("geometry")
+    return geometry if isinstance(geometry, dict) else None
+
+
+def _build_order_dxf_artifacts(order_dir: Path, order_number: str) -> None:
+    order_payload = _read_json_if_exists(order_dir / "order.json") or {}
+    order_data = ExportRequest.model_validate(order_payload)
+    order_context = build_order_context(order_data, _order_geometry_snapshot(order_dir))
+
+    timings: Dict[str, float] = {}
+    minimal_future = EXPORT_STAGE_EXECUTOR.submit(
+        _timed_stage, timings, "dxfMinimal", generate_order_layout_dxf, order_data, context=order_context
+    )
+    dxf_cad_content, missing_contours_cad = _timed_stage(
+        timings,
+        "dxfCad",
+        generate_order_layout_dxf_cad,
+        order_data,
+        include_texts=True,
+        context=order_context,
+    )
+    dxf_content, missing_contours = minimal_future.result()
+    # The CAD file is the readiness marker, so it is written last.
+    _write_bytes_atomic(order_dir / f"{order_number}_minimal.dxf", dxf_content.encode("utf-8"))
+    _write_bytes_atomic(_artifact_path(order_dir, order_number, "dxf"), dxf_cad_content.encode("utf-8"))
+
+    meta = _read_json_if_exists(order_dir / "meta.json") or {}
+    meta_timings = meta.get("timingsMs") if isinstance(meta.get("timingsMs"), dict) else {}
+    meta["timingsMs"] = {**meta_timings, **timings}
+    meta["dxf"] = {
+        "generated": len(missing_contours) == 0,
+        "missingContours": missing_contours,
+        "minimalFile": f"{order_number}_minimal.dxf",
+        "cadFile": f"{order_number}.dxf",
+        "cadGenerated": len(missing_contours_cad) == 0,
+        "cadMissingContours": missing_contours_cad,
+        "generatedAt": datetime.now(timezone.utc).isoformat(),
+        "catalogManifestVersion": order_context.manifest_version,
+    }
+    _write_json_atomic(order_dir / "meta.json", meta)
+
+
+def _render_order_svg(order_dir: Path, order_payload: Dict[str, Any]) -> str:
+    order_data = ExportRequest.model_validate(order_payload)
+    order_context = build_order_context(order_data, _order_geometry_snapshot(order_dir))
+    svg_content, missing_contours = render_order_layout_svg(order_data, context=order_context)
+    if missing_contours:
+        logger.warning("Layout SVG rendered without geometry for contours: %s", ", ".join(missing_contours))
+    return svg_content
+
+
+def _ensure_order_artifact(order_dir: Path, order_number: str, ext: str) -> bool:
+    """Materialize a deferred artifact in the order directory on first use.
+
+    Returns False when the order has nothing to build it from (e.g. no layout
+    preview was uploaded). Concurrent callers wait on the per-order lock and
+    reuse the cached file instead of generating it again.
+    """
+    artifact_path = _artifact_path(order_dir, order_number, ext)
+    if artifact_path.is_file():
+        return True
+    if ext not in DEFERRED_ARTIFACT_EXTS:
+        return False
+
+    with _order_artifacts_lock(order_dir):
+        if artifact_path.is_file():
+            return True
+
+        if ext == "dxf":
+            _build_order_dxf_artifacts(order_dir, order_number)
+            return True
+
+        order_payload = _read_json_if_exists(order_dir / "order.json") or {}
+        source = _layout_preview_source(order_payload, ext)
+        if source is None and ext == "svg" and order_payload:
+            _write_bytes_atomic(artifact_path, _render_order_svg(order_dir, order_payload).encode("utf-8"))
+            return True
+        if source is None:
+            return False
+
+        data = _decode_layout_png(source, order_dir.name) if ext == "png" else source.encode("utf-8")
+        _write_bytes_atomic(artifact_path, data)
+        return True
+
+
+def _order_artifact_available(order_dir: Path, order_number: str, ext: str, order_payload: Dict[str, Any]) -> bool:
+    if _artifact_path(order_dir, order_number, ext).is_file():
+        return True
+    if ext in ("dxf", "svg"):
+        return bool(order_payload)
+    return _layout_preview_source(order_payload, ext) is not None
+
+
+def _generate_deferred_artifacts(order_dir: Path, order_number: str) -> None:
+    for ext in DEFERRED_ARTIFACT_EXTS:
+        try:
+            _ensure_order_artifact(order_dir, order_number, ext)
+        except Exception:
+            logger.warning("Failed to generate %s artifact for order %s", ext, order_dir.name, exc_info=True)
+
+
 def _update_order_status(order_id: str, *, field: str, timestamp_field: str) -> Dict[str, Any]:
     order_dir = _order_dir(order_id)
     status_path = order_dir / "status.json"
@@ -336,40 +516,32 @@ def _order_preview_png_path(order_dir: Path, order_number: Optional[str]) -> Opt
     numbered_preview = order_dir / f"{order_number}.png"
     if numbered_preview.exists() and numbered_preview.is_file():
         return numbered_preview
+
+    if _ensure_order_artifact(order_dir, order_number, "png"):
+        return numbered_preview
     return None
 
 
 def _manifest_items_by_id() -> Dict[str, Dict[str, Any]]:
-    if not MANIFEST_PATH.exists():
-        return {}
-
     try:
-        with MANIFEST_PATH.open("r", encoding="utf-8") as manifest_file:
-            manifest = json.load(manifest_file)
+        snapshot = get_manifest_snapshot()
     except (OSError, json.JSONDecodeError):
         logger.warning("Failed to read manifest for order contents", exc_info=True)
         return {}
 
-    items = manifest.get("items")
-    if not isinstance(items, list):
-        return {}
-
-    indexed: Dict[str, Dict[str, Any]] = {}
-    for item in items:
-        if not isinstance(item, dict):
-            continue
-        item_id = item.get("id")
-        if isinstance(item_id, str) and item_id:
-            indexed[item_id] = item
-    return indexed
+    return snapshot.items_by_id if snapshot is not None else {}
 
 
-def _build_order_contents_snapshot(order_payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+def _build_order_contents_snapshot(
+    order_payload: Dict[str, Any],
+    manifest_items: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> List[Dict[str, Any]]:
     contours = order_payload.get("contours") if isinstance(order_payload, dict) else None
     if not isinstance(contours, list) or not contours:
         return []
 
-    manifest_items = _manifest_items_by_id()
+    if manifest_items is None:
+        manifest_items = _manifest_items_by_id()
     snapshot: List[Dict[str, Any]] = []
 
     for contour in contours:
@@ -439,135 +611,273 @@ def _build_order_contents(order_payload: Dict[str, Any]) -> List[Dict[str, str]]
     ]
 
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    # If-None-Match uses weak comparison, so W/"x" matches "x".
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+def _encoded_response(body_for: Callable[[str], bytes], media_type: str, headers: Dict[str, str], accept_encoding: Optional[str]) -> Response:
+    encoding = negotiate_encoding(accept_encoding)
+    if encoding is None:
+        return Response(body_for("identity"), media_type=media_type, headers=headers)
+    return Response(body_for(encoding), media_type=media_type, headers={**headers, "Content-Encoding": encoding})
+
+
 @public_router.get("/contours/manifest")
-def get_contours_manifest():
-    if not MANIFEST_PATH.exists():
+def get_contours_manifest(
+    since: Optional[int] = Query(None, ge=0),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+):
+    snapshot = get_manifest_snapshot()
+    if snapshot is None:
         return {"error": "manifest.json not found"}
+    if since is not None:
+        # Delta from the client's cached version; "full": true asks for a full reload.
+        return manifest_delta(snapshot, since)
+
+    headers = {
+        "ETag": snapshot.etag,
+        "Cache-Control": REVALIDATE_CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+    if _etag_matches(if_none_match, snapshot.etag):
+        return Response(status_code=304, headers=headers)
 
-    with MANIFEST_PATH.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    return _encoded_response(snapshot.encoded_body, "application/json", headers, accept_encoding)
 
 
-@public_router.post("/export-layment")
-async def export_layment(payload: Dict[str, Any]):
+def _timed_stage(timings: Dict[str, float], name: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    started = time.perf_counter()
     try:
-        order_data = ExportRequest.model_validate(payload)
-        validate_primitives_for_export(order_data)
-        price_preview = calculate_price_preview(order_data)
-        final_gcode = build_final_gcode(order_data)
-
-        manifest_version = None
-        if MANIFEST_PATH.exists():
-            with MANIFEST_PATH.open('r', encoding='utf-8') as manifest_file:
-                manifest_version = json.load(manifest_file).get('version')
+        return func(*args, **kwargs)
+    finally:
+        timings[name] = round((time.perf_counter() - started) * 1000, 3)
+
+
+async def _run_export_stage(timings: Dict[str, float], name: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        EXPORT_STAGE_EXECUTOR,
+        functools.partial(_timed_stage, timings, name, func, *args, **kwargs),
+    )
+
+
+def _persist_order(
+    payload: Dict[str, Any],
+    order_context: OrderContext,
+    price_preview: Dict[str, Any],
+    final_gcode: List[str],
+    timings: Dict[str, float],
+) -> Dict[str, Any]:
+    started = time.perf_counter()
+    order_id = uuid4().hex[:12]
+    orders_dir = _orders_dir()
+    orders_dir.mkdir(parents=True, exist_ok=True)
+    order_number = _allocate_next_order_number(orders_dir)
 
+    while (orders_dir / order_id).exists():
         order_id = uuid4().hex[:12]
-        orders_dir = _orders_dir()
-        orders_dir.mkdir(parents=True, exist_ok=True)
-        order_number = _allocate_next_order_number(orders_dir)
 
-        while (orders_dir / order_id).exists():
-            order_id = uuid4().hex[:12]
+    staging_dir = orders_dir / f".{order_id}.staging"
+    if staging_dir.exists():
+        shutil.rmtree(staging_dir)
+
+    final_order_dir = orders_dir / order_id
+
+    try:
+        staging_dir.mkdir(parents=True, exist_ok=False)
+
+        created_at = datetime.now(timezone.utc).isoformat()
 
-        staging_dir = orders_dir / f".{order_id}.staging"
+        stored_payload = dict(payload)
+        stored_payload["orderNumber"] = order_number
+        stored_payload["contentsSnapshot"] = _build_order_contents_snapshot(
+            stored_payload,
+            manifest_items=order_context.items_by_id,
+        )
+        stored_payload_order_meta = stored_payload.get("orderMeta")
+        if isinstance(stored_payload_order_meta, dict):
+            stored_payload_order_meta["pricePreview"] = price_preview
+
+        with (staging_dir / "order.json").open('w', encoding='utf-8') as order_file:
+            json.dump(stored_payload, order_file, ensure_ascii=False, indent=2)
+
+        meta = {
+            "timestamp": created_at,
+            "manifest": {
+                "version": order_context.manifest_version,
+            },
+            "orderNumber": order_number,
+        }
+        meta["pricePreview"] = price_preview
+        # DXF and preview files are produced after the response (see _ensure_order_artifact)
+        # from the geometry pinned here, not from whatever the catalog holds by then.
+        meta["geometry"] = snapshot_order_geometry(order_context)
+        meta["dxf"] = {
+            "deferred": True,
+            "minimalFile": f"{order_number}_minimal.dxf",
+            "cadFile": f"{order_number}.dxf",
+        }
+        status = {
+            "createdAt": created_at,
+            "confirmed": False,
+            "confirmedAt": None,
+            "produced": False,
+            "producedAt": None,
+        }
+
+        with (staging_dir / "status.json").open('w', encoding='utf-8') as status_file:
+            json.dump(status, status_file, ensure_ascii=False, indent=2)
+
+        with (staging_dir / f"{order_number}.nc").open('w', encoding='utf-8') as output_file:
+            output_file.write('\n'.join(final_gcode))
+
+        # meta.json is written last so it can carry the persist timing; only this write
+        # and the final rename are left out of it.
+        timings["persist"] = round((time.perf_counter() - started) * 1000, 3)
+        meta["timingsMs"] = dict(timings)
+        with (staging_dir / "meta.json").open('w', encoding='utf-8') as meta_file:
+            json.dump(meta, meta_file, ensure_ascii=False, indent=2)
+
+        os.replace(staging_dir, final_order_dir)
+    except Exception:
         if staging_dir.exists():
             shutil.rmtree(staging_dir)
+        raise
 
-        final_order_dir = orders_dir / order_id
+    return {
+        "orderId": order_id,
+        "orderNumber": order_number,
+        "createdAt": created_at,
+        "status": status,
+        "orderDir": final_order_dir,
+    }
 
-        try:
-            staging_dir.mkdir(parents=True, exist_ok=False)
-
-            created_at = datetime.now(timezone.utc).isoformat()
-
-            stored_payload = dict(payload)
-            stored_payload["orderNumber"] = order_number
-            stored_payload["contentsSnapshot"] = _build_order_contents_snapshot(stored_payload)
-            stored_payload_order_meta = stored_payload.get("orderMeta")
-            if isinstance(stored_payload_order_meta, dict):
-                stored_payload_order_meta["pricePreview"] = price_preview
-
-            with (staging_dir / "order.json").open('w', encoding='utf-8') as order_file:
-                json.dump(stored_payload, order_file, ensure_ascii=False, indent=2)
-
-            meta = {
-                "timestamp": created_at,
-                "manifest": {
-                    "version": manifest_version,
-                },
-                "orderNumber": order_number,
-            }
-            meta["pricePreview"] = price_preview
 
-            with (staging_dir / "meta.json").open('w', encoding='utf-8') as meta_file:
-                json.dump(meta, meta_file, ensure_ascii=False, indent=2)
+@public_router.get("/contours/search")
+def search_contours(
+    q: str = Query(..., min_length=1),
+    category: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=CATALOG_SEARCH_MAX_LIMIT),
+):
+    snapshot = get_manifest_snapshot()
+    if snapshot is None:
+        return {"error": "manifest.json not found"}
+    return search_catalog(snapshot, q, category=category, limit=limit)
 
-            status = {
-                "createdAt": created_at,
-                "confirmed": False,
-                "confirmedAt": None,
-                "produced": False,
-                "producedAt": None,
-            }
 
-            with (staging_dir / "status.json").open('w', encoding='utf-8') as status_file:
-                json.dump(status, status_file, ensure_ascii=False, indent=2)
-
-            with (staging_dir / f"{order_number}.nc").open('w', encoding='utf-8') as output_file:
-                output_file.write('\n'.join(final_gcode))
-
-            dxf_content, missing_contours = generate_order_layout_dxf(order_data)
-            dxf_cad_content, missing_contours_cad = generate_order_layout_dxf_cad(order_data, include_texts=True)
-            with (staging_dir / f"{order_number}_minimal.dxf").open('w', encoding='utf-8') as dxf_file:
-                dxf_file.write(dxf_content)
-            with (staging_dir / f"{order_number}.dxf").open('w', encoding='utf-8') as dxf_texts_file:
-                dxf_texts_file.write(dxf_cad_content)
-            meta["dxf"] = {
-                "generated": len(missing_contours) == 0,
-                "missingContours": missing_contours,
-                "minimalFile": f"{order_number}_minimal.dxf",
-                "cadFile": f"{order_number}.dxf",
-                "cadGenerated": len(missing_contours_cad) == 0,
-                "cadMissingContours": missing_contours_cad,
-            }
-            with (staging_dir / "meta.json").open('w', encoding='utf-8') as meta_file:
-                json.dump(meta, meta_file, ensure_ascii=False, indent=2)
-
-            raw_payload = payload
-
-            layout_svg = raw_payload.get("layoutSvg") or raw_payload.get("layout_svg")
-            if isinstance(layout_svg, str) and layout_svg.strip():
-                with (staging_dir / f"{order_number}.svg").open('w', encoding='utf-8') as svg_file:
-                    svg_file.write(layout_svg)
-
-            layout_png = raw_payload.get("layoutPng") or raw_payload.get("layout_png")
-            if isinstance(layout_png, str) and layout_png.strip():
-                raw_png = layout_png.strip()
-                encoded_png = raw_png
-                if raw_png.startswith("data:image/png;base64,"):
-                    encoded_png = raw_png.split(",", 1)[1]
-                try:
-                    png_bytes = base64.b64decode(encoded_png, validate=True)
-                    with (staging_dir / f"{order_number}.png").open('wb') as png_file:
-                        png_file.write(png_bytes)
-                except (ValueError, binascii.Error):
-                    logger.warning("Failed to decode layoutPng as base64 for order %s", order_id)
-                    with (staging_dir / f"{order_number}.png").open('w', encoding='utf-8') as png_file:
-                        png_file.write(layout_png)
-
-            os.replace(staging_dir, final_order_dir)
-        except Exception:
-            if staging_dir.exists():
-                shutil.rmtree(staging_dir)
-            raise
+class SvgBundleRequest(BaseModel):
+    ids: List[str]
+
+
+def _svg_bundle_response(
+    ids: List[str],
+    if_none_match: Optional[str],
+    accept_encoding: Optional[str],
+) -> Response:
+    bundle_ids = normalize_bundle_ids(ids)
+    if not bundle_ids:
+        raise HTTPException(status_code=422, detail="ids must not be empty")
+    if len(bundle_ids) > SVG_BUNDLE_MAX_IDS:
+        raise HTTPException(status_code=422, detail=f"At most {SVG_BUNDLE_MAX_IDS} ids per bundle")
+
+    snapshot = get_manifest_snapshot()
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="manifest.json not found")
+    bundle = get_svg_bundle(snapshot, bundle_ids)
+
+    headers = {
+        "ETag": bundle.etag,
+        "Cache-Control": REVALIDATE_CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+    if _etag_matches(if_none_match, bundle.etag):
+        return Response(status_code=304, headers=headers)
+    return _encoded_response(bundle.encoded_body, "application/json", headers, accept_encoding)
+
+
+@public_router.get("/contours/svg-bundle")
+def get_contour_svg_bundle(
+    ids: str = Query(..., min_length=1),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+):
+    return _svg_bundle_response(ids.split(","), if_none_match, accept_encoding)
+
+
+@public_router.post("/contours/svg-bundle")
+def post_contour_svg_bundle(
+    data: SvgBundleRequest,
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+):
+    return _svg_bundle_response(data.ids, if_none_match, accept_encoding)
+
+
+@public_router.get("/contours/{contour_id}/svg")
+def get_contour_svg(
+    contour_id: str,
+    lod: int = Query(0, ge=0),
+    v: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+):
+    if not contour_id or "/" in contour_id or "\\" in contour_id or contour_id.startswith("."):
+        raise HTTPException(status_code=404, detail="Contour not found")
+    if lod not in LOD_LEVELS:
+        raise HTTPException(status_code=422, detail=f"lod must be one of {sorted(LOD_LEVELS)}")
+
+    variant = get_contour_svg_variant(contour_id, lod)
+    if variant is None:
+        raise HTTPException(status_code=404, detail="Contour geometry not found")
+
+    etag = f'"{variant.digest}-lod{lod}"'
+    # Versioned URLs (?v=<digest>) never change content; bare URLs must revalidate.
+    headers = {
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if v == variant.digest else REVALIDATE_CACHE_CONTROL,
+    }
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(variant.path, media_type="image/svg+xml", headers=headers)
+
+
+@public_router.post("/export-layment")
+async def export_layment(payload: Dict[str, Any], background_tasks: BackgroundTasks):
+    try:
+        order_data = ExportRequest.model_validate(payload)
+        validate_primitives_for_export(order_data)
+
+        # Blocking stages run on the bounded export pool so the event loop stays free;
+        # pricing and G-code only depend on the resolved context and run side by side.
+        timings: Dict[str, float] = {}
+        order_context = await _run_export_stage(timings, "orderContext", build_order_context, order_data)
+        price_preview, final_gcode = await asyncio.gather(
+            _run_export_stage(timings, "pricing", calculate_price_preview, order_data, context=order_context),
+            _run_export_stage(timings, "gcode", build_final_gcode, order_data, context=order_context),
+        )
+        # _persist_order records the "persist" timing itself before writing meta.json.
+        persisted = await asyncio.get_running_loop().run_in_executor(
+            EXPORT_STAGE_EXECUTOR,
+            _persist_order,
+            payload,
+            order_context,
+            price_preview,
+            final_gcode,
+            timings,
+        )
 
         response: Dict[str, Any] = {
-            "orderId": order_id,
-            "orderNumber": order_number,
-            "createdAt": created_at,
-            "status": status,
+            "orderId": persisted["orderId"],
+            "orderNumber": persisted["orderNumber"],
+            "createdAt": persisted["createdAt"],
+            "status": persisted["status"],
         }
         response["pricePreview"] = price_preview
+        background_tasks.add_task(_generate_deferred_artifacts, persisted["orderDir"], persisted["orderNumber"])
         return response
     except HTTPException:
         raise
@@ -611,8 +921,10 @@ def get_order_status(order_id: str):
         "laymentThicknessMm": order_meta.get("laymentThicknessMm"),
     }
 
-    preview_path = _order_preview_png_path(order_dir, order_number)
-    response["previewPngUrl"] = f"/api/orders/{order_id}/preview.png" if preview_path else None
+    has_preview = bool(order_number) and _order_artifact_available(order_dir, order_number, "png", order_payload)
+    response["previewPngUrl"] = f"/api/orders/{order_id}/preview.png" if has_preview else None
+    has_svg_preview = bool(order_number) and _order_artifact_available(order_dir, order_number, "svg", order_payload)
+    response["previewSvgUrl"] = f"/api/orders/{order_id}/preview.svg" if has_svg_preview else None
 
     price_preview = meta.get("pricePreview")
     if isinstance(price_preview, dict):
@@ -635,6 +947,19 @@ def get_order_preview_png(order_id: str):
     return FileResponse(preview_path, media_type="image/png", filename="preview.png")
 
 
+@public_router.get("/orders/{order_id}/preview.svg")
+def get_order_preview_svg(order_id: str):
+    order_dir = _order_dir(order_id)
+    order_number = _read_order_number(order_dir)
+    if not order_number or not _ensure_order_artifact(order_dir, order_number, "svg"):
+        raise HTTPException(status_code=404, detail="preview.svg not found")
+    return FileResponse(
+        _artifact_path(order_dir, order_number, "svg"),
+        media_type="image/svg+xml",
+        filename="preview.svg",
+    )
+
+
 @admin_orders_router.get("/orders")
 def list_orders():
     orders_dir = _orders_dir()
@@ -663,7 +988,7 @@ def list_orders():
             "width": order_meta.get("width"),
             "height": order_meta.get("height"),
             "laymentThicknessMm": order_meta.get("laymentThicknessMm"),
-            "hasLayoutPng": (order_dir / f"{order_number}.png").exists() if order_number else False,
+            "hasLayoutPng": _order_artifact_available(order_dir, order_number, "png", order_payload) if order_number else False,
         })
 
     def sort_key(item: Dict[str, Any]) -> datetime:
@@ -700,9 +1025,9 @@ def get_order_details(order_id: str):
         "primitives": order_payload.get("primitives") or [],
         "files": {
             "gcodeNc": f"/admin/api/orders/{order_id}/artifacts/cnc.nc",
-            "previewPng": f"/admin/api/orders/{order_id}/artifacts/preview.png" if (order_dir / f"{order_number}.png").exists() else None,
-            "previewSvg": f"/admin/api/orders/{order_id}/artifacts/preview.svg" if (order_dir / f"{order_number}.svg").exists() else None,
-            "laserDxf": f"/admin/api/orders/{order_id}/artifacts/laser.dxf" if (order_dir / f"{order_number}.dxf").exists() else None,
+            "previewPng": f"/admin/api/orders/{order_id}/artifacts/preview.png" if _order_artifact_available(order_dir, order_number, "png", order_payload) else None,
+            "previewSvg": f"/admin/api/orders/{order_id}/artifacts/preview.svg" if _order_artifact_available(order_dir, order_number, "svg", order_payload) else None,
+            "laserDxf": f"/admin/api/orders/{order_id}/artifacts/laser.dxf" if _order_artifact_available(order_dir, order_number, "dxf", order_payload) else None,
         },
     }
 
@@ -741,6 +1066,11 @@ def _serve_order_number_artifact(order_id: str, ext: str, media_type: str, downl
     order_dir = _order_dir(order_id)
     order_number = _require_order_number(order_dir)
     artifact_path = _artifact_path(order_dir, order_number, ext)
+    try:
+        _ensure_order_artifact(order_dir, order_number, ext)
+    except Exception as exc:
+        logger.warning("Failed to generate %s artifact for order %s", ext, order_id, exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to generate {order_number}.{ext}") from exc
     if not artifact_path.exists() or not artifact_path.is_file():
         raise HTTPException(status_code=404, detail=f"{order_number}.{ext} not found")
     filename_ext = download_name_ext or ext
@@ -796,5 +1126,24 @@ app.include_router(public_router, prefix="/api")
 app.include_router(admin_router, prefix="/admin/api")
 app.include_router(admin_orders_router, prefix="/admin/api")
 
+class ImmutableStaticFiles(StaticFiles):
+    """Content-addressed files: a URL never changes content, so any cache may keep it forever."""
+
+    def file_response(self, *args, **kwargs) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+    async def check_config(self) -> None:
+        # objects/ is created by the first stored upload; until then every lookup is a 404.
+        if Path(self.directory).is_dir():
+            await super().check_config()
+
+
+app.mount(
+    "/contours/objects",
+    ImmutableStaticFiles(directory=str(CONTOURS_OBJECTS_DIR), check_dir=False),
+    name="contour-objects",
+)
 app.mount("/contours", StaticFiles(directory=str(CONTOURS_DIR)), name="contours")
 app.mount("/admin", StaticFiles(directory=str(BASE_DIR / "admin"), html=True), name="admin")
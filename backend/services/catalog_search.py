@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import heapq
+import re
+from bisect import bisect_left, insort
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from admin_api.id_utils import transliterate
+from services.manifest_changes import manifest_delta
+from services.manifest_repository import ManifestSnapshot
+
+# The catalog panel also matches pose variants and the category label, so those are indexed too.
+SEARCH_FIELDS = ("article", "name", "brand", "poseLabel", "poseKey")
+_TOKEN_SPLIT_RE = re.compile(r"[^a-z0-9]+")
+
+
+def search_tokens(text: str) -> List[str]:
+    """Latin, lowercase tokens; "Ключ 12,5" and "klyuch 12.5" both give ["klyuch", "12", "5"]."""
+    return [token for token in _TOKEN_SPLIT_RE.split(transliterate(text)) if token]
+
+
+def _category_label(snapshot: ManifestSnapshot, slug: Any) -> Optional[str]:
+    categories = snapshot.manifest.get("categories")
+    meta = categories.get(slug) if isinstance(categories, dict) and isinstance(slug, str) else None
+    label = meta.get("label") if isinstance(meta, dict) else None
+    return label if isinstance(label, str) else None
+
+
+def _item_tokens(item: Dict[str, Any], snapshot: ManifestSnapshot) -> Set[str]:
+    tokens: Set[str] = set()
+    for value in [*(item.get(field) for field in SEARCH_FIELDS), _category_label(snapshot, item.get("category"))]:
+        if isinstance(value, str):
+            tokens.update(search_tokens(value))
+    return tokens
+
+
+class CatalogSearchIndex:
+    """Inverted index token -> item ids over article, name, brand, pose and category label.
+
+    Tokens are also kept sorted, so a query token matches every indexed token
+    it is a prefix of with one bisect. The index follows manifest versions
+    through the change log and only rebuilds from scratch when the log
+    cannot bridge the gap.
+    """
+
+    def __init__(self) -> None:
+        self.snapshot: Optional[ManifestSnapshot] = None
+        self.postings: Dict[str, Set[str]] = {}
+        self.sorted_tokens: List[str] = []
+        self.item_tokens: Dict[str, Set[str]] = {}
+        self.lock = Lock()
+
+    def _add(self, item_id: str, tokens: Set[str]) -> None:
+        self.item_tokens[item_id] = tokens
+        for token in tokens:
+            posting = self.postings.get(token)
+            if posting is None:
+                self.postings[token] = {item_id}
+                insort(self.sorted_tokens, token)
+            else:
+                posting.add(item_id)
+
+    def _remove(self, item_id: str) -> None:
+        for token in self.item_tokens.pop(item_id, ()):
+            posting = self.postings.get(token)
+            if posting is None:
+                continue
+            posting.discard(item_id)
+            if not posting:
+                del self.postings[token]
+                index = bisect_left(self.sorted_tokens, token)
+                del self.sorted_tokens[index]
+
+    def _rebuild(self, snapshot: ManifestSnapshot) -> None:
+        self.item_tokens = {item_id: _item_tokens(item, snapshot) for item_id, item in snapshot.items_by_id.items()}
+        postings: Dict[str, Set[str]] = {}
+        for item_id, tokens in self.item_tokens.items():
+            for token in tokens:
+                postings.setdefault(token, set()).add(item_id)
+        self.postings = postings
+        self.sorted_tokens = sorted(postings)
+
+    def _apply(self, item_ids: Iterable[str], snapshot: ManifestSnapshot) -> None:
+        for item_id in item_ids:
+            self._remove(item_id)
+            item = snapshot.items_by_id.get(item_id)
+            if item is not None:
+                self._add(item_id, _item_tokens(item, snapshot))
+
+    def sync(self, snapshot: ManifestSnapshot) -> None:
+        if snapshot is self.snapshot:
+            return
+        previous = self.snapshot
+        delta = None
+        if previous is not None and previous.version != snapshot.version:
+            delta = manifest_delta(snapshot, previous.version)
+        if delta is None or delta["full"]:
+            self._rebuild(snapshot)
+        else:
+            changed = {item["id"] for item in delta["items"]["upsert"]}
+            changed.update(delta["items"]["remove"])
+            for slug in [*delta["categories"]["upsert"], *delta["categories"]["remove"]]:
+                changed.update(item["id"] for item in snapshot.items_by_category.get(slug, ()))
+            self._apply(changed, snapshot)
+        self.snapshot = snapshot
+
+    def _prefix_matches(self, prefix: str) -> Set[str]:
+        matches: Set[str] = set()
+        index = bisect_left(self.sorted_tokens, prefix)
+        while index < len(self.sorted_tokens) and self.sorted_tokens[index].startswith(prefix):
+            matches |= self.postings[self.sorted_tokens[index]]
+            index += 1
+        return matches
+
+    def search(self, query: str) -> Tuple[List[str], Set[str]]:
+        """Ids of items matching every query token as a prefix, and the exact-token hits."""
+        tokens = search_tokens(query)
+        if not tokens:
+            return [], set()
+        # Rarest prefix first keeps the intersections small.
+        candidates = sorted((self._prefix_matches(token) for token in tokens), key=len)
+        result = set(candidates[0])
+        for matches in candidates[1:]:
+            result &= matches
+            if not result:
+                break
+        exact = result.intersection(*(self.postings.get(token, ()) for token in tokens))
+        return list(result), exact
+
+
+_index = CatalogSearchIndex()
+
+
+def search_catalog(
+    snapshot: ManifestSnapshot,
+    query: str,
+    category: Optional[str] = None,
+    limit: int = 50,
+) -> Dict[str, Any]:
+    """Enabled items matching ``query``; whole-word matches first, then manifest order."""
+    with _index.lock:
+        _index.sync(snapshot)
+        item_ids, exact = _index.search(query)
+
+    items_by_id = snapshot.items_by_id
+    item_ids = [
+        item_id
+        for item_id in item_ids
+        if items_by_id[item_id].get("enabled")
+        and (category is None or items_by_id[item_id].get("category") == category)
+    ]
+    positions = snapshot.item_positions
+    top = heapq.nsmallest(limit, item_ids, key=lambda item_id: (item_id not in exact, positions[item_id]))
+
+    return {
+        "version": snapshot.version,
+        "total": len(item_ids),
+        "items": [_search_result(items_by_id[item_id]) for item_id in top],
+    }
+
+
+def _search_result(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": item["id"],
+        "article": item.get("article"),
+        "name": item.get("name"),
+        "brand": item.get("brand"),
+        "category": item.get("category"),
+        "poseKey": item.get("poseKey"),
+        "poseLabel": item.get("poseLabel"),
+    }
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import gzip
+from typing import Optional, Set, Tuple
+
+try:
+    import brotli
+except ImportError:  # optional: without it responses are served as gzip/identity only
+    brotli = None
+
+# Content codings we can produce, most preferred first.
+CONTENT_ENCODINGS: Tuple[str, ...] = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def encode_body(data: bytes, encoding: str) -> bytes:
+    if encoding == "identity":
+        return data
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(data)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def _accepted_encodings(accept_encoding: Optional[str]) -> Set[str]:
+    accepted = set()
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            accepted.add(coding)
+    return accepted
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Best coding from CONTENT_ENCODINGS the client accepts; None means identity."""
+    accepted = _accepted_encodings(accept_encoding)
+    encoding = next((coding for coding in CONTENT_ENCODINGS if coding in accepted), None)
+    if encoding is None and "*" in accepted:
+        encoding = CONTENT_ENCODINGS[0]
+    return encoding
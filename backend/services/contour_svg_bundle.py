@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from threading import Lock, RLock
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from domain_store import CONTOURS_DIR, contour_svg_path
+from services.content_encoding import encode_body
+from services.manifest_repository import ManifestSnapshot
+
+SVG_BUNDLE_MAX_IDS = 500
+# Recently served bundles; a layout restored on several tabs hits the same one.
+SVG_BUNDLE_CACHE_SIZE = 32
+
+_bundles: "OrderedDict[str, SvgBundle]" = OrderedDict()
+_bundles_lock = Lock()
+
+
+@dataclass(frozen=True)
+class SvgBundle:
+    """SVG documents of several contours as one JSON body, built for one manifest version."""
+
+    etag: str
+    version: Any
+    ids: Tuple[str, ...]
+    paths: Tuple[Tuple[str, Optional[str]], ...]
+    _bodies: Dict[str, bytes] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _bodies_lock: RLock = field(default_factory=RLock, init=False, repr=False, compare=False)
+
+    def encoded_body(self, encoding: str) -> bytes:
+        """Body in ``identity``/``gzip``/``br``, each produced at most once."""
+        body = self._bodies.get(encoding)
+        if body is not None:
+            return body
+        with self._bodies_lock:
+            body = self._bodies.get(encoding)
+            if body is None:
+                if encoding == "identity":
+                    body = self._render()
+                else:
+                    body = encode_body(self.encoded_body("identity"), encoding)
+                self._bodies[encoding] = body
+        return body
+
+    def _render(self) -> bytes:
+        svgs: Dict[str, str] = {}
+        assets: Dict[str, str] = {}
+        missing: List[str] = []
+        for contour_id, relative in self.paths:
+            text = None
+            if relative is not None:
+                try:
+                    text = (CONTOURS_DIR / relative).read_text(encoding="utf-8")
+                except (OSError, UnicodeDecodeError):
+                    text = None
+            if text is None:
+                missing.append(contour_id)
+            else:
+                svgs[contour_id] = text
+                assets[contour_id] = relative
+        # assets: the /contours/<path> each SVG is also served from, so clients can key their cache by URL.
+        payload = {"version": self.version, "svgs": svgs, "assets": assets, "missing": missing}
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _svg_asset_path(snapshot: ManifestSnapshot, contour_id: str) -> Optional[str]:
+    """Path of the contour SVG relative to CONTOURS_DIR, as served under /contours."""
+    item = snapshot.items_by_id.get(contour_id)
+    if item is None:
+        return None
+    asset = ((item.get("assets") or {}).get("svg") or "").lstrip("/")
+    if not asset:
+        return contour_svg_path(contour_id).relative_to(CONTOURS_DIR).as_posix()
+    resolved = (CONTOURS_DIR / asset).resolve()
+    if not resolved.is_relative_to(CONTOURS_DIR.resolve()):
+        return None
+    return asset
+
+
+def normalize_bundle_ids(ids: Iterable[str]) -> Tuple[str, ...]:
+    """Unique, non-empty ids in sorted order, so equal sets share one bundle and ETag."""
+    return tuple(sorted({contour_id.strip() for contour_id in ids if contour_id and contour_id.strip()}))
+
+
+def get_svg_bundle(snapshot: ManifestSnapshot, ids: Tuple[str, ...]) -> SvgBundle:
+    """Bundle for ``ids`` (see normalize_bundle_ids) at the snapshot's manifest version.
+
+    The ETag is the manifest version plus a hash of the id set: uploads that
+    replace an SVG bump the version, so a changed file never keeps its ETag.
+    """
+    ids_digest = hashlib.sha256("\n".join(ids).encode("utf-8")).hexdigest()[:12]
+    etag = f'"svg-bundle-v{snapshot.version}-{ids_digest}"'
+
+    with _bundles_lock:
+        bundle = _bundles.get(etag)
+        if bundle is not None:
+            _bundles.move_to_end(etag)
+            return bundle
+
+    bundle = SvgBundle(
+        etag=etag,
+        version=snapshot.version,
+        ids=ids,
+        paths=tuple((contour_id, _svg_asset_path(snapshot, contour_id)) for contour_id in ids),
+    )
+    with _bundles_lock:
+        bundle = _bundles.setdefault(etag, bundle)
+        _bundles.move_to_end(etag)
+        while len(_bundles) > SVG_BUNDLE_CACHE_SIZE:
+            _bundles.popitem(last=False)
+    return bundle
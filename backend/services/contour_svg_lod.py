@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import hashlib
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from admin_api.dxf_to_svg import EPS, bulge_to_arc
+from domain_store import contour_geometry_path, contour_svg_lod_path
+from services.atomic_files import write_text_atomic
+from services.order_dxf import load_contour_geometry
+
+
+@dataclass(frozen=True)
+class LodLevel:
+    tolerance_mm: float
+    precision: int
+
+
+# lod=0 is full detail; higher levels trade accuracy for size/parse time.
+LOD_LEVELS: Dict[int, LodLevel] = {
+    0: LodLevel(tolerance_mm=0.0, precision=3),
+    1: LodLevel(tolerance_mm=0.1, precision=2),
+    2: LodLevel(tolerance_mm=0.5, precision=1),
+    3: LodLevel(tolerance_mm=1.5, precision=1),
+}
+
+_digest_cache: Dict[str, Tuple[int, str]] = {}
+_digest_cache_lock = Lock()
+
+
+@dataclass(frozen=True)
+class ContourSvgVariant:
+    path: Path
+    digest: str
+    lod: int
+
+
+def geometry_digest(contour_id: str) -> Optional[str]:
+    """Short content hash of the contour geometry JSON, memoized by mtime."""
+    geometry_path = contour_geometry_path(contour_id)
+    try:
+        mtime_ns = geometry_path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+    with _digest_cache_lock:
+        cached = _digest_cache.get(contour_id)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    digest = hashlib.sha256(geometry_path.read_bytes()).hexdigest()[:16]
+    with _digest_cache_lock:
+        _digest_cache[contour_id] = (mtime_ns, digest)
+    return digest
+
+
+def _perpendicular_distance(point: Dict[str, float], start: Dict[str, float], end: Dict[str, float]) -> float:
+    dx = end["x"] - start["x"]
+    dy = end["y"] - start["y"]
+    length = math.hypot(dx, dy)
+    if length <= EPS:
+        return math.hypot(point["x"] - start["x"], point["y"] - start["y"])
+    return abs(dy * point["x"] - dx * point["y"] + end["x"] * start["y"] - end["y"] * start["x"]) / length
+
+
+def _simplify_chain(chain: List[Dict[str, float]], tolerance: float) -> List[Dict[str, float]]:
+    """Douglas-Peucker over a run of straight edges; both endpoints are kept."""
+    if len(chain) <= 2:
+        return chain
+
+    keep = [False] * len(chain)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(chain) - 1)]
+    while stack:
+        first, last = stack.pop()
+        max_distance = 0.0
+        max_index = -1
+        for index in range(first + 1, last):
+            distance = _perpendicular_distance(chain[index], chain[first], chain[last])
+            if distance > max_distance:
+                max_distance = distance
+                max_index = index
+        if max_index != -1 and max_distance > tolerance:
+            keep[max_index] = True
+            stack.append((first, max_index))
+            stack.append((max_index, last))
+
+    return [vertex for vertex, kept in zip(chain, keep) if kept]
+
+
+def simplify_vertices(vertices: List[Dict[str, float]], tolerance: float) -> List[Dict[str, float]]:
+    """Drop straight-edge vertices within ``tolerance`` mm; arc endpoints are preserved."""
+    count = len(vertices)
+    if tolerance <= 0 or count <= 3:
+        return vertices
+
+    anchors = [
+        index
+        for index in range(count)
+        if abs(vertices[index].get("bulge", 0.0)) > EPS or abs(vertices[index - 1].get("bulge", 0.0)) > EPS
+    ]
+    if not anchors:
+        far_index = max(
+            range(count),
+            key=lambda index: math.hypot(vertices[index]["x"] - vertices[0]["x"], vertices[index]["y"] - vertices[0]["y"]),
+        )
+        anchors = sorted({0, far_index})
+
+    simplified: List[Dict[str, float]] = []
+    for position, anchor in enumerate(anchors):
+        next_anchor = anchors[(position + 1) % len(anchors)]
+        span = (next_anchor - anchor) % count or count
+        chain = [vertices[(anchor + offset) % count] for offset in range(span + 1)]
+        simplified.extend(_simplify_chain(chain, tolerance)[:-1])
+
+    return simplified if len(simplified) >= 3 else vertices
+
+
+def _fmt(value: float, precision: int) -> str:
+    text = f"{value:.{precision}f}"
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    return text if text and text != "-0" else "0"
+
+
+def _loop_commands(vertices: List[Dict[str, float]], level: LodLevel) -> List[str]:
+    points = simplify_vertices(vertices, level.tolerance_mm)
+    precision = level.precision
+
+    commands = [f"M{_fmt(points[0]['x'], precision)} {_fmt(points[0]['y'], precision)}"]
+    for index, start in enumerate(points):
+        end = points[(index + 1) % len(points)]
+        end_xy = f"{_fmt(end['x'], precision)} {_fmt(end['y'], precision)}"
+        if abs(start.get("bulge", 0.0)) < EPS:
+            commands.append(f"L{end_xy}")
+            continue
+        arc = bulge_to_arc((start["x"], start["y"]), (end["x"], end["y"]), start["bulge"])
+        radius = _fmt(arc["r"], precision)
+        commands.append(f"A{radius} {radius} 0 {arc['large']} {arc['sweep']} {end_xy}")
+    commands.append("Z")
+    return commands
+
+
+def render_contour_svg(loops: List[List[Dict[str, float]]], width: float, height: float, level: LodLevel) -> str:
+    precision = level.precision
+    commands = [command for loop in loops for command in _loop_commands(loop, level)]
+
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg"'
+        f' viewBox="0 0 {_fmt(width, precision)} {_fmt(height, precision)}">'
+        f'<path d="{"".join(commands)}" fill="none" fill-rule="evenodd" stroke="black"/></svg>\n'
+    )
+
+
+def get_contour_svg_variant(contour_id: str, lod: int) -> Optional[ContourSvgVariant]:
+    """Return the on-disk SVG for (contour, lod), building it on first request.
+
+    Variants are named by geometry digest, so a re-uploaded geometry simply
+    produces new files and stale ones are never served.
+    """
+    level = LOD_LEVELS[lod]
+    digest = geometry_digest(contour_id)
+    if digest is None:
+        return None
+
+    variant_path = contour_svg_lod_path(contour_id, digest, lod)
+    if not variant_path.is_file():
+        geometry = load_contour_geometry(contour_id)
+        if geometry is None:
+            return None
+        width, height, loops = geometry
+        write_text_atomic(variant_path, render_contour_svg(loops, width, height, level))
+
+    return ContourSvgVariant(path=variant_path, digest=digest, lod=lod)
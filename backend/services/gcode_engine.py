@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, List
+from typing import TYPE_CHECKING, Any, List, Optional
 
 from domain_store import contour_rotated_nc_path, end_gcode_path, start_gcode_path
 from gcode_rotator import generate_rectangle_gcode, offset_gcode
 
+if TYPE_CHECKING:
+    from services.order_context import OrderContext
+
 
 @dataclass
 class GCodeEngineError(Exception):
@@ -68,10 +71,13 @@ def _format_primitive_comment(primitive_index: int, primitive: Any) -> str:
     return f"' PRIMITIVE #{primitive_index} type={primitive_type}"
 
 
-def load_rotated_fragment(contour_id: str, angle: float) -> List[str]:
+def rotation_key(angle: float) -> str:
     rot_value = int(angle) if float(angle).is_integer() else angle
-    rot = str(rot_value)
-    nc_path = contour_rotated_nc_path(contour_id, rot)
+    return str(rot_value)
+
+
+def load_rotated_fragment(contour_id: str, angle: float) -> List[str]:
+    nc_path = contour_rotated_nc_path(contour_id, rotation_key(angle))
 
     if not nc_path.exists():
         raise GCodeEngineError(
@@ -211,7 +217,7 @@ def generate_circle_pocket_gcode(
     return lines
 
 
-def build_final_gcode(order_data) -> List[str]:
+def build_final_gcode(order_data, context: Optional["OrderContext"] = None) -> List[str]:
     final_gcode = _load_gcode_template(start_gcode_path, DEFAULT_START_GCODE)
 
     width = order_data.orderMeta.width
@@ -229,7 +235,10 @@ def build_final_gcode(order_data) -> List[str]:
         # TODO: apply future contour depth seam on backend:
         # effectiveDepthMm = basePocketDepthMm + depthOverrideMm.
         final_gcode.append(_format_contour_comment(contour.id, contour.angle))
-        contour_lines = load_rotated_fragment(contour.id, contour.angle)
+        if context is not None:
+            contour_lines = context.rotated_fragment(contour.id, contour.angle)
+        else:
+            contour_lines = load_rotated_fragment(contour.id, contour.angle)
         cnc_x, cnc_y = contour.y, contour.x  # приведение системы координат фронтенда к координатам станка
         offset_contour_gcode = apply_offset(contour_lines, cnc_x, cnc_y)
 
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Optional
+
+from admin_api.geometry_inner_contour_cli import (
+    TOOLPATH_CHORD_TOLERANCE_MM,
+    VALIDATION_CHORD_TOLERANCE_MM,
+    CliConfig,
+    GeometryInnerContourError,
+    generate_inner_contour_nc,
+)
+from domain_store import contour_geometry_path, contour_inner_contour_path
+from services.atomic_files import write_text_atomic
+from services.contour_svg_lod import geometry_digest
+
+
+@dataclass(frozen=True)
+class InnerContourResult:
+    contour_id: str
+    cache_key: str
+    nc_text: str
+    cached: bool
+
+
+def _format_param(value: float) -> str:
+    return repr(float(value))
+
+
+def inner_contour_cache_key(
+    digest: str,
+    tool_diameter: float,
+    z_depth: float,
+    feed: float,
+    chord_tolerance: float = TOOLPATH_CHORD_TOLERANCE_MM,
+    validation_tolerance: float = VALIDATION_CHORD_TOLERANCE_MM,
+    stepover: Optional[float] = None,
+) -> str:
+    """Stable key for (geometry content, tool parameters); unchanged re-uploads keep the key."""
+    params = [tool_diameter, z_depth, feed, chord_tolerance, validation_tolerance]
+    if stepover is not None:
+        # Single-pass keys stay as they were before pocketing existed.
+        params.append(stepover)
+    raw = "|".join([digest, *(_format_param(value) for value in params)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def generate_inner_contour(
+    contour_id: str,
+    tool_diameter: float,
+    z_depth: float,
+    feed: float,
+    stepover: Optional[float] = None,
+) -> Optional[InnerContourResult]:
+    """Inner-contour toolpath for a catalog item, generated in-process and cached on disk.
+
+    With ``stepover`` (fraction of the tool diameter) the whole pocket is cleared
+    instead of a single pass along the wall. Returns None when the item has no geometry; raises GeometryInnerContourError when
+    the toolpath cannot be built.
+    """
+    digest = geometry_digest(contour_id)
+    if digest is None:
+        return None
+
+    cache_key = inner_contour_cache_key(digest, tool_diameter, z_depth, feed, stepover=stepover)
+    cache_path = contour_inner_contour_path(contour_id, cache_key)
+    if cache_path.is_file():
+        return InnerContourResult(
+            contour_id=contour_id,
+            cache_key=cache_key,
+            nc_text=cache_path.read_text(encoding="utf-8"),
+            cached=True,
+        )
+
+    geometry_path = contour_geometry_path(contour_id)
+    try:
+        with geometry_path.open("r", encoding="utf-8") as geometry_file:
+            geometry = json.load(geometry_file)
+    except FileNotFoundError:
+        return None
+    except json.JSONDecodeError as exc:
+        raise GeometryInnerContourError("Input geometry JSON is not valid JSON", str(exc)) from exc
+
+    nc_text = generate_inner_contour_nc(
+        geometry,
+        CliConfig(
+            input_path=geometry_path,
+            output_path=cache_path,
+            z_depth=float(z_depth),
+            feed=float(feed),
+            tool_diameter=float(tool_diameter),
+            stepover=float(stepover) if stepover is not None else None,
+        ),
+    )
+    write_text_atomic(cache_path, nc_text)
+    return InnerContourResult(contour_id=contour_id, cache_key=cache_key, nc_text=nc_text, cached=False)
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import json
+import os
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from domain_store import MANIFEST_CHANGES_PATH
+from services.atomic_files import write_text_atomic
+from services.manifest_repository import FileStamp, ManifestSnapshot, file_stamp
+
+# Deltas older than this many versions answer "full": true.
+MAX_CHANGE_LOG_ENTRIES = 500
+
+_log_cache: Optional[Tuple[FileStamp, Dict[Any, Dict[str, Any]]]] = None
+_log_cache_lock = Lock()
+
+
+def _keyed_items(manifest: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    return {
+        item["id"]: item
+        for item in manifest.get("items") or []
+        if isinstance(item, dict) and isinstance(item.get("id"), str)
+    }
+
+
+def diff_manifests(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Change-log entry turning ``old`` into ``new``.
+
+    Items are keyed by id and categories by slug; any other top-level key
+    (``sets`` and the like) that changed is carried whole in ``replace``.
+    """
+    old_items = _keyed_items(old)
+    new_items = _keyed_items(new)
+    old_categories = old.get("categories") if isinstance(old.get("categories"), dict) else {}
+    new_categories = new.get("categories") if isinstance(new.get("categories"), dict) else {}
+
+    replace = {
+        key: new[key]
+        for key in new.keys() | old.keys()
+        if key not in ("version", "items", "categories") and key in new and new[key] != old.get(key)
+    }
+    return {
+        "version": new.get("version"),
+        "from": old.get("version"),
+        "items": {
+            "upsert": [item for item_id, item in new_items.items() if old_items.get(item_id) != item],
+            "remove": [item_id for item_id in old_items if item_id not in new_items],
+        },
+        "categories": {
+            "upsert": {slug: meta for slug, meta in new_categories.items() if old_categories.get(slug) != meta},
+            "remove": [slug for slug in old_categories if slug not in new_categories],
+        },
+        "replace": replace,
+        "dropped": [key for key in old.keys() if key not in new and key not in ("items", "categories")],
+    }
+
+
+def record_manifest_change(old: Optional[ManifestSnapshot], new_manifest: Dict[str, Any]) -> None:
+    """Append the delta from ``old`` to ``new_manifest`` to the change log.
+
+    Called by ``save_manifest_atomic`` under the manifest lock, after the new
+    file is in place: a crash in between only loses the entry, which readers
+    see as a gap and answer with a full reload.
+    """
+    if old is None or old.version == new_manifest.get("version"):
+        return
+    entry = diff_manifests(old.manifest, new_manifest)
+    MANIFEST_CHANGES_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with MANIFEST_CHANGES_PATH.open("a", encoding="utf-8") as log_file:
+        before = file_stamp(os.fstat(log_file.fileno()))
+        log_file.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+        log_file.flush()
+        after = file_stamp(os.fstat(log_file.fileno()))
+
+    entries = _extend_cached_log(before, after, entry)
+    if entries is None:
+        # Another process appended since we last read the log.
+        entries = _entries_by_from_version()
+    if len(entries) > 2 * MAX_CHANGE_LOG_ENTRIES:
+        lines = MANIFEST_CHANGES_PATH.read_text(encoding="utf-8").splitlines(keepends=True)
+        write_text_atomic(MANIFEST_CHANGES_PATH, "".join(lines[-MAX_CHANGE_LOG_ENTRIES:]))
+
+
+def _extend_cached_log(
+    before: FileStamp, after: FileStamp, entry: Dict[str, Any]
+) -> Optional[Dict[Any, Dict[str, Any]]]:
+    """Add our own append to the cached log; None when the cache is not of the pre-append file."""
+    global _log_cache
+
+    with _log_cache_lock:
+        cached = _log_cache
+        if cached is None or cached[0] != before:
+            return None
+        # Copy, not mutate: readers may be walking the previous dict.
+        entries = {**cached[1], entry.get("from"): entry}
+        _log_cache = (after, entries)
+    return entries
+
+
+def _entries_by_from_version() -> Dict[Any, Dict[str, Any]]:
+    global _log_cache
+
+    try:
+        with MANIFEST_CHANGES_PATH.open("r", encoding="utf-8") as log_file:
+            stamp = file_stamp(os.fstat(log_file.fileno()))
+            cached = _log_cache
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+            entries: Dict[Any, Dict[str, Any]] = {}
+            for line in log_file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn last line from a crash mid-append.
+                    continue
+                entries[entry.get("from")] = entry
+    except FileNotFoundError:
+        return {}
+    with _log_cache_lock:
+        _log_cache = (stamp, entries)
+    return entries
+
+
+def manifest_delta(snapshot: ManifestSnapshot, since: int) -> Dict[str, Any]:
+    """Changes between version ``since`` and ``snapshot``, merged into one delta.
+
+    ``full: true`` means the log cannot bridge the gap and the client has to
+    download the whole manifest.
+    """
+    current = snapshot.version
+    delta: Dict[str, Any] = {"version": current, "since": since, "full": False}
+
+    entries = _entries_by_from_version()
+    chain: List[Dict[str, Any]] = []
+    version = since
+    while version != current:
+        entry = entries.get(version)
+        if entry is None or len(chain) > MAX_CHANGE_LOG_ENTRIES * 2:
+            return {**delta, "full": True}
+        chain.append(entry)
+        version = entry.get("version")
+
+    items: Dict[str, Dict[str, Any]] = {}
+    removed_items: set = set()
+    categories: Dict[str, Any] = {}
+    removed_categories: set = set()
+    replace: Dict[str, Any] = {}
+    dropped: set = set()
+    for entry in chain:
+        for item in entry["items"]["upsert"]:
+            items[item["id"]] = item
+            removed_items.discard(item["id"])
+        for item_id in entry["items"]["remove"]:
+            items.pop(item_id, None)
+            removed_items.add(item_id)
+        for slug, meta in entry["categories"]["upsert"].items():
+            categories[slug] = meta
+            removed_categories.discard(slug)
+        for slug in entry["categories"]["remove"]:
+            categories.pop(slug, None)
+            removed_categories.add(slug)
+        for key, value in entry.get("replace", {}).items():
+            replace[key] = value
+            dropped.discard(key)
+        for key in entry.get("dropped", []):
+            replace.pop(key, None)
+            dropped.add(key)
+
+    return {
+        **delta,
+        "items": {
+            "upsert": list(items.values()),
+            "remove": sorted(removed_items),
+        },
+        "categories": {"upsert": categories, "remove": sorted(removed_categories)},
+        "replace": replace,
+        "dropped": sorted(dropped),
+    }
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from functools import cached_property
+from threading import Lock, RLock
+from typing import Any, Dict, Optional, Tuple
+
+from domain_store import MANIFEST_PATH
+from services.content_encoding import encode_body
+
+# (st_mtime_ns, st_size, st_ino): save_manifest_atomic replaces the file, so every
+# write changes the inode even when it lands within the same mtime tick.
+FileStamp = Tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class ManifestSnapshot:
+    """One parsed version of manifest.json plus the indexes built from it.
+
+    Snapshots are shared between requests and threads: treat ``manifest``, the
+    items and the indexes as read-only. Code that edits the catalog works on
+    ``mutable_copy()`` and publishes it through ``save_manifest_atomic``.
+    """
+
+    text: str
+    stamp: FileStamp
+    manifest: Dict[str, Any]
+    items_by_id: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Index of each item in manifest["items"]; stable keyset for pagination.
+    item_positions: Dict[str, int] = field(default_factory=dict)
+    items_by_category: Dict[str, Tuple[Dict[str, Any], ...]] = field(default_factory=dict)
+    cutting_lengths: Dict[str, float] = field(default_factory=dict)
+    _bodies: Dict[str, bytes] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _bodies_lock: RLock = field(default_factory=RLock, init=False, repr=False, compare=False)
+
+    @property
+    def version(self) -> Any:
+        return self.manifest.get("version")
+
+    @cached_property
+    def etag(self) -> str:
+        """Strong ETag for the served manifest body.
+
+        The version is the primary key; the digest covers hand edits of
+        manifest.json that forgot to bump it.
+        """
+        digest = hashlib.sha256(self.encoded_body("identity")).hexdigest()[:12]
+        return f'"manifest-v{self.version}-{digest}"'
+
+    def encoded_body(self, encoding: str) -> bytes:
+        """Compact JSON body in ``identity``, ``gzip`` or ``br`` encoding.
+
+        Each variant is produced once per snapshot, i.e. once per manifest
+        version, and then shared by every request.
+        """
+        body = self._bodies.get(encoding)
+        if body is not None:
+            return body
+        with self._bodies_lock:
+            body = self._bodies.get(encoding)
+            if body is None:
+                body = _encode_body(self, encoding)
+                self._bodies[encoding] = body
+        return body
+
+    def mutable_copy(self) -> Dict[str, Any]:
+        # Re-parsing the cached text is cheaper than deepcopy and needs no disk read.
+        return _normalize_manifest(json.loads(self.text))
+
+
+_snapshot: Optional[ManifestSnapshot] = None
+_snapshot_lock = Lock()
+
+
+def _normalize_manifest(manifest: Dict[str, Any]) -> Dict[str, Any]:
+    if not isinstance(manifest.get("items"), list):
+        manifest["items"] = []
+    if "sets" in manifest and not isinstance(manifest.get("sets"), list):
+        manifest.pop("sets", None)
+    return manifest
+
+
+def _encode_body(snapshot: ManifestSnapshot, encoding: str) -> bytes:
+    if encoding == "identity":
+        # Same bytes JSONResponse produced for this endpoint before.
+        return json.dumps(
+            snapshot.manifest, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+    return encode_body(snapshot.encoded_body("identity"), encoding)
+
+
+def file_stamp(stat_result: os.stat_result) -> FileStamp:
+    return stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino
+
+
+def _build_snapshot(text: str, stamp: FileStamp) -> ManifestSnapshot:
+    manifest = _normalize_manifest(json.loads(text))
+
+    items_by_id: Dict[str, Dict[str, Any]] = {}
+    item_positions: Dict[str, int] = {}
+    by_category: Dict[str, list] = {}
+    cutting_lengths: Dict[str, float] = {}
+    for position, item in enumerate(manifest["items"]):
+        if not isinstance(item, dict):
+            continue
+        item_id = item.get("id")
+        if not isinstance(item_id, str) or not item_id:
+            continue
+        items_by_id[item_id] = item
+        item_positions[item_id] = position
+        by_category.setdefault(item.get("category") or "", []).append(item)
+        try:
+            cutting_lengths[item_id] = float(item.get("cuttingLengthMeters", 0) or 0)
+        except (TypeError, ValueError):
+            cutting_lengths[item_id] = 0.0
+
+    return ManifestSnapshot(
+        text=text,
+        stamp=stamp,
+        manifest=manifest,
+        items_by_id=items_by_id,
+        item_positions=item_positions,
+        items_by_category={category: tuple(items) for category, items in by_category.items()},
+        cutting_lengths=cutting_lengths,
+    )
+
+
+def get_manifest_snapshot() -> Optional[ManifestSnapshot]:
+    """Current manifest snapshot, re-parsed only when the file changed on disk.
+
+    Returns None when manifest.json does not exist; invalid JSON raises
+    json.JSONDecodeError as a direct read would.
+    """
+    global _snapshot
+
+    try:
+        stamp = file_stamp(MANIFEST_PATH.stat())
+    except FileNotFoundError:
+        return None
+
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.stamp == stamp:
+        return snapshot
+
+    with _snapshot_lock:
+        snapshot = _snapshot
+        if snapshot is not None and snapshot.stamp == stamp:
+            return snapshot
+        with MANIFEST_PATH.open("r", encoding="utf-8") as manifest_file:
+            stamp = file_stamp(os.fstat(manifest_file.fileno()))
+            text = manifest_file.read()
+        snapshot = _build_snapshot(text, stamp)
+        _snapshot = snapshot
+        return snapshot
+
+
+def publish_manifest_text(text: str, stamp: FileStamp) -> ManifestSnapshot:
+    """Install the snapshot for text this process just wrote to MANIFEST_PATH.
+
+    ``stamp`` comes from the temporary file before the rename, so a concurrent
+    writer in another process can never be paired with this text.
+    """
+    global _snapshot
+
+    snapshot = _build_snapshot(text, stamp)
+    with _snapshot_lock:
+        _snapshot = snapshot
+    return snapshot
+
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import json
+
+from admin_api.object_store import is_object_asset, object_exists
+from domain_store import CONTOURS_DIR, contour_object_path
+from services.atomic_files import write_text_atomic
+from services.gcode_engine import GCodeEngineError, load_rotated_fragment, rotation_key
+from services.manifest_repository import get_manifest_snapshot
+from services.order_dxf import ContourGeometry, load_contour_geometry
+
+MAX_ASSET_READ_WORKERS = 8
+
+FragmentKey = Tuple[str, str]
+
+
+def fragment_key(contour_id: str, angle: float) -> FragmentKey:
+    return contour_id, rotation_key(angle)
+
+
+@dataclass(frozen=True)
+class OrderContext:
+    """Catalog assets resolved once for a single export.
+
+    Pricing, G-code and DXF generation read the manifest, rotated NC fragments
+    and contour geometry from here, so every distinct asset is read exactly once
+    and all stages see the same manifest version.
+    """
+
+    manifest_version: Any = None
+    items_by_id: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    cutting_lengths: Dict[str, float] = field(default_factory=dict)
+    fragments: Dict[FragmentKey, List[str]] = field(default_factory=dict)
+    geometries: Dict[str, Optional[ContourGeometry]] = field(default_factory=dict)
+
+    def rotated_fragment(self, contour_id: str, angle: float) -> List[str]:
+        fragment = self.fragments.get(fragment_key(contour_id, angle))
+        if fragment is None:
+            # Not prepared (or not part of this order): let the engine raise its usual error.
+            return load_rotated_fragment(contour_id, angle)
+        return fragment
+
+    def contour_geometry(self, contour_id: str) -> Optional[ContourGeometry]:
+        if contour_id not in self.geometries:
+            return load_contour_geometry(contour_id)
+        return self.geometries[contour_id]
+
+
+def _try_load_fragment(key: FragmentKey, angle: float) -> Optional[List[str]]:
+    try:
+        return load_rotated_fragment(key[0], angle)
+    except GCodeEngineError:
+        # Missing fragments are reported by build_final_gcode with the proper status code.
+        return None
+
+
+def _load_geometry(contour_id: str, geometry_snapshot: Optional[Dict[str, str]]) -> Optional[ContourGeometry]:
+    if geometry_snapshot is None:
+        return load_contour_geometry(contour_id)
+    asset_path = geometry_snapshot.get(contour_id)
+    if not is_object_asset(asset_path):
+        # The contour had no geometry when the order was placed.
+        return None
+    return load_contour_geometry(contour_id, CONTOURS_DIR / asset_path)
+
+
+def build_order_context(order_data: Any, geometry_snapshot: Optional[Dict[str, str]] = None) -> OrderContext:
+    """Resolve the catalog assets of an order.
+
+    ``geometry_snapshot`` (see snapshot_order_geometry) pins contour geometry
+    to what the order was placed with; without it the current catalog
+    geometry is read.
+    """
+    snapshot = get_manifest_snapshot()
+
+    fragment_angles: Dict[FragmentKey, float] = {}
+    contour_ids: List[str] = []
+    for contour in order_data.contours:
+        fragment_angles.setdefault(fragment_key(contour.id, contour.angle), contour.angle)
+        if contour.id not in contour_ids:
+            contour_ids.append(contour.id)
+
+    fragments: Dict[FragmentKey, List[str]] = {}
+    geometries: Dict[str, Optional[ContourGeometry]] = {}
+    task_count = len(fragment_angles) + len(contour_ids)
+    if task_count:
+        with ThreadPoolExecutor(max_workers=min(MAX_ASSET_READ_WORKERS, task_count)) as executor:
+            fragment_futures = {
+                key: executor.submit(_try_load_fragment, key, angle)
+                for key, angle in fragment_angles.items()
+            }
+            geometry_futures = {
+                contour_id: executor.submit(_load_geometry, contour_id, geometry_snapshot)
+                for contour_id in contour_ids
+            }
+            for key, future in fragment_futures.items():
+                fragment = future.result()
+                if fragment is not None:
+                    fragments[key] = fragment
+            for contour_id, future in geometry_futures.items():
+                geometries[contour_id] = future.result()
+
+    return OrderContext(
+        manifest_version=snapshot.version if snapshot is not None else None,
+        items_by_id=snapshot.items_by_id if snapshot is not None else {},
+        cutting_lengths=snapshot.cutting_lengths if snapshot is not None else {},
+        fragments=fragments,
+        geometries=geometries,
+    )
+
+
+def snapshot_order_geometry(context: OrderContext) -> Dict[str, str]:
+    """Store the geometry used by an order in the object store.
+
+    Returns ``{contour_id: "objects/ab/<sha256>.json"}``. Objects are
+    content-addressed, so orders with the same geometry share one file and
+    later catalog edits never change what an order's DXF/SVG is built from.
+    """
+    assets: Dict[str, str] = {}
+    for contour_id, geometry in context.geometries.items():
+        if geometry is None:
+            continue
+        width, height, loops = geometry
+        text = json.dumps(
+            {
+                "version": 2,
+                "vertices": loops[0],
+                "loops": [{"vertices": loop} for loop in loops],
+                "bbox": {"width": width, "height": height},
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        target = contour_object_path(hashlib.sha256(text.encode("utf-8")).hexdigest(), "json")
+        asset_path = target.relative_to(CONTOURS_DIR).as_posix()
+        if not object_exists(asset_path):
+            write_text_atomic(target, text)
+        assets[contour_id] = asset_path
+    return assets
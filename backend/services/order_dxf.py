@@ -1,10 +1,18 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, Iterable, List, Tuple
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
 import math
 
 from domain_store import contour_geometry_path
 
+if TYPE_CHECKING:
+    from services.order_context import OrderContext
+
+# (width, height, loops): loops[0] is the outer contour, the rest are nested
+# loops (holes/islands) from geometry version 2.
+ContourGeometry = Tuple[float, float, List[List[Dict[str, float]]]]
+
 
 def _to_float(value: Any, default: float = 0.0) -> float:
     try:
@@ -71,6 +79,18 @@ def _rotate_point(x: float, y: float, width: float, height: float, angle_deg: fl
     ry = cy + dx * sin_a + dy * cos_a
     return rx, ry
 
+def rotate_contour_loops(geometry: ContourGeometry, angle_deg: float) -> List[List[Dict[str, float]]]:
+    width, height, loops = geometry
+    return [_rotate_vertices(vertices, width, height, angle_deg) for vertices in loops]
+
+
+def contour_placement_offset(contour: Any, width: float, height: float) -> tuple[float, float]:
+    """Translation that moves rotated geometry to the placement's top-left anchor."""
+    angle = float(contour.angle)
+    ref_x, ref_y = _rotate_point(0.0, 0.0, width, height, angle) if angle else (0.0, 0.0)
+    return float(contour.x) - ref_x, float(contour.y) - ref_y
+
+
 def _write_lwpolyline(
     lines: List[str],
     layer: str,
@@ -197,6 +217,7 @@ def _emit_entities(
     include_texts: bool,
     cad_like: bool = False,
     next_handle: Callable[[], str] | None = None,
+    context: Optional["OrderContext"] = None,
 ) -> List[str]:
     def _entity_handle() -> str | None:
         return next_handle() if (cad_like and next_handle is not None) else None
@@ -217,28 +238,24 @@ def _emit_entities(
 
     missing_contours: List[str] = []
     for contour in order_data.contours:
-        geometry = _load_contour_geometry(contour.id)
+        geometry = context.contour_geometry(contour.id) if context is not None else load_contour_geometry(contour.id)
         if geometry is None:
             missing_contours.append(contour.id)
             continue
 
-        width, height, vertices = geometry
-        rotated = _rotate_vertices(vertices, width, height, float(contour.angle))
-
-        ref_x, ref_y = _rotate_point(0.0, 0.0, width, height, float(contour.angle)) if float(contour.angle) else (0.0, 0.0)
-
-        dx = float(contour.x) - ref_x
-        dy = float(contour.y) - ref_y
-
-        placed = [
-            {
-                "x": point["x"] + dx,
-                "y": point["y"] + dy,
-                "bulge": point.get("bulge", 0.0),
-            }
-            for point in rotated
-        ]
-        _write_lwpolyline(lines, "CONTOURS", placed, order_height=order_height, handle=_entity_handle(), cad_like=cad_like)
+        width, height, _ = geometry
+        dx, dy = contour_placement_offset(contour, width, height)
+
+        for rotated in rotate_contour_loops(geometry, float(contour.angle)):
+            placed = [
+                {
+                    "x": point["x"] + dx,
+                    "y": point["y"] + dy,
+                    "bulge": point.get("bulge", 0.0),
+                }
+                for point in rotated
+            ]
+            _write_lwpolyline(lines, "CONTOURS", placed, order_height=order_height, handle=_entity_handle(), cad_like=cad_like)
 
     for primitive in (order_data.primitives or []):
         primitive_type = _value_from_obj_or_dict(primitive, "type")
@@ -363,7 +380,10 @@ def _emit_objects_cad(lines: List[str]) -> None:
     ])
 
 
-def generate_order_layout_dxf_minimal(order_data: Any) -> Tuple[str, List[str]]:
+def generate_order_layout_dxf_minimal(
+    order_data: Any,
+    context: Optional["OrderContext"] = None,
+) -> Tuple[str, List[str]]:
     order_width = float(order_data.orderMeta.width)
     order_height = float(order_data.orderMeta.height)
 
@@ -372,12 +392,23 @@ def generate_order_layout_dxf_minimal(order_data: Any) -> Tuple[str, List[str]]:
         "0", "SECTION", "2", "TABLES", "0", "ENDSEC",
         "0", "SECTION", "2", "ENTITIES",
     ]
-    missing_contours = _emit_entities(lines, order_data, order_width, order_height, include_texts=False)
+    missing_contours = _emit_entities(
+        lines,
+        order_data,
+        order_width,
+        order_height,
+        include_texts=False,
+        context=context,
+    )
     lines.extend(["0", "ENDSEC", "0", "EOF"])
     return "\n".join(lines) + "\n", sorted(set(missing_contours))
 
 
-def generate_order_layout_dxf_cad(order_data: Any, include_texts: bool = True) -> Tuple[str, List[str]]:
+def generate_order_layout_dxf_cad(
+    order_data: Any,
+    include_texts: bool = True,
+    context: Optional["OrderContext"] = None,
+) -> Tuple[str, List[str]]:
     order_width = float(order_data.orderMeta.width)
     order_height = float(order_data.orderMeta.height)
 
@@ -403,6 +434,7 @@ def generate_order_layout_dxf_cad(order_data: Any, include_texts: bool = True) -
         include_texts=include_texts,
         cad_like=True,
         next_handle=next_handle,
+        context=context,
     )
 
     lines.extend(["0", "ENDSEC"])
@@ -417,8 +449,8 @@ def _value_from_obj_or_dict(item: Any, key: str, default: Any = None) -> Any:
     return getattr(item, key, default)
 
 
-def _load_contour_geometry(contour_id: str) -> Tuple[float, float, List[Dict[str, float]]] | None:
-    geometry_path = contour_geometry_path(contour_id)
+def load_contour_geometry(contour_id: str, geometry_path: Optional[Path] = None) -> ContourGeometry | None:
+    geometry_path = geometry_path or contour_geometry_path(contour_id)
     if not geometry_path.exists() or not geometry_path.is_file():
         return None
 
@@ -428,6 +460,18 @@ def _load_contour_geometry(contour_id: str) -> Tuple[float, float, List[Dict[str
         geometry_data = json.load(geometry_file)
 
     vertices = _parse_vertices(geometry_data.get("vertices"))
+    loops = [vertices]
+    if geometry_data.get("version") == 2 and isinstance(geometry_data.get("loops"), list):
+        # "vertices" duplicates the outer loop; loops are stored largest first.
+        parsed_loops = [
+            _parse_vertices(loop.get("vertices"))
+            for loop in geometry_data["loops"]
+            if isinstance(loop, dict)
+        ]
+        parsed_loops = [loop for loop in parsed_loops if loop]
+        if parsed_loops:
+            loops = parsed_loops
+            vertices = parsed_loops[0]
     bbox = geometry_data.get("bbox") if isinstance(geometry_data, dict) else None
     width = _to_float((bbox or {}).get("width"), 0.0)
     height = _to_float((bbox or {}).get("height"), 0.0)
@@ -440,8 +484,8 @@ def _load_contour_geometry(contour_id: str) -> Tuple[float, float, List[Dict[str
     if height <= 0:
         height = max(point["y"] for point in vertices) - min(point["y"] for point in vertices)
 
-    return width, height, vertices
+    return width, height, loops
 
 
-def generate_order_layout_dxf(order_data: Any) -> Tuple[str, List[str]]:
-    return generate_order_layout_dxf_minimal(order_data)
+def generate_order_layout_dxf(order_data: Any, context: Optional["OrderContext"] = None) -> Tuple[str, List[str]]:
+    return generate_order_layout_dxf_minimal(order_data, context=context)
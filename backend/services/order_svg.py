@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+import hashlib
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from admin_api.dxf_to_svg import EPS, bulge_to_arc
+from services.gcode_engine import rotation_key
+from services.order_dxf import (
+    ContourGeometry,
+    _sanitize_text,
+    _to_float,
+    _value_from_obj_or_dict,
+    contour_placement_offset,
+    load_contour_geometry,
+    rotate_contour_loops,
+)
+
+if TYPE_CHECKING:
+    from services.order_context import OrderContext
+
+SVG_PRECISION = 3
+FRAGMENT_CACHE_SIZE = 2048
+
+LAYMENT_FILL = "#464746"
+MATERIAL_FILLS = {
+    "green": "#208820",
+    "blue": "#1f6fd6",
+}
+POCKET_FILL = "#1b1b1b"
+TEXT_FILL = "#ffffff"
+
+FragmentCacheKey = Tuple[str, str]
+
+_fragment_cache: "OrderedDict[FragmentCacheKey, str]" = OrderedDict()
+_fragment_cache_lock = Lock()
+
+
+def _fmt(value: float) -> str:
+    text = f"{value:.{SVG_PRECISION}f}".rstrip("0").rstrip(".")
+    return text if text and text != "-0" else "0"
+
+
+def _vertices_to_path(vertices: List[Dict[str, float]]) -> str:
+    commands = [f"M{_fmt(vertices[0]['x'])} {_fmt(vertices[0]['y'])}"]
+    count = len(vertices)
+    for index, start in enumerate(vertices):
+        end = vertices[(index + 1) % count]
+        bulge = start.get("bulge", 0.0)
+        if abs(bulge) < EPS:
+            commands.append(f"L{_fmt(end['x'])} {_fmt(end['y'])}")
+            continue
+        arc = bulge_to_arc((start["x"], start["y"]), (end["x"], end["y"]), bulge)
+        commands.append(
+            f"A{_fmt(arc['r'])} {_fmt(arc['r'])} 0 {arc['large']} {arc['sweep']} "
+            f"{_fmt(end['x'])} {_fmt(end['y'])}"
+        )
+    commands.append("Z")
+    return "".join(commands)
+
+
+def _geometry_content_digest(geometry: ContourGeometry) -> str:
+    return hashlib.sha256(repr(geometry).encode("utf-8")).hexdigest()
+
+
+def contour_path_fragment(contour_id: str, angle: float, geometry: ContourGeometry) -> str:
+    """SVG path data for the rotated contour, before placement translation.
+
+    Fragments are shared across orders and keyed by the content of ``geometry``
+    itself, so live catalog geometry and geometry pinned in an order snapshot
+    never share an entry.
+    """
+    key = (_geometry_content_digest(geometry), rotation_key(angle))
+    with _fragment_cache_lock:
+        cached = _fragment_cache.get(key)
+        if cached is not None:
+            _fragment_cache.move_to_end(key)
+            return cached
+
+    fragment = "".join(_vertices_to_path(loop) for loop in rotate_contour_loops(geometry, float(angle)))
+
+    with _fragment_cache_lock:
+        _fragment_cache[key] = fragment
+        while len(_fragment_cache) > FRAGMENT_CACHE_SIZE:
+            _fragment_cache.popitem(last=False)
+    return fragment
+
+
+def _primitive_elements(order_data: Any) -> List[str]:
+    elements: List[str] = []
+    for primitive in (order_data.primitives or []):
+        primitive_type = _value_from_obj_or_dict(primitive, "type")
+        x = _to_float(_value_from_obj_or_dict(primitive, "x"))
+        y = _to_float(_value_from_obj_or_dict(primitive, "y"))
+        if primitive_type == "rect":
+            width = _to_float(_value_from_obj_or_dict(primitive, "width"))
+            height = _to_float(_value_from_obj_or_dict(primitive, "height"))
+            if width <= 0 or height <= 0:
+                continue
+            elements.append(
+                f'<rect x="{_fmt(x)}" y="{_fmt(y)}" width="{_fmt(width)}" height="{_fmt(height)}"/>'
+            )
+        elif primitive_type == "circle":
+            radius = _to_float(_value_from_obj_or_dict(primitive, "radius"))
+            if radius <= 0:
+                continue
+            elements.append(f'<circle cx="{_fmt(x)}" cy="{_fmt(y)}" r="{_fmt(radius)}"/>')
+    return elements
+
+
+def _text_elements(order_data: Any) -> List[str]:
+    elements: List[str] = []
+    for text_entry in (getattr(order_data, "texts", None) or []):
+        text = _sanitize_text(_value_from_obj_or_dict(text_entry, "text", ""))
+        if not text:
+            continue
+        x = _to_float(_value_from_obj_or_dict(text_entry, "x"))
+        y = _to_float(_value_from_obj_or_dict(text_entry, "y"))
+        font_size = _to_float(_value_from_obj_or_dict(text_entry, "fontSizeMm", 4.0), 4.0)
+        angle = _to_float(_value_from_obj_or_dict(text_entry, "angle", 0.0), 0.0)
+        transform = f' transform="rotate({_fmt(angle)} {_fmt(x)} {_fmt(y)})"' if angle else ""
+        elements.append(
+            f'<text x="{_fmt(x)}" y="{_fmt(y)}" font-size="{_fmt(font_size if font_size > 0 else 4.0)}"'
+            f' dominant-baseline="hanging"{transform}>{escape(text)}</text>'
+        )
+    return elements
+
+
+def render_order_layout_svg(
+    order_data: Any,
+    context: Optional["OrderContext"] = None,
+) -> Tuple[str, List[str]]:
+    """Render the order layout as SVG from catalog geometry (1 unit == 1 mm)."""
+    order_width = float(order_data.orderMeta.width)
+    order_height = float(order_data.orderMeta.height)
+    material = getattr(order_data.orderMeta, "baseMaterialColor", None)
+    layment_fill = MATERIAL_FILLS.get(material or "", LAYMENT_FILL)
+
+    contour_elements: List[str] = []
+    missing_contours: List[str] = []
+    for contour in order_data.contours:
+        geometry = context.contour_geometry(contour.id) if context is not None else load_contour_geometry(contour.id)
+        if geometry is None:
+            missing_contours.append(contour.id)
+            continue
+        fragment = contour_path_fragment(contour.id, contour.angle, geometry)
+        dx, dy = contour_placement_offset(contour, geometry[0], geometry[1])
+        contour_elements.append(
+            f'<path data-contour-id={quoteattr(contour.id)} fill-rule="evenodd" transform="translate({_fmt(dx)} {_fmt(dy)})" d="{fragment}"/>'
+        )
+
+    lines = [
+        '<svg xmlns="http://www.w3.org/2000/svg"'
+        f' width="{_fmt(order_width)}mm" height="{_fmt(order_height)}mm"'
+        f' viewBox="0 0 {_fmt(order_width)} {_fmt(order_height)}">',
+        f'  <rect id="layment" x="0" y="0" width="{_fmt(order_width)}" height="{_fmt(order_height)}"'
+        f' fill="{layment_fill}" stroke="#000" stroke-width="1"/>',
+        f'  <g id="contours" fill="{POCKET_FILL}">',
+        *(f"    {element}" for element in contour_elements),
+        "  </g>",
+        f'  <g id="primitives" fill="{POCKET_FILL}">',
+        *(f"    {element}" for element in _primitive_elements(order_data)),
+        "  </g>",
+        f'  <g id="texts" fill="{TEXT_FILL}" font-family="Arial, sans-serif">',
+        *(f"    {element}" for element in _text_elements(order_data)),
+        "  </g>",
+        "</svg>",
+    ]
+    return "\n".join(lines) + "\n", sorted(set(missing_contours))
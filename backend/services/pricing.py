@@ -1,14 +1,16 @@
 import json
 import math
 import os
-from typing import Any, Dict, List, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
 
 from fastapi import HTTPException
 
-from domain_store import BASE_DIR, MANIFEST_PATH
+from domain_store import BASE_DIR
+from services.manifest_repository import get_manifest_snapshot
 
 if TYPE_CHECKING:
     from main import ExportRequest
+    from services.order_context import OrderContext
 
 
 DEFAULT_PRICING_CONFIG_PATH = BASE_DIR / "pricing.local.json"
@@ -39,22 +41,8 @@ def load_pricing_config() -> Dict[str, Any]:
 
 
 def _manifest_cutting_lengths() -> Dict[str, float]:
-    if not MANIFEST_PATH.exists() or not MANIFEST_PATH.is_file():
-        return {}
-
-    with MANIFEST_PATH.open("r", encoding="utf-8") as manifest_file:
-        manifest = json.load(manifest_file)
-
-    result: Dict[str, float] = {}
-    for item in manifest.get("items", []):
-        item_id = item.get("id")
-        if not isinstance(item_id, str) or not item_id:
-            continue
-        try:
-            result[item_id] = float(item.get("cuttingLengthMeters", 0) or 0)
-        except (TypeError, ValueError):
-            result[item_id] = 0.0
-    return result
+    snapshot = get_manifest_snapshot()
+    return snapshot.cutting_lengths if snapshot is not None else {}
 
 
 def _rect_primitive_meters(primitive: Any) -> float:
@@ -133,7 +121,10 @@ def _primitive_cutting_meters(primitives: List[Any]) -> float:
     return total_meters
 
 
-def calculate_price_preview(order_data: "ExportRequest") -> Dict[str, Any]:
+def calculate_price_preview(
+    order_data: "ExportRequest",
+    context: Optional["OrderContext"] = None,
+) -> Dict[str, Any]:
     config = load_pricing_config()
 
     width = order_data.orderMeta.width
@@ -151,7 +142,7 @@ def calculate_price_preview(order_data: "ExportRequest") -> Dict[str, Any]:
 
     perimeter_m = (2 * (width + height)) / 1000
 
-    manifest_lengths = _manifest_cutting_lengths()
+    manifest_lengths = context.cutting_lengths if context is not None else _manifest_cutting_lengths()
     missing_contour_ids: List[str] = []
     contour_meters = 0.0
     for contour in order_data.contours:
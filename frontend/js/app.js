@@ -2250,6 +2250,10 @@ class ContourApp {
             this.layment.setCoords();
             this.syncSafeAreaRect();
 
+            await this.contourManager.svgLoader.prefetchBundle(
+                (data.contours || []).filter(contour => contour?.assets?.svg).map(contour => contour.id)
+            );
+
             await this.batchRender(async () => {
                 for (const contour of data.contours || []) {
                     const contourAssetSvg = contour?.assets?.svg;
@@ -2620,8 +2624,9 @@ class ContourApp {
                 };
             }
 
+            // Превью заказа рендерит backend из геометрии каталога — PNG/SVG не отправляем.
             const data = this.buildExportPayload({
-                includePreview: true,
+                includePreview: false,
                 includeWorkspaceSnapshot: true,
                 customer: normalizedCustomer
             });
@@ -62,7 +62,12 @@ window.Config = {
     API : {
         BASE_URL: `${APP_BASE_PREFIX}/api`,
         EXPORT_Layment: '/export-layment',
-        MANIFEST_URL: `${APP_BASE_PREFIX}/api/contours/manifest`
+        MANIFEST_URL: `${APP_BASE_PREFIX}/api/contours/manifest`,
+        MANIFEST_CACHE_KEY: 'laymentDesigner.manifestCache',
+        MANIFEST_REFRESH_MS: 5 * 60 * 1000,
+        SEARCH_URL: `${APP_BASE_PREFIX}/api/contours/search`,
+        SEARCH_LIMIT: 1000,
+        SVG_BUNDLE_URL: `${APP_BASE_PREFIX}/api/contours/svg-bundle`
 
     },
 
@@ -3,6 +3,10 @@
         const query = (state.query || '').trim().toLowerCase();
         const hasQuery = Boolean(query);
         const baseItems = Array.isArray(state.items) ? state.items : [];
+        // Результат /api/contours/search для текущего запроса, если он уже пришёл.
+        const searchIds = state.searchIds && state.searchQuery === (state.query || '').trim()
+            ? state.searchIds
+            : null;
 
         const items = baseItems.filter(entry => {
             if (state.currentCategory && entry.category !== state.currentCategory) {
@@ -11,6 +15,9 @@
             if (!hasQuery) {
                 return true;
             }
+            if (searchIds) {
+                return (entry.variants || []).some(variant => searchIds.has(variant?.id));
+            }
 
             const fields = [
                 entry.article,
@@ -246,16 +253,36 @@
 
             dom.searchInput?.addEventListener('input', async event => {
                 catalogState.setQuery(event.target.value || '');
+                await catalogState.search();
                 await render();
             });
         }
 
+        // Подтягивает изменения каталога (дельтой или 304) и перерисовывает, только если версия сменилась.
+        async function refresh() {
+            const previousVersion = catalogState.getState().version;
+            const state = await catalogState.load();
+            if (state.version === previousVersion) {
+                return state;
+            }
+            if (state.query) {
+                await catalogState.search();
+            }
+            return await render();
+        }
+
         async function init() {
             await catalogState.load();
+            global.addEventListener('focus', () => {
+                refresh().catch(error => console.warn('Не удалось обновить каталог', error));
+            });
+            global.setInterval(() => {
+                refresh().catch(error => console.warn('Не удалось обновить каталог', error));
+            }, Config.API.MANIFEST_REFRESH_MS);
             return await render();
         }
 
-        return { bind, render, init, load: catalogState.load };
+        return { bind, render, init, refresh, load: catalogState.load };
     }
 
     global.DesignerCatalogShell = { create: createCatalogShell };
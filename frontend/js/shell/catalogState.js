@@ -66,15 +66,20 @@
         return Array.from(categories.keys()).sort((a, b) => a.localeCompare(b, 'ru'));
     }
 
-    function createCatalogState({ fetchImpl, manifestUrl, onManifestLoaded } = {}) {
+    function createCatalogState({ fetchImpl, manifestUrl, searchUrl, onManifestLoaded } = {}) {
         const state = {
             manifest: {},
             items: [],
             categories: [],
             currentCategory: null,
             query: '',
+            // id вариантов, найденных сервером для searchQuery; null — фильтровать локально.
+            searchQuery: null,
+            searchIds: null,
             loadError: null,
-            categoryLabels: {}
+            categoryLabels: {},
+            // Остальные ключи верхнего уровня manifest (sets и т.п.), кроме items/categories/version.
+            extra: {}
         };
 
         const fetchFn = typeof fetchImpl === 'function' ? fetchImpl : fetch;
@@ -87,6 +92,8 @@
 
         function setManifestItems(items, categoryLabels = {}) {
             state.manifest = toManifestMap(items);
+            state.searchQuery = null;
+            state.searchIds = null;
             state.categoryLabels = categoryLabels && typeof categoryLabels === 'object' ? categoryLabels : {};
 
             const enabledItems = Object.values(state.manifest).filter(item => item?.enabled);
@@ -101,12 +108,127 @@
             return getState();
         }
 
-        async function load() {
+        // Версия и ETag последнего применённого manifest вместе с телом хранятся в localStorage:
+        // после перезагрузки страницы load() запрашивает только изменения (?since=),
+        // а при полной загрузке отправляет If-None-Match и на 304 не пересобирает каталог.
+        let manifestEtag = null;
+        let manifestVersion = null;
+        let pendingLoad = null;
+        const cacheKey = `${Config.API.MANIFEST_CACHE_KEY}:${manifestUrl || Config.API.MANIFEST_URL}`;
+
+        function saveManifestCache() {
+            if (!Number.isInteger(manifestVersion)) {
+                return;
+            }
+            try {
+                global.localStorage?.setItem(cacheKey, JSON.stringify({
+                    version: manifestVersion,
+                    etag: manifestEtag,
+                    items: state.manifest,
+                    categories: state.categoryLabels,
+                    extra: state.extra
+                }));
+            } catch (error) {
+                // Переполнен или недоступен — просто работаем без кэша.
+                try {
+                    global.localStorage?.removeItem(cacheKey);
+                } catch (_) {
+                    // ignore
+                }
+            }
+        }
+
+        function restoreManifestCache() {
+            try {
+                const cached = JSON.parse(global.localStorage?.getItem(cacheKey) || 'null');
+                if (!cached || !Number.isInteger(cached.version) || !cached.items || typeof cached.items !== 'object') {
+                    return;
+                }
+                state.extra = cached.extra && typeof cached.extra === 'object' ? cached.extra : {};
+                setManifestItems(cached.items, cached.categories || {});
+                manifestVersion = cached.version;
+                manifestEtag = typeof cached.etag === 'string' ? cached.etag : null;
+            } catch (error) {
+                console.warn('Кэш manifest повреждён, загружаем заново', error);
+            }
+        }
+
+        function splitExtra(data) {
+            const { items, categories, version, ...extra } = data || {};
+            return extra;
+        }
+
+        function deltaUrl(version) {
+            const url = manifestUrl || Config.API.MANIFEST_URL;
+            return `${url}${url.includes('?') ? '&' : '?'}since=${encodeURIComponent(version)}`;
+        }
+
+        // Докачивает изменения с manifestVersion и патчит кэш; false — нужен полный manifest.
+        async function applyManifestDelta() {
+            const response = await fetchFn(deltaUrl(manifestVersion));
+            if (!response.ok) {
+                return false;
+            }
+            const delta = await response.json();
+            if (!delta || delta.full || delta.since !== manifestVersion) {
+                return false;
+            }
+            if (delta.version === manifestVersion) {
+                return true;
+            }
+
+            const items = { ...state.manifest };
+            (delta.items?.upsert || []).forEach(item => {
+                if (item?.id) {
+                    items[item.id] = item;
+                }
+            });
+            (delta.items?.remove || []).forEach(id => {
+                delete items[id];
+            });
+            const categories = { ...state.categoryLabels };
+            Object.entries(delta.categories?.upsert || {}).forEach(([slug, meta]) => {
+                categories[slug] = meta;
+            });
+            (delta.categories?.remove || []).forEach(slug => {
+                delete categories[slug];
+            });
+            const extra = { ...state.extra, ...splitExtra(delta.replace) };
+            (delta.dropped || []).forEach(key => {
+                delete extra[key];
+            });
+
+            manifestVersion = delta.version;
+            manifestEtag = null;
+            state.extra = extra;
+            setManifestItems(items, categories);
+            saveManifestCache();
+            return true;
+        }
+
+        async function fetchManifest() {
             state.loadError = null;
+            if (manifestVersion !== null) {
+                try {
+                    if (await applyManifestDelta()) {
+                        return getState();
+                    }
+                } catch (error) {
+                    console.warn('Не удалось применить изменения manifest, загружаем целиком', error);
+                }
+            }
             try {
-                const response = await fetchFn(manifestUrl || Config.API.MANIFEST_URL);
+                const headers = manifestEtag ? { 'If-None-Match': manifestEtag } : {};
+                const response = await fetchFn(manifestUrl || Config.API.MANIFEST_URL, { headers });
+                if (response.status === 304) {
+                    return getState();
+                }
                 const data = await response.json();
+                state.extra = response.ok ? splitExtra(data) : {};
                 setManifestItems(data?.items || [], data?.categories || {});
+                manifestEtag = response.ok ? response.headers?.get?.('ETag') || null : null;
+                manifestVersion = response.ok && Number.isInteger(data?.version) ? data.version : null;
+                saveManifestCache();
             } catch (error) {
                 console.error('Ошибка загрузки manifest', error);
                 state.loadError = Config.MESSAGES.LOADING_ERROR;
@@ -114,6 +236,18 @@
             return getState();
         }
 
+        function load() {
+            // Параллельные вызовы разделяют один запрос.
+            if (!pendingLoad) {
+                pendingLoad = fetchManifest().finally(() => {
+                    pendingLoad = null;
+                });
+            }
+            return pendingLoad;
+        }
+
+        restoreManifestCache();
+
         function setFilters({ category = state.currentCategory, query = state.query } = {}) {
             state.currentCategory = category && state.categories.includes(category) ? category : null;
             state.query = typeof query === 'string' ? query : '';
@@ -128,11 +262,43 @@
             return setFilters({ category: state.currentCategory, query });
         }
 
+        async function search(query = state.query) {
+            const q = (query || '').trim();
+            if (!q) {
+                state.searchQuery = null;
+                state.searchIds = null;
+                return getState();
+            }
+            try {
+                const params = new URLSearchParams({ q, limit: String(Config.API.SEARCH_LIMIT) });
+                const response = await fetchFn(`${searchUrl || Config.API.SEARCH_URL}?${params}`);
+                const data = response.ok ? await response.json() : null;
+                // Ответ на устаревший запрос не применяем.
+                if ((state.query || '').trim() !== q) {
+                    return getState();
+                }
+                const found = Array.isArray(data?.items) ? data.items : null;
+                // Обрезанный limit-ом ответ неполон — тогда остаётся локальный фильтр.
+                const complete = found && data.total === found.length;
+                state.searchQuery = complete ? q : null;
+                state.searchIds = complete ? new Set(found.map(item => item.id)) : null;
+            } catch (error) {
+                console.warn('Серверный поиск недоступен, фильтруем локально', error);
+                state.searchQuery = null;
+                state.searchIds = null;
+            }
+            return getState();
+        }
+
         function getState() {
             return {
+                version: manifestVersion,
                 manifest: { ...state.manifest },
+                sets: Array.isArray(state.extra.sets) ? [...state.extra.sets] : [],
                 currentCategory: state.currentCategory,
                 query: state.query || '',
+                searchQuery: state.searchQuery,
+                searchIds: state.searchIds,
                 categories: [...state.categories],
                 loadError: state.loadError,
                 categoryLabels: { ...state.categoryLabels },
@@ -151,6 +317,7 @@
             setFilters,
             setCategory,
             setQuery,
+            search,
             getState
         };
     }
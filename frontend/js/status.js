@@ -126,14 +126,15 @@
     }
 
     function renderPreview(order) {
-        if (!order.previewPngUrl) {
+        const previewSource = order.previewPngUrl || order.previewSvgUrl;
+        if (!previewSource) {
             statusPreviewBlock.hidden = true;
             statusPreviewImage.removeAttribute('src');
             return;
         }
 
         const cacheBuster = encodeURIComponent(order.updatedAt || Date.now());
-        const previewUrl = withAppPrefix(order.previewPngUrl);
+        const previewUrl = withAppPrefix(previewSource);
         statusPreviewImage.src = `${previewUrl}?t=${cacheBuster}`;
         statusPreviewBlock.hidden = false;
     }
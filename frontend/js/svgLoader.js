@@ -19,6 +19,36 @@ class SVGLoader {
         }
     }
 
+    // Один запрос за SVG всех нужных контуров (например, при восстановлении раскладки).
+    // Ответ раскладывается в svgCache по тем же URL `/contours/<assets.svg>`, что и у loadSVG;
+    // при ошибке ничего не делаем — loadSVG догрузит файлы по одному.
+    async prefetchBundle(ids) {
+        const pending = [...new Set((ids || []).filter(Boolean))];
+        if (!pending.length || !Config.API.SVG_BUNDLE_URL) {
+            return;
+        }
+
+        try {
+            const response = await fetch(Config.API.SVG_BUNDLE_URL, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ ids: pending })
+            });
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            const bundle = await response.json();
+            for (const [id, svgText] of Object.entries(bundle.svgs || {})) {
+                const asset = bundle.assets?.[id];
+                if (asset) {
+                    this.svgCache.set(`/contours/${asset}`, svgText);
+                }
+            }
+        } catch (error) {
+            console.warn('Не удалось загрузить пакет SVG, загружаем по одному:', error);
+        }
+    }
+
     async createFabricObjectFromSVG(svgUrl) {
         try {
             const svgText = await this.loadSVG(svgUrl);